@@ -10,11 +10,22 @@ import uuid
 
 from utils import get_mouse_pos_in_canvas, get_wall_color_hex, get_floor_design_color
 from room import Room
+from history import (UndoHistory, Operation, AddFurniture, RemoveFurniture, SetFurnitureAttributes,
+                     SetRoomAttributes, ReplaceRoom)
+from scene_plotly import FigureBuilder, get_room_figure
+from room_store import get_room_store
+from thumbnail_cache import get_room_thumbnail, get_saved_room_thumbnail
+from layout_solver import solve_layout_parallel, apply_layout, get_solver_pool
+from circulation import CirculationAnalyzer, has_doors
 from furniture import Furniture, get_furniture_item_by_id
-from room_templates import load_room_template, get_room_template_names
+from room_templates import load_room_template, get_room_template_names, get_template_snapshot
 from assets.wall_colors import WALL_COLORS
 from assets.floor_designs import FLOOR_DESIGNS
-from assets.furniture_items import FURNITURE_ITEMS
+from catalog import get_catalog
+
+SAVED_ROOMS_PAGE_SIZE = 50  # Saved rooms listed per page in the Load Room selector
+INTERACTIVE_SEARCH_RADIUS = 150  # cm searched for a free spot when an add or move collides
+INTERACTIVE_SEARCH_BATCHES = 1  # Batches of exact footprint tests before settling for a box-clear spot
 
 # Set page config
 st.set_page_config(
@@ -27,6 +38,14 @@ st.set_page_config(
 if 'room' not in st.session_state:
     st.session_state.room = Room(width=500, height=400, wall_color="White", floor_design="Hardwood")
     
+if 'figure_builder' not in st.session_state:
+    # Keeps per-layer scene caches so edits only rebuild what they touch
+    st.session_state.figure_builder = FigureBuilder()
+    
+if 'circulation_analyzer' not in st.session_state:
+    # Keeps distance fields between reruns so unchanged rooms are not re-analyzed
+    st.session_state.circulation_analyzer = CirculationAnalyzer()
+    
 if 'camera_x' not in st.session_state:
     st.session_state.camera_x = 1.5
     
@@ -36,14 +55,15 @@ if 'camera_y' not in st.session_state:
 if 'camera_z' not in st.session_state:
     st.session_state.camera_z = 1.5
     
-if 'saved_rooms' not in st.session_state:
-    st.session_state.saved_rooms = []
+if 'saved_rooms_pages' not in st.session_state:
+    # Cursors of the saved-room pages visited so far; the last one is the current page
+    st.session_state.saved_rooms_pages = [None]
     
 if 'current_room_name' not in st.session_state:
     st.session_state.current_room_name = "Untitled Room"
     
 if 'undo_history' not in st.session_state:
-    st.session_state.undo_history = []
+    st.session_state.undo_history = UndoHistory()
     
 if 'selected_wall' not in st.session_state:
     st.session_state.selected_wall = "Auto"  # Default to auto-detection of nearest wall
@@ -51,43 +71,34 @@ if 'selected_wall' not in st.session_state:
 if 'show_room_save_dialog' not in st.session_state:
     st.session_state.show_room_save_dialog = False
     
-# Function to save current room state to undo history
-def save_to_undo_history():
-    # Keep a limited history (last 10 states)
-    if len(st.session_state.undo_history) >= 10:
-        st.session_state.undo_history.pop(0)  # Remove oldest state
-    
-    # Create a deep copy of current room state
-    st.session_state.undo_history.append(st.session_state.room.to_dict())
+# Function to apply a room change and record it in the undo history
+def apply_and_record(operation: Operation) -> None:
+    st.session_state.room = operation.apply(st.session_state.room)
+    st.session_state.undo_history.record(operation)
 
 # Function to undo last action
 def undo_last_action():
-    if st.session_state.undo_history:
-        # Get the last state and remove it from history
-        last_state = st.session_state.undo_history.pop()
-        # Restore the room to that state
-        st.session_state.room = Room.from_dict(last_state)
-        return True
-    return False
+    room = st.session_state.undo_history.undo(st.session_state.room)
+    if room is None:
+        return False
+    st.session_state.room = room
+    return True
+
+# Function to redo the last undone action
+def redo_last_action():
+    room = st.session_state.undo_history.redo(st.session_state.room)
+    if room is None:
+        return False
+    st.session_state.room = room
+    return True
 
 def save_current_room(room_name: str) -> bool:
     """Save the current room with the given name."""
-    # Create a room entry with name and state
-    room_data = {
-        "name": room_name,
-        "state": st.session_state.room.to_dict()
-    }
-    
-    # Check if a room with this name already exists
-    for i, room in enumerate(st.session_state.saved_rooms):
-        if room["name"] == room_name:
-            # Replace the existing room
-            st.session_state.saved_rooms[i] = room_data
-            return True
-    
-    # Add as a new room
-    st.session_state.saved_rooms.append(room_data)
+    # Saved rooms live in a SQLite database shared across sessions, replacing any room with the same name
+    get_room_store().save(room_name, st.session_state.room)
     st.session_state.current_room_name = room_name
+    # Show the newest rooms again so the saved one is visible
+    st.session_state.saved_rooms_pages = [None]
     return True
 
 def create_new_room(save_current: bool = False, current_room_name: str = "Untitled Room") -> None:
@@ -99,7 +110,7 @@ def create_new_room(save_current: bool = False, current_room_name: str = "Untitl
     st.session_state.room = Room(width=500, height=400, wall_color="White", floor_design="Hardwood")
     st.session_state.current_room_name = "Untitled Room"
     # Clear undo history
-    st.session_state.undo_history = []
+    st.session_state.undo_history.clear()
 
 def main():
     # ===== HEADER SECTION =====
@@ -129,7 +140,7 @@ def main():
     header_row = st.container()
     with header_row:
         # Use small columns with minimal spacing
-        action_cols = st.columns([1, 1, 1, 9])
+        action_cols = st.columns([1, 1, 1, 1, 8])
         
         with action_cols[0]:
             # Add undo button
@@ -141,15 +152,24 @@ def main():
                     st.warning("Nothing to undo.")
         
         with action_cols[1]:
+            # Add redo button
+            if st.button("↪️ REDO", help="Redo the last undone action"):
+                if redo_last_action():
+                    st.success("Action redone!")
+                    st.rerun()
+                else:
+                    st.warning("Nothing to redo.")
+        
+        with action_cols[2]:
             # Add deploy button
             st.button("🚀 DEPLOY", help="Deploy your design")
         
-        with action_cols[2]:
+        with action_cols[3]:
             # Add refresh button
             if st.button("🔄 REFRESH", help="Refresh the view"):
                 st.rerun()
                 
-        with action_cols[3]:
+        with action_cols[4]:
             # Empty column for spacing
             pass
     
@@ -166,531 +186,28 @@ def main():
     # This section will contain only the 3D view of the room for maximum visibility
     st.markdown("<h2 style='text-align: center;'>3D Room Visualization</h2>", unsafe_allow_html=True)
     
-    # Get room dimensions
-    width = st.session_state.room.width
-    height = st.session_state.room.height
-    room_height = 250 / 100  # Default room height in meters
-    
     # Get camera settings from session state
     camera_x = st.session_state.camera_x
     camera_y = st.session_state.camera_y
     camera_z = st.session_state.camera_z
     
-    # Convert room dimensions from cm to meters for visualization
-    width_m = width / 100
-    height_m = height / 100
-    
-    # Create 3D visualization
-    fig = go.Figure()
-    
-    # Get floor design colors
-    floor_colors = get_floor_design_color(st.session_state.room.floor_design)
-    
-    # Add floor with pattern
-    floor_primary_color = floor_colors["primary"]
-    floor_secondary_color = floor_colors.get("secondary", floor_primary_color)
-    
-    # Create floor with visible pattern based on floor design
-    if st.session_state.room.floor_design == "Hardwood":
-        # Hardwood pattern - add strips
-        plank_width = 0.1  # width of each plank in meters
-        num_planks = int(width_m / plank_width)
-        
-        for i in range(num_planks):
-            x_start = i * plank_width
-            x_end = (i + 1) * plank_width
-            if x_end > width_m:
-                x_end = width_m
-                
-            vertices = [
-                [x_start, 0, 0],
-                [x_end, 0, 0],
-                [x_end, height_m, 0],
-                [x_start, height_m, 0]
-            ]
-            
-            i_indices = [0]
-            j_indices = [1]
-            k_indices = [2]
-            
-            color = floor_primary_color if i % 2 == 0 else floor_secondary_color
-            
-            fig.add_trace(
-                go.Mesh3d(
-                    x=[v[0] for v in vertices],
-                    y=[v[1] for v in vertices],
-                    z=[v[2] for v in vertices],
-                    i=i_indices, j=j_indices, k=k_indices,
-                    color=color,
-                    flatshading=True,
-                    name=f"Floor Plank {i}"
-                )
-            )
-    elif st.session_state.room.floor_design == "Tile":
-        # Tile pattern - add grid
-        tile_size = 0.2  # size of each tile in meters
-        for x_idx in range(int(width_m / tile_size) + 1):
-            for y_idx in range(int(height_m / tile_size) + 1):
-                x_start = x_idx * tile_size
-                y_start = y_idx * tile_size
-                x_end = min((x_idx + 1) * tile_size, width_m)
-                y_end = min((y_idx + 1) * tile_size, height_m)
-                
-                if x_start >= width_m or y_start >= height_m:
-                    continue
-                
-                vertices = [
-                    [x_start, y_start, 0],
-                    [x_end, y_start, 0],
-                    [x_end, y_end, 0],
-                    [x_start, y_end, 0]
-                ]
-                
-                i_indices = [0]
-                j_indices = [1]
-                k_indices = [2]
-                
-                color = floor_primary_color if (x_idx + y_idx) % 2 == 0 else floor_secondary_color
-                
-                fig.add_trace(
-                    go.Mesh3d(
-                        x=[v[0] for v in vertices],
-                        y=[v[1] for v in vertices],
-                        z=[v[2] for v in vertices],
-                        i=i_indices, j=j_indices, k=k_indices,
-                        color=color,
-                        flatshading=True,
-                        name=f"Tile {x_idx}-{y_idx}"
-                    )
-                )
-    elif st.session_state.room.floor_design == "Stripes":
-        # Stripes pattern - horizontal stripes
-        stripe_width = 0.15  # width of each stripe in meters
-        num_stripes = int(height_m / stripe_width)
-        
-        for i in range(num_stripes):
-            y_start = i * stripe_width
-            y_end = (i + 1) * stripe_width
-            if y_end > height_m:
-                y_end = height_m
-                
-            vertices = [
-                [0, y_start, 0],
-                [width_m, y_start, 0],
-                [width_m, y_end, 0],
-                [0, y_end, 0]
-            ]
-            
-            i_indices = [0]
-            j_indices = [1]
-            k_indices = [2]
-            
-            color = floor_primary_color if i % 2 == 0 else floor_secondary_color
-            
-            fig.add_trace(
-                go.Mesh3d(
-                    x=[v[0] for v in vertices],
-                    y=[v[1] for v in vertices],
-                    z=[v[2] for v in vertices],
-                    i=i_indices, j=j_indices, k=k_indices,
-                    color=color,
-                    flatshading=True,
-                    name=f"Stripe {i}"
-                )
-            )
-    elif st.session_state.room.floor_design == "Zigzag":
-        # Zigzag pattern
-        zigzag_width = 0.2  # width of each zigzag section in meters
-        zigzag_height = 0.2  # height of each zigzag row
-        
-        num_zigzag_rows = int(height_m / zigzag_height)
-        num_zigzag_cols = int(width_m / zigzag_width) * 2  # Double for zigzag effect
-        
-        for row in range(num_zigzag_rows):
-            for col in range(num_zigzag_cols):
-                # Calculate zigzag position
-                x_start = (col // 2) * zigzag_width
-                y_start = row * zigzag_height
-                
-                # Zigzag pattern - alternate between forward and backward slant
-                if col % 2 == 0:  # Forward slant \
-                    vertices = [
-                        [x_start, y_start, 0],
-                        [x_start + zigzag_width, y_start + zigzag_height, 0],
-                        [x_start, y_start + zigzag_height, 0]
-                    ]
-                else:  # Backward slant /
-                    vertices = [
-                        [x_start, y_start + zigzag_height, 0],
-                        [x_start, y_start, 0],
-                        [x_start - zigzag_width, y_start + zigzag_height, 0]
-                    ]
-                
-                # Skip if outside room boundaries
-                if any(v[0] < 0 or v[0] > width_m or v[1] < 0 or v[1] > height_m for v in vertices):
-                    continue
-                
-                i_indices = [0]
-                j_indices = [1]
-                k_indices = [2]
-                
-                # Alternate colors
-                color = floor_primary_color if (row + col) % 2 == 0 else floor_secondary_color
-                
-                fig.add_trace(
-                    go.Mesh3d(
-                        x=[v[0] for v in vertices],
-                        y=[v[1] for v in vertices],
-                        z=[v[2] for v in vertices],
-                        i=i_indices, j=j_indices, k=k_indices,
-                        color=color,
-                        flatshading=True,
-                        name=f"Zigzag {row}-{col}"
-                    )
-                )
-    else:
-        # Default solid floor for other designs
-        vertices = [
-            [0, 0, 0],  # bottom left
-            [width_m, 0, 0],  # bottom right
-            [width_m, height_m, 0],  # top right
-            [0, height_m, 0],  # top left
-        ]
-        
-        i = [0]
-        j = [1]
-        k = [2]
-        
-        fig.add_trace(
-            go.Mesh3d(
-                x=[v[0] for v in vertices],
-                y=[v[1] for v in vertices],
-                z=[v[2] for v in vertices],
-                i=i, j=j, k=k,
-                color=floor_primary_color,
-                name="Floor",
-                flatshading=True
-            )
-        )
-    
-    # Get wall colors (individual wall colors if available)
-    left_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'left_wall_color', st.session_state.room.wall_color))
-    back_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'back_wall_color', st.session_state.room.wall_color))
-    right_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'right_wall_color', st.session_state.room.wall_color))
-    front_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'front_wall_color', st.session_state.room.wall_color))
-    
-    # Add walls with full rectangles (no partial walls)
-    # Wall 1 (left)
-    left_wall_vertices = [
-        [0, 0, 0],  # bottom left
-        [0, height_m, 0],  # bottom right
-        [0, height_m, room_height],  # top right
-        [0, 0, room_height],  # top left
-    ]
-    
-    # For full rectangles, we need to define all triangular faces
-    i = [0, 0]
-    j = [1, 2]
-    k = [2, 3]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in left_wall_vertices],
-            y=[v[1] for v in left_wall_vertices],
-            z=[v[2] for v in left_wall_vertices],
-            i=i, j=j, k=k,
-            color=left_wall_color,
-            opacity=0.95,  # Slightly transparent to make it look like interior wall
-            name="Left Wall",
-            flatshading=True
-        )
-    )
-    
-    # Wall 2 (back)
-    back_wall_vertices = [
-        [0, 0, 0],  # bottom left
-        [width_m, 0, 0],  # bottom right
-        [width_m, 0, room_height],  # top right
-        [0, 0, room_height],  # top left
-    ]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in back_wall_vertices],
-            y=[v[1] for v in back_wall_vertices],
-            z=[v[2] for v in back_wall_vertices],
-            i=i, j=j, k=k,
-            color=back_wall_color,
-            opacity=0.95,
-            name="Back Wall",
-            flatshading=True
-        )
-    )
-    
-    # Wall 3 (right)
-    right_wall_vertices = [
-        [width_m, 0, 0],  # bottom left
-        [width_m, height_m, 0],  # bottom right
-        [width_m, height_m, room_height],  # top right
-        [width_m, 0, room_height],  # top left
-    ]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in right_wall_vertices],
-            y=[v[1] for v in right_wall_vertices],
-            z=[v[2] for v in right_wall_vertices],
-            i=i, j=j, k=k,
-            color=right_wall_color,
-            opacity=0.95,
-            name="Right Wall",
-            flatshading=True
-        )
-    )
-    
-    # Wall 4 (front)
-    front_wall_vertices = [
-        [0, height_m, 0],  # bottom left
-        [width_m, height_m, 0],  # bottom right
-        [width_m, height_m, room_height],  # top right
-        [0, height_m, room_height],  # top left
-    ]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in front_wall_vertices],
-            y=[v[1] for v in front_wall_vertices],
-            z=[v[2] for v in front_wall_vertices],
-            i=i, j=j, k=k,
-            color=front_wall_color,
-            opacity=0.95,
-            name="Front Wall",
-            flatshading=True
-        )
-    )
-    
-    # Ceiling removed as requested
-    
-    # Add furniture items in 3D
-    if hasattr(st.session_state.room, 'furniture') and st.session_state.room.furniture:
-        for furniture in st.session_state.room.furniture:
-            # Convert furniture dimensions to meters
-            f_width = furniture.width / 100 * furniture.scale
-            f_height = furniture.height / 100 * furniture.scale
-            f_thickness = 0.05  # Standard thickness in meters
-            
-            # Calculate furniture position in meters
-            f_x = furniture.x / 100
-            f_y = furniture.y / 100
-            f_z = 0  # Default: place on the floor
-            
-            # Check if this is a door or window
-            is_door_or_window = furniture.item_id.startswith('door') or furniture.item_id.startswith('window')
-            is_door = furniture.item_id.startswith('door')
-            
-            if is_door_or_window:
-                # Wall placement can be specified or auto-detected
-                wall_placement = getattr(furniture, "wall", "Auto")
-                wall_height = room_height
-                
-                # Determine which wall to place on (either specified or auto-detected)
-                if wall_placement == "Auto":
-                    # Calculate distances to each wall for auto-detection
-                    distance_to_left = f_x
-                    distance_to_right = width_m - f_x
-                    distance_to_back = f_y
-                    distance_to_front = height_m - f_y
-                    
-                    # Find the minimum distance
-                    min_distance = min(distance_to_left, distance_to_right, distance_to_back, distance_to_front)
-                    
-                    # Auto-determine wall based on minimum distance
-                    if min_distance == distance_to_left:
-                        wall_placement = "Left"
-                    elif min_distance == distance_to_right:
-                        wall_placement = "Right"
-                    elif min_distance == distance_to_back:
-                        wall_placement = "Back"
-                    else:
-                        wall_placement = "Front"
-                
-                # Position door/window on the selected wall
-                if wall_placement == "Left":  # Left wall
-                    x_values = [0, 0, 0, 0, 0] if not is_door else [0]
-                    y_values = [f_y, f_y + f_height, f_y + f_height, f_y, f_y] if not is_door else [f_y]
-                    z_values = [wall_height/3, wall_height/3, 2*wall_height/3, 2*wall_height/3, wall_height/3] if not is_door else [wall_height/2]
-                    
-                elif wall_placement == "Right":  # Right wall
-                    x_values = [width_m, width_m, width_m, width_m, width_m] if not is_door else [width_m]
-                    y_values = [f_y, f_y + f_height, f_y + f_height, f_y, f_y] if not is_door else [f_y]
-                    z_values = [wall_height/3, wall_height/3, 2*wall_height/3, 2*wall_height/3, wall_height/3] if not is_door else [wall_height/2]
-                    
-                elif wall_placement == "Back":  # Back wall
-                    x_values = [f_x, f_x + f_width, f_x + f_width, f_x, f_x] if not is_door else [f_x]
-                    y_values = [0, 0, 0, 0, 0] if not is_door else [0]
-                    z_values = [wall_height/3, wall_height/3, 2*wall_height/3, 2*wall_height/3, wall_height/3] if not is_door else [wall_height/2]
-                    
-                else:  # Front wall
-                    x_values = [f_x, f_x + f_width, f_x + f_width, f_x, f_x] if not is_door else [f_x]
-                    y_values = [height_m, height_m, height_m, height_m, height_m] if not is_door else [height_m]
-                    z_values = [wall_height/3, wall_height/3, 2*wall_height/3, 2*wall_height/3, wall_height/3] if not is_door else [wall_height/2]
-                
-                if is_door:
-                    # Draw door as a rectangle (3D mesh) with more visibility
-                    x_values_door = []
-                    y_values_door = []
-                    z_values_door = []
-                    
-                    # Position door on the selected wall
-                    if wall_placement == "Left":  # Left wall
-                        x_values_door = [0, 0, 0, 0]
-                        y_values_door = [f_y, f_y + f_height, f_y + f_height, f_y]
-                        z_values_door = [0, 0, wall_height * 0.8, wall_height * 0.8]
-                    elif wall_placement == "Right":  # Right wall
-                        x_values_door = [width_m, width_m, width_m, width_m]
-                        y_values_door = [f_y, f_y + f_height, f_y + f_height, f_y]
-                        z_values_door = [0, 0, wall_height * 0.8, wall_height * 0.8]
-                    elif wall_placement == "Back":  # Back wall
-                        x_values_door = [f_x, f_x + f_width, f_x + f_width, f_x]
-                        y_values_door = [0, 0, 0, 0]
-                        z_values_door = [0, 0, wall_height * 0.8, wall_height * 0.8]
-                    else:  # Front wall
-                        x_values_door = [f_x, f_x + f_width, f_x + f_width, f_x]
-                        y_values_door = [height_m, height_m, height_m, height_m]
-                        z_values_door = [0, 0, wall_height * 0.8, wall_height * 0.8]
-                        
-                    # Add door as a filled mesh
-                    i = [0, 0]
-                    j = [1, 2]
-                    k = [2, 3]
-                    
-                    fig.add_trace(
-                        go.Mesh3d(
-                            x=x_values_door,
-                            y=y_values_door,
-                            z=z_values_door,
-                            i=i, j=j, k=k,
-                            color=furniture.color,
-                            opacity=0.9,
-                            name=furniture.name,
-                            flatshading=True
-                        )
-                    )
-                else:
-                    # Add window as a 3D line on the wall (like before)
-                    fig.add_trace(
-                        go.Scatter3d(
-                            x=x_values,
-                            y=y_values,
-                            z=z_values,
-                            mode='lines',
-                            line=dict(color=furniture.color, width=6),
-                            name=furniture.name
-                        )
-                    )
-                
-                # Add a label at the center of the door/window
-                # Calculate center position based on wall placement
-                if wall_placement == "Left":  # Left wall
-                    label_x = 0 - 0.1  # Slight offset from wall
-                    label_y = f_y + f_height/2
-                    label_z = wall_height/2
-                elif wall_placement == "Right":  # Right wall
-                    label_x = width_m + 0.1  # Slight offset from wall
-                    label_y = f_y + f_height/2
-                    label_z = wall_height/2
-                elif wall_placement == "Back":  # Back wall
-                    label_x = f_x + f_width/2
-                    label_y = 0 - 0.1  # Slight offset from wall
-                    label_z = wall_height/2
-                else:  # Front wall
-                    label_x = f_x + f_width/2
-                    label_y = height_m + 0.1  # Slight offset from wall
-                    label_z = wall_height/2
-                
-            else:
-                # Regular furniture (not door/window)
-                # Create a box for the furniture
-                x_values = []
-                y_values = []
-                z_values = []
-                
-                # Bottom face
-                x_values.extend([f_x, f_x + f_width, f_x + f_width, f_x, f_x])
-                y_values.extend([f_y, f_y, f_y + f_height, f_y + f_height, f_y])
-                z_values.extend([f_z, f_z, f_z, f_z, f_z])
-                
-                # Top face
-                x_values.extend([f_x, f_x + f_width, f_x + f_width, f_x, f_x])
-                y_values.extend([f_y, f_y, f_y + f_height, f_y + f_height, f_y])
-                z_values.extend([f_z + f_thickness, f_z + f_thickness, f_z + f_thickness, f_z + f_thickness, f_z + f_thickness])
-                
-                # Connect bottom to top
-                x_values.extend([f_x, f_x, f_x + f_width, f_x + f_width])
-                y_values.extend([f_y, f_y, f_y, f_y])
-                z_values.extend([f_z, f_z + f_thickness, f_z + f_thickness, f_z])
-                
-                x_values.extend([f_x + f_width, f_x + f_width, f_x, f_x])
-                y_values.extend([f_y, f_y, f_y + f_height, f_y + f_height])
-                z_values.extend([f_z, f_z + f_thickness, f_z + f_thickness, f_z])
-                
-                x_values.extend([f_x, f_x, f_x + f_width, f_x + f_width])
-                y_values.extend([f_y + f_height, f_y + f_height, f_y + f_height, f_y + f_height])
-                z_values.extend([f_z, f_z + f_thickness, f_z + f_thickness, f_z])
-                
-                # Add furniture as a 3D line
-                fig.add_trace(
-                    go.Scatter3d(
-                        x=x_values,
-                        y=y_values,
-                        z=z_values,
-                        mode='lines',
-                        line=dict(color=furniture.color, width=4),
-                        name=furniture.name
-                    )
-                )
-                
-                # Regular furniture label position
-                label_x = f_x + f_width/2
-                label_y = f_y + f_height/2
-                label_z = f_z + f_thickness + 0.1  # Position slightly above the furniture
-            
-            # Add furniture name label with calculated position
-            fig.add_trace(
-                go.Scatter3d(
-                    x=[label_x],
-                    y=[label_y],
-                    z=[label_z],
-                    mode='text',
-                    text=[furniture.name],
-                    textposition='top center',
-                    textfont=dict(
-                        size=12,
-                        color='black'
-                    ),
-                    name=f"{furniture.name} Label"
-                )
-            )
-    
-    # Set up the 3D scene
-    fig.update_layout(
-        scene=dict(
-            xaxis=dict(showticklabels=False, title=""),
-            yaxis=dict(showticklabels=False, title=""),
-            zaxis=dict(showticklabels=False, title=""),
-            aspectmode='data',
-            camera=dict(
-                eye=dict(x=camera_x, y=camera_y, z=camera_z),
-                up=dict(x=0, y=0, z=1)
-            )
-        ),
-        margin=dict(l=0, r=0, b=0, t=0),
-        height=700  # Make the 3D visualization larger
-    )
+    # Create 3D visualization, reusing the cached figure if the room has not changed
+    fig = get_room_figure(st.session_state.room, (camera_x, camera_y, camera_z), st.session_state.figure_builder)
     
     # Display the 3D visualization
     st.plotly_chart(fig, use_container_width=True)
     
+    # Check that every piece can be walked to from a door (only once the room has one)
+    circulation = None
+    if has_doors(st.session_state.room):
+        circulation = st.session_state.circulation_analyzer.analyze(st.session_state.room)
+    if circulation and circulation.items:
+        if circulation.blocked:
+            blocked_names = ", ".join(item.name for item in circulation.blocked)
+            st.warning(f"No walkway of at least {circulation.walkway_width} cm from a door to: {blocked_names}")
+        else:
+            st.caption(f"Narrowest walkway from the doors: {circulation.min_corridor_width:.0f} cm")
+    
     # ===== ROOM EDITING OPTIONS SECTION =====
     st.markdown("<h2 style='text-align: center;'>Room Editing Options</h2>", unsafe_allow_html=True)
     
@@ -729,21 +246,40 @@ def main():
         
         with room_ops_col3:
             # Load Room
-            if st.session_state.saved_rooms:
-                saved_room_names = [room["name"] for room in st.session_state.saved_rooms]
-                selected_saved_room = st.selectbox("Saved Rooms", saved_room_names)
+            room_store = get_room_store()
+            saved_rooms = room_store.list_rooms(SAVED_ROOMS_PAGE_SIZE + 1, st.session_state.saved_rooms_pages[-1])
+            has_older = len(saved_rooms) > SAVED_ROOMS_PAGE_SIZE
+            saved_rooms = saved_rooms[:SAVED_ROOMS_PAGE_SIZE]
+            if saved_rooms:
+                saved_room_infos = {info.name: info for info in saved_rooms}
+                selected_saved_room = st.selectbox("Saved Rooms", list(saved_room_infos))
+                # Keyed by name and save time, so the room is only decoded when its thumbnail is not cached
+                thumbnail = get_saved_room_thumbnail(saved_room_infos[selected_saved_room],
+                                                     lambda: room_store.load(selected_saved_room))
+                if thumbnail is not None:
+                    st.image(thumbnail, caption=selected_saved_room)
                 
                 if st.button("Load Room"):
-                    # Find the selected room
-                    for room in st.session_state.saved_rooms:
-                        if room["name"] == selected_saved_room:
-                            # Save current state to undo history
-                            save_to_undo_history()
-                            # Load the selected room
-                            st.session_state.room = Room.from_dict(room["state"])
-                            st.session_state.current_room_name = selected_saved_room
-                            st.success(f"Loaded room: {selected_saved_room}")
-                            st.rerun()
+                    loaded_room = room_store.load(selected_saved_room)
+                    if loaded_room is not None:
+                        # Load the selected room, recording it in the undo history
+                        apply_and_record(ReplaceRoom(st.session_state.room.snapshot(), loaded_room.snapshot()))
+                        st.session_state.current_room_name = selected_saved_room
+                        st.success(f"Loaded room: {selected_saved_room}")
+                        st.rerun()
+                    else:
+                        st.error(f"Room '{selected_saved_room}' no longer exists")
+                
+                # Page through saved rooms instead of listing all of them
+                page_col1, page_col2 = st.columns(2)
+                with page_col1:
+                    if len(st.session_state.saved_rooms_pages) > 1 and st.button("Newer"):
+                        st.session_state.saved_rooms_pages.pop()
+                        st.rerun()
+                with page_col2:
+                    if has_older and st.button("Older"):
+                        st.session_state.saved_rooms_pages.append(saved_rooms[-1])
+                        st.rerun()
             else:
                 st.write("No saved rooms yet")
         
@@ -783,9 +319,7 @@ def main():
             new_height = st.slider("Room Height (cm)", 200, 800, st.session_state.room.height)
         
         if st.button("Apply Dimensions"):
-            save_to_undo_history()
-            st.session_state.room.width = new_width
-            st.session_state.room.height = new_height
+            apply_and_record(SetRoomAttributes.capture(st.session_state.room, {"width": new_width, "height": new_height}))
             st.success("Room dimensions updated")
             st.rerun()
         
@@ -793,10 +327,11 @@ def main():
         st.subheader("Room Templates")
         template_names = ["Custom"] + get_room_template_names()
         selected_template = st.selectbox("Select a template", template_names)
+        if selected_template != "Custom":
+            st.image(get_room_thumbnail(load_room_template(selected_template)), caption=selected_template)
         
         if selected_template != "Custom" and st.button("Load Template"):
-            save_to_undo_history()
-            st.session_state.room = load_room_template(selected_template)
+            apply_and_record(ReplaceRoom(st.session_state.room.snapshot(), get_template_snapshot(selected_template)))
             st.success(f"Loaded template: {selected_template}")
             st.rerun()
     
@@ -813,12 +348,14 @@ def main():
                                      if st.session_state.room.wall_color in wall_color_options else 0)
             
             if st.button("Apply to All Walls"):
-                st.session_state.room.wall_color = wall_color
                 # Also set individual wall colors
-                st.session_state.room.left_wall_color = wall_color
-                st.session_state.room.back_wall_color = wall_color
-                st.session_state.room.right_wall_color = wall_color
-                st.session_state.room.front_wall_color = wall_color
+                apply_and_record(SetRoomAttributes.capture(st.session_state.room, {
+                    "wall_color": wall_color,
+                    "left_wall_color": wall_color,
+                    "back_wall_color": wall_color,
+                    "right_wall_color": wall_color,
+                    "front_wall_color": wall_color
+                }))
                 st.success(f"Applied {wall_color} to all walls")
                 st.rerun()
         
@@ -829,7 +366,7 @@ def main():
                                          if getattr(st.session_state.room, 'left_wall_color', st.session_state.room.wall_color) in left_wall_color_options else 0)
             
             if st.button("Apply to Left Wall"):
-                st.session_state.room.left_wall_color = left_wall_color
+                apply_and_record(SetRoomAttributes.capture(st.session_state.room, {"left_wall_color": left_wall_color}))
                 st.success(f"Applied {left_wall_color} to left wall")
                 st.rerun()
         
@@ -840,7 +377,7 @@ def main():
                                          if getattr(st.session_state.room, 'back_wall_color', st.session_state.room.wall_color) in back_wall_color_options else 0)
             
             if st.button("Apply to Back Wall"):
-                st.session_state.room.back_wall_color = back_wall_color
+                apply_and_record(SetRoomAttributes.capture(st.session_state.room, {"back_wall_color": back_wall_color}))
                 st.success(f"Applied {back_wall_color} to back wall")
                 st.rerun()
         
@@ -851,7 +388,7 @@ def main():
                                           if getattr(st.session_state.room, 'right_wall_color', st.session_state.room.wall_color) in right_wall_color_options else 0)
             
             if st.button("Apply to Right Wall"):
-                st.session_state.room.right_wall_color = right_wall_color
+                apply_and_record(SetRoomAttributes.capture(st.session_state.room, {"right_wall_color": right_wall_color}))
                 st.success(f"Applied {right_wall_color} to right wall")
                 st.rerun()
         
@@ -862,7 +399,7 @@ def main():
                                           if getattr(st.session_state.room, 'front_wall_color', st.session_state.room.wall_color) in front_wall_color_options else 0)
             
             if st.button("Apply to Front Wall"):
-                st.session_state.room.front_wall_color = front_wall_color
+                apply_and_record(SetRoomAttributes.capture(st.session_state.room, {"front_wall_color": front_wall_color}))
                 st.success(f"Applied {front_wall_color} to front wall")
                 st.rerun()
     
@@ -874,7 +411,7 @@ def main():
                                   if st.session_state.room.floor_design in floor_design_options else 0)
         
         if st.button("Apply Floor Design"):
-            st.session_state.room.floor_design = floor_design
+            apply_and_record(SetRoomAttributes.capture(st.session_state.room, {"floor_design": floor_design}))
             st.success(f"Applied {floor_design} floor design")
             st.rerun()
     
@@ -882,22 +419,18 @@ def main():
         # Add Furniture Tab
         st.subheader("Add Furniture")
         
-        # Group items by category
-        furniture_categories = {}
-        for item in FURNITURE_ITEMS:
-            if item.category not in furniture_categories:
-                furniture_categories[item.category] = []
-            furniture_categories[item.category].append(item)
-        
-        selected_category = st.selectbox("Furniture Category", list(furniture_categories.keys()))
+        # The catalog is indexed once and shared by every session
+        catalog = get_catalog()
+        selected_category = st.selectbox("Furniture Category", catalog.categories)
         
         # Show items for selected category
         if selected_category:
-            category_items = furniture_categories[selected_category]
-            item_names = [item.name for item in category_items]
-            selected_item_name = st.selectbox("Select Furniture", item_names)
+            category_items = catalog.items_in_category(selected_category)
+            # Selected by id, since display names need not be unique across the catalog
+            selected_item_id = st.selectbox("Select Furniture", [item.id for item in category_items],
+                                            format_func=lambda item_id: catalog.get(item_id).name)
             
-            selected_item = next((item for item in category_items if item.name == selected_item_name), None)
+            selected_item = catalog.get(selected_item_id)
             
             if selected_item:
                 st.write(f"Size: {selected_item.width}cm x {selected_item.height}cm")
@@ -940,28 +473,62 @@ def main():
                     
                     # Add wall placement attribute for doors and windows
                     if is_door_or_window:
-                        setattr(new_furniture, "wall", wall_placement)
-                    
-                    # Save action for undo history
-                    save_to_undo_history()
+                        new_furniture.wall = wall_placement
                     
                     # Add furniture to room
                     success, message = st.session_state.room.add_furniture(new_furniture)
                     
+                    if not success:
+                        # Snap to the nearest free spot instead of rejecting the placement
+                        free_position = st.session_state.room.find_nearest_free_position(
+                            new_furniture, INTERACTIVE_SEARCH_RADIUS, max_batches=INTERACTIVE_SEARCH_BATCHES)
+                        if free_position is not None:
+                            new_furniture.x, new_furniture.y = free_position
+                            success, message = st.session_state.room.add_furniture(new_furniture)
+                    
                     if success:
-                        st.success(f"Added {selected_item.name} to the room")
+                        # Save action for undo history
+                        st.session_state.undo_history.record(AddFurniture.from_furniture(new_furniture))
+                        st.success(f"Added {selected_item.name} to the room at ({new_furniture.x:.0f}, {new_furniture.y:.0f})")
                         st.rerun()
                     else:
                         st.error(message)
-        
+
+        # Auto Layout
+        st.subheader("Auto Layout")
+        auto_items = [item for item in get_catalog()
+                      if not (item.id.startswith('door') or item.id.startswith('window'))]
+        auto_item_ids = st.multiselect("Furniture to place automatically",
+                                       options=[item.id for item in auto_items],
+                                       format_func=lambda item_id: get_catalog().get(item_id).name)
+        if auto_item_ids:
+            # Starts the shared solver processes while items are being picked, not on the first click
+            get_solver_pool()
+
+        if auto_item_ids and st.button("Auto Place"):
+            try:
+                layout = solve_layout_parallel(st.session_state.room, auto_item_ids)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                if not layout.feasible:
+                    st.error("Could not find a layout without overlaps. Try fewer items or a larger room.")
+                else:
+                    for new_furniture, (success, message) in zip(layout.furniture,
+                                                                 apply_layout(st.session_state.room, layout)):
+                        if success:
+                            st.session_state.undo_history.record(AddFurniture.from_furniture(new_furniture))
+                    st.success(f"Placed {len(layout.furniture)} items in {layout.elapsed * 1000:.0f} ms")
+                    st.rerun()
+
         # Furniture Management
         st.subheader("Manage Existing Furniture")
         
         if hasattr(st.session_state.room, 'furniture') and st.session_state.room.furniture:
-            furniture_list = [(f.id, f.name) for f in st.session_state.room.furniture]
+            furniture_names = st.session_state.room.names_by_id()
             selected_furniture_id = st.selectbox("Select Furniture to Move or Delete", 
-                                               options=[id for id, _ in furniture_list],
-                                               format_func=lambda x: next((name for id, name in furniture_list if id == x), ""))
+                                               options=list(st.session_state.room.iter_ids()),
+                                               format_func=lambda x: furniture_names.get(x, ""))
             
             selected_furniture = st.session_state.room.get_furniture_by_id(selected_furniture_id)
             
@@ -974,13 +541,29 @@ def main():
                     new_y = st.slider("Y Position", 0, st.session_state.room.height, int(selected_furniture.y), key=f"move_furniture_y_pos_{selected_furniture_id}")
                     
                     if st.button("Move Furniture"):
-                        st.session_state.room.update_furniture_position(selected_furniture_id, new_x, new_y)
-                        st.success(f"Moved {selected_furniture.name} to ({new_x}, {new_y})")
-                        st.rerun()
+                        old_position = {"x": selected_furniture.x, "y": selected_furniture.y}
+                        moved = st.session_state.room.update_furniture_position(selected_furniture_id, new_x, new_y)
+                        if not moved:
+                            # Snap to the nearest free spot around the requested position
+                            target = selected_furniture.copy()
+                            target.x, target.y = new_x, new_y
+                            free_position = st.session_state.room.find_nearest_free_position(
+                                target, INTERACTIVE_SEARCH_RADIUS, max_batches=INTERACTIVE_SEARCH_BATCHES)
+                            if free_position is not None:
+                                moved = st.session_state.room.update_furniture_position(selected_furniture_id, *free_position)
+                        if moved:
+                            st.session_state.undo_history.record(SetFurnitureAttributes(
+                                selected_furniture_id, old_position, {"x": selected_furniture.x, "y": selected_furniture.y}))
+                            st.success(f"Moved {selected_furniture.name} to ({selected_furniture.x:.0f}, {selected_furniture.y:.0f})")
+                            st.rerun()
+                        else:
+                            st.error(f"Cannot move {selected_furniture.name} there. There is no free space nearby.")
                 
                 with col_delete:
                     if st.button("Delete Furniture"):
+                        removal = RemoveFurniture.from_furniture(st.session_state.room, selected_furniture)
                         if st.session_state.room.remove_furniture(selected_furniture_id):
+                            st.session_state.undo_history.record(removal)
                             st.success(f"Removed {selected_furniture.name} from the room")
                             st.rerun()
         else:
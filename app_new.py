@@ -10,11 +10,12 @@ import uuid
 
 from utils import get_mouse_pos_in_canvas, get_wall_color_hex, get_floor_design_color
 from room import Room
+from scene_plotly import FigureBuilder, get_room_figure
 from furniture import Furniture, get_furniture_item_by_id
 from room_templates import load_room_template, get_room_template_names
 from assets.wall_colors import WALL_COLORS
 from assets.floor_designs import FLOOR_DESIGNS
-from assets.furniture_items import FURNITURE_ITEMS
+from catalog import get_catalog
 
 # Set page config
 st.set_page_config(
@@ -27,6 +28,10 @@ st.set_page_config(
 if 'room' not in st.session_state:
     st.session_state.room = Room(width=500, height=400, wall_color="White", floor_design="Hardwood")
     
+if 'figure_builder' not in st.session_state:
+    # Keeps per-layer scene caches so edits only rebuild what they touch
+    st.session_state.figure_builder = FigureBuilder()
+    
 if 'camera_x' not in st.session_state:
     st.session_state.camera_x = 1.5
     
@@ -51,396 +56,13 @@ def main():
     # This section will contain only the 3D view of the room for maximum visibility
     st.markdown("<h2 style='text-align: center;'>3D Room Visualization</h2>", unsafe_allow_html=True)
     
-    # Get room dimensions
-    width = st.session_state.room.width
-    height = st.session_state.room.height
-    room_height = 250 / 100  # Default room height in meters
-    
     # Get camera settings from session state
     camera_x = st.session_state.camera_x
     camera_y = st.session_state.camera_y
     camera_z = st.session_state.camera_z
     
-    # Convert room dimensions from cm to meters for visualization
-    width_m = width / 100
-    height_m = height / 100
-    
-    # Create 3D visualization
-    fig = go.Figure()
-    
-    # Get floor design colors
-    floor_colors = get_floor_design_color(st.session_state.room.floor_design)
-    
-    # Add floor with pattern
-    floor_primary_color = floor_colors["primary"]
-    floor_secondary_color = floor_colors.get("secondary", floor_primary_color)
-    
-    # Create floor with visible pattern based on floor design
-    if st.session_state.room.floor_design == "Hardwood":
-        # Hardwood pattern - add strips
-        plank_width = 0.1  # width of each plank in meters
-        num_planks = int(width_m / plank_width)
-        
-        for i in range(num_planks):
-            x_start = i * plank_width
-            x_end = (i + 1) * plank_width
-            if x_end > width_m:
-                x_end = width_m
-                
-            vertices = [
-                [x_start, 0, 0],
-                [x_end, 0, 0],
-                [x_end, height_m, 0],
-                [x_start, height_m, 0]
-            ]
-            
-            i_indices = [0]
-            j_indices = [1]
-            k_indices = [2]
-            
-            color = floor_primary_color if i % 2 == 0 else floor_secondary_color
-            
-            fig.add_trace(
-                go.Mesh3d(
-                    x=[v[0] for v in vertices],
-                    y=[v[1] for v in vertices],
-                    z=[v[2] for v in vertices],
-                    i=i_indices, j=j_indices, k=k_indices,
-                    color=color,
-                    flatshading=True,
-                    name=f"Floor Plank {i}"
-                )
-            )
-    elif st.session_state.room.floor_design == "Tile":
-        # Tile pattern - add grid
-        tile_size = 0.2  # size of each tile in meters
-        for x_idx in range(int(width_m / tile_size) + 1):
-            for y_idx in range(int(height_m / tile_size) + 1):
-                x_start = x_idx * tile_size
-                y_start = y_idx * tile_size
-                x_end = min((x_idx + 1) * tile_size, width_m)
-                y_end = min((y_idx + 1) * tile_size, height_m)
-                
-                if x_start >= width_m or y_start >= height_m:
-                    continue
-                
-                vertices = [
-                    [x_start, y_start, 0],
-                    [x_end, y_start, 0],
-                    [x_end, y_end, 0],
-                    [x_start, y_end, 0]
-                ]
-                
-                i_indices = [0]
-                j_indices = [1]
-                k_indices = [2]
-                
-                color = floor_primary_color if (x_idx + y_idx) % 2 == 0 else floor_secondary_color
-                
-                fig.add_trace(
-                    go.Mesh3d(
-                        x=[v[0] for v in vertices],
-                        y=[v[1] for v in vertices],
-                        z=[v[2] for v in vertices],
-                        i=i_indices, j=j_indices, k=k_indices,
-                        color=color,
-                        flatshading=True,
-                        name=f"Tile {x_idx}-{y_idx}"
-                    )
-                )
-    elif st.session_state.room.floor_design == "Stripes":
-        # Stripes pattern - horizontal stripes
-        stripe_width = 0.15  # width of each stripe in meters
-        num_stripes = int(height_m / stripe_width)
-        
-        for i in range(num_stripes):
-            y_start = i * stripe_width
-            y_end = (i + 1) * stripe_width
-            if y_end > height_m:
-                y_end = height_m
-                
-            vertices = [
-                [0, y_start, 0],
-                [width_m, y_start, 0],
-                [width_m, y_end, 0],
-                [0, y_end, 0]
-            ]
-            
-            i_indices = [0]
-            j_indices = [1]
-            k_indices = [2]
-            
-            color = floor_primary_color if i % 2 == 0 else floor_secondary_color
-            
-            fig.add_trace(
-                go.Mesh3d(
-                    x=[v[0] for v in vertices],
-                    y=[v[1] for v in vertices],
-                    z=[v[2] for v in vertices],
-                    i=i_indices, j=j_indices, k=k_indices,
-                    color=color,
-                    flatshading=True,
-                    name=f"Stripe {i}"
-                )
-            )
-    elif st.session_state.room.floor_design == "Zigzag":
-        # Zigzag pattern
-        zigzag_width = 0.2  # width of each zigzag section in meters
-        zigzag_height = 0.2  # height of each zigzag row
-        
-        num_zigzag_rows = int(height_m / zigzag_height)
-        num_zigzag_cols = int(width_m / zigzag_width) * 2  # Double for zigzag effect
-        
-        for row in range(num_zigzag_rows):
-            for col in range(num_zigzag_cols):
-                # Calculate zigzag position
-                x_start = (col // 2) * zigzag_width
-                y_start = row * zigzag_height
-                
-                # Zigzag pattern - alternate between forward and backward slant
-                if col % 2 == 0:  # Forward slant \
-                    vertices = [
-                        [x_start, y_start, 0],
-                        [x_start + zigzag_width, y_start + zigzag_height, 0],
-                        [x_start, y_start + zigzag_height, 0]
-                    ]
-                else:  # Backward slant /
-                    vertices = [
-                        [x_start, y_start + zigzag_height, 0],
-                        [x_start, y_start, 0],
-                        [x_start - zigzag_width, y_start + zigzag_height, 0]
-                    ]
-                
-                # Skip if outside room boundaries
-                if any(v[0] < 0 or v[0] > width_m or v[1] < 0 or v[1] > height_m for v in vertices):
-                    continue
-                
-                i_indices = [0]
-                j_indices = [1]
-                k_indices = [2]
-                
-                # Alternate colors
-                color = floor_primary_color if (row + col) % 2 == 0 else floor_secondary_color
-                
-                fig.add_trace(
-                    go.Mesh3d(
-                        x=[v[0] for v in vertices],
-                        y=[v[1] for v in vertices],
-                        z=[v[2] for v in vertices],
-                        i=i_indices, j=j_indices, k=k_indices,
-                        color=color,
-                        flatshading=True,
-                        name=f"Zigzag {row}-{col}"
-                    )
-                )
-    else:
-        # Default solid floor for other designs
-        vertices = [
-            [0, 0, 0],  # bottom left
-            [width_m, 0, 0],  # bottom right
-            [width_m, height_m, 0],  # top right
-            [0, height_m, 0],  # top left
-        ]
-        
-        i = [0]
-        j = [1]
-        k = [2]
-        
-        fig.add_trace(
-            go.Mesh3d(
-                x=[v[0] for v in vertices],
-                y=[v[1] for v in vertices],
-                z=[v[2] for v in vertices],
-                i=i, j=j, k=k,
-                color=floor_primary_color,
-                name="Floor",
-                flatshading=True
-            )
-        )
-    
-    # Get wall colors (individual wall colors if available)
-    left_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'left_wall_color', st.session_state.room.wall_color))
-    back_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'back_wall_color', st.session_state.room.wall_color))
-    right_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'right_wall_color', st.session_state.room.wall_color))
-    front_wall_color = get_wall_color_hex(getattr(st.session_state.room, 'front_wall_color', st.session_state.room.wall_color))
-    
-    # Add walls with full rectangles (no partial walls)
-    # Wall 1 (left)
-    left_wall_vertices = [
-        [0, 0, 0],  # bottom left
-        [0, height_m, 0],  # bottom right
-        [0, height_m, room_height],  # top right
-        [0, 0, room_height],  # top left
-    ]
-    
-    # For full rectangles, we need to define all triangular faces
-    i = [0, 0]
-    j = [1, 2]
-    k = [2, 3]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in left_wall_vertices],
-            y=[v[1] for v in left_wall_vertices],
-            z=[v[2] for v in left_wall_vertices],
-            i=i, j=j, k=k,
-            color=left_wall_color,
-            opacity=0.95,  # Slightly transparent to make it look like interior wall
-            name="Left Wall",
-            flatshading=True
-        )
-    )
-    
-    # Wall 2 (back)
-    back_wall_vertices = [
-        [0, 0, 0],  # bottom left
-        [width_m, 0, 0],  # bottom right
-        [width_m, 0, room_height],  # top right
-        [0, 0, room_height],  # top left
-    ]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in back_wall_vertices],
-            y=[v[1] for v in back_wall_vertices],
-            z=[v[2] for v in back_wall_vertices],
-            i=i, j=j, k=k,
-            color=back_wall_color,
-            opacity=0.95,
-            name="Back Wall",
-            flatshading=True
-        )
-    )
-    
-    # Wall 3 (right)
-    right_wall_vertices = [
-        [width_m, 0, 0],  # bottom left
-        [width_m, height_m, 0],  # bottom right
-        [width_m, height_m, room_height],  # top right
-        [width_m, 0, room_height],  # top left
-    ]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in right_wall_vertices],
-            y=[v[1] for v in right_wall_vertices],
-            z=[v[2] for v in right_wall_vertices],
-            i=i, j=j, k=k,
-            color=right_wall_color,
-            opacity=0.95,
-            name="Right Wall",
-            flatshading=True
-        )
-    )
-    
-    # Wall 4 (front)
-    front_wall_vertices = [
-        [0, height_m, 0],  # bottom left
-        [width_m, height_m, 0],  # bottom right
-        [width_m, height_m, room_height],  # top right
-        [0, height_m, room_height],  # top left
-    ]
-    
-    fig.add_trace(
-        go.Mesh3d(
-            x=[v[0] for v in front_wall_vertices],
-            y=[v[1] for v in front_wall_vertices],
-            z=[v[2] for v in front_wall_vertices],
-            i=i, j=j, k=k,
-            color=front_wall_color,
-            opacity=0.95,
-            name="Front Wall",
-            flatshading=True
-        )
-    )
-    
-    # Ceiling removed as requested
-    
-    # Add furniture items in 3D
-    if hasattr(st.session_state.room, 'furniture') and st.session_state.room.furniture:
-        for furniture in st.session_state.room.furniture:
-            # Convert furniture dimensions to meters
-            f_width = furniture.width / 100 * furniture.scale
-            f_height = furniture.height / 100 * furniture.scale
-            f_thickness = 0.05  # Standard thickness in meters
-            
-            # Calculate furniture position in meters
-            f_x = furniture.x / 100
-            f_y = furniture.y / 100
-            f_z = 0  # Place on the floor
-            
-            # Create a box for the furniture
-            x_values = []
-            y_values = []
-            z_values = []
-            
-            # Bottom face
-            x_values.extend([f_x, f_x + f_width, f_x + f_width, f_x, f_x])
-            y_values.extend([f_y, f_y, f_y + f_height, f_y + f_height, f_y])
-            z_values.extend([f_z, f_z, f_z, f_z, f_z])
-            
-            # Top face
-            x_values.extend([f_x, f_x + f_width, f_x + f_width, f_x, f_x])
-            y_values.extend([f_y, f_y, f_y + f_height, f_y + f_height, f_y])
-            z_values.extend([f_z + f_thickness, f_z + f_thickness, f_z + f_thickness, f_z + f_thickness, f_z + f_thickness])
-            
-            # Connect bottom to top
-            x_values.extend([f_x, f_x, f_x + f_width, f_x + f_width])
-            y_values.extend([f_y, f_y, f_y, f_y])
-            z_values.extend([f_z, f_z + f_thickness, f_z + f_thickness, f_z])
-            
-            x_values.extend([f_x + f_width, f_x + f_width, f_x, f_x])
-            y_values.extend([f_y, f_y, f_y + f_height, f_y + f_height])
-            z_values.extend([f_z, f_z + f_thickness, f_z + f_thickness, f_z])
-            
-            x_values.extend([f_x, f_x, f_x + f_width, f_x + f_width])
-            y_values.extend([f_y + f_height, f_y + f_height, f_y + f_height, f_y + f_height])
-            z_values.extend([f_z, f_z + f_thickness, f_z + f_thickness, f_z])
-            
-            # Add furniture as a 3D line
-            fig.add_trace(
-                go.Scatter3d(
-                    x=x_values,
-                    y=y_values,
-                    z=z_values,
-                    mode='lines',
-                    line=dict(color=furniture.color, width=4),
-                    name=furniture.name
-                )
-            )
-            
-            # Add furniture name label
-            fig.add_trace(
-                go.Scatter3d(
-                    x=[f_x + f_width/2],
-                    y=[f_y + f_height/2],
-                    z=[f_z + f_thickness + 0.1],  # Position slightly above the furniture
-                    mode='text',
-                    text=[furniture.name],
-                    textposition='top center',
-                    textfont=dict(
-                        size=12,
-                        color='black'
-                    ),
-                    name=f"{furniture.name} Label"
-                )
-            )
-    
-    # Set up the 3D scene
-    fig.update_layout(
-        scene=dict(
-            xaxis=dict(showticklabels=False, title=""),
-            yaxis=dict(showticklabels=False, title=""),
-            zaxis=dict(showticklabels=False, title=""),
-            aspectmode='data',
-            camera=dict(
-                eye=dict(x=camera_x, y=camera_y, z=camera_z),
-                up=dict(x=0, y=0, z=1)
-            )
-        ),
-        margin=dict(l=0, r=0, b=0, t=0),
-        height=700  # Make the 3D visualization larger
-    )
+    # Create 3D visualization, reusing the cached figure if the room has not changed
+    fig = get_room_figure(st.session_state.room, (camera_x, camera_y, camera_z), st.session_state.figure_builder)
     
     # Display the 3D visualization
     st.plotly_chart(fig, use_container_width=True)
@@ -559,22 +181,18 @@ def main():
         # Add Furniture Tab
         st.subheader("Add Furniture")
         
-        # Group items by category
-        furniture_categories = {}
-        for item in FURNITURE_ITEMS:
-            if item.category not in furniture_categories:
-                furniture_categories[item.category] = []
-            furniture_categories[item.category].append(item)
-        
-        selected_category = st.selectbox("Furniture Category", list(furniture_categories.keys()))
+        # The catalog is indexed once and shared by every session
+        catalog = get_catalog()
+        selected_category = st.selectbox("Furniture Category", catalog.categories)
         
         # Show items for selected category
         if selected_category:
-            category_items = furniture_categories[selected_category]
-            item_names = [item.name for item in category_items]
-            selected_item_name = st.selectbox("Select Furniture", item_names)
+            category_items = catalog.items_in_category(selected_category)
+            # Selected by id, since display names need not be unique across the catalog
+            selected_item_id = st.selectbox("Select Furniture", [item.id for item in category_items],
+                                            format_func=lambda item_id: catalog.get(item_id).name)
             
-            selected_item = next((item for item in category_items if item.name == selected_item_name), None)
+            selected_item = catalog.get(selected_item_id)
             
             if selected_item:
                 st.write(f"Size: {selected_item.width}cm x {selected_item.height}cm")
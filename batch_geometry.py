@@ -0,0 +1,203 @@
+"""Vectorized geometry for whole-room batch queries.
+
+A room's furniture is viewed as a struct of contiguous float arrays so that
+corners, all-pairs overlap and point hit-testing are each one NumPy call.
+Results follow the same rules as the per-object code in furniture.py and
+collision.py.
+"""
+from typing import Iterable, NamedTuple, Union
+
+import numpy as np
+
+from collision import circle_radius, is_collidable
+from furniture import Furniture, FurnitureArray, get_furniture_item_by_id
+
+BOUNDS_TOLERANCE = 1e-6  # cm a footprint may reach past a wall before it counts as out of bounds
+
+class FurnitureArrays(NamedTuple):
+    """Struct-of-arrays view of a list of furniture. Index i refers to the i-th piece."""
+    ids: np.ndarray  # int64, furniture IDs (-1 if unset)
+    x: np.ndarray
+    y: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+    scale: np.ndarray
+    rotation: np.ndarray  # In degrees
+    radius: np.ndarray  # Footprint radius of circular items, NaN for rectangles
+    collidable: np.ndarray  # bool, see collision.is_collidable
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def furniture_arrays(furniture_list: Union[FurnitureArray, Iterable[Furniture]]) -> FurnitureArrays:
+    """Build the struct-of-arrays view of the given furniture."""
+    if isinstance(furniture_list, FurnitureArray):
+        return _from_furniture_array(furniture_list)
+    rows = [
+        (
+            -1 if furniture.id is None else furniture.id,
+            furniture.x, furniture.y, furniture.width, furniture.height,
+            furniture.scale, furniture.rotation,
+            np.nan if circle_radius(furniture) is None else circle_radius(furniture),
+            is_collidable(furniture.item_id)
+        )
+        for furniture in furniture_list
+    ]
+    columns = list(zip(*rows)) if rows else [()] * 9
+    return FurnitureArrays(
+        ids=np.array(columns[0], dtype=np.int64),
+        x=np.array(columns[1], dtype=np.float64),
+        y=np.array(columns[2], dtype=np.float64),
+        width=np.array(columns[3], dtype=np.float64),
+        height=np.array(columns[4], dtype=np.float64),
+        scale=np.array(columns[5], dtype=np.float64),
+        rotation=np.array(columns[6], dtype=np.float64),
+        radius=np.array(columns[7], dtype=np.float64),
+        collidable=np.array(columns[8], dtype=bool)
+    )
+
+def _from_furniture_array(array: FurnitureArray) -> FurnitureArrays:
+    """Build the struct-of-arrays view from column-wise storage without materializing furniture."""
+    # Shape and collidability only depend on the catalog item, so resolve them once per item ID
+    items = [get_furniture_item_by_id(item_id) for item_id in array.item_ids.values]
+    is_circle_item = np.array([item is not None and item.shape == "circle" for item in items], dtype=bool)
+    is_collidable_item = np.array([is_collidable(item_id) for item_id in array.item_ids.values], dtype=bool)
+    codes = array.item_ids.codes
+    
+    # Stretched circles are treated as rectangles, as in collision.circle_radius
+    is_circle = is_circle_item[codes] & (array.width == array.height)
+    return FurnitureArrays(
+        ids=array.ids,
+        x=array.x,
+        y=array.y,
+        width=array.width,
+        height=array.height,
+        scale=array.scale,
+        rotation=array.rotation,
+        radius=np.where(is_circle, array.width * array.scale / 2, np.nan),
+        collidable=is_collidable_item[codes]
+    )
+
+def _frames(arrays: FurnitureArrays):
+    """Get centers, half extents and rotation sin/cos for every piece."""
+    half_width = arrays.width * arrays.scale / 2
+    half_height = arrays.height * arrays.scale / 2
+    rad = np.radians(arrays.rotation)
+    return arrays.x + half_width, arrays.y + half_height, half_width, half_height, np.sin(rad), np.cos(rad)
+
+def corners(arrays: FurnitureArrays) -> np.ndarray:
+    """Get the rotated corners of every piece as an (N, 4, 2) array, ordered like Furniture.get_corners."""
+    center_x, center_y, half_width, half_height, sin_r, cos_r = _frames(arrays)
+    rel_x = np.array([-1.0, 1.0, 1.0, -1.0]) * half_width[:, None]
+    rel_y = np.array([-1.0, -1.0, 1.0, 1.0]) * half_height[:, None]
+    result = np.empty((len(arrays), 4, 2))
+    result[:, :, 0] = center_x[:, None] + rel_x * cos_r[:, None] - rel_y * sin_r[:, None]
+    result[:, :, 1] = center_y[:, None] + rel_x * sin_r[:, None] + rel_y * cos_r[:, None]
+    return result
+
+def bounding_boxes(arrays: FurnitureArrays) -> np.ndarray:
+    """Get the (min_x, min_y, max_x, max_y) bounding box of every piece as an (N, 4) array."""
+    points = corners(arrays)
+    return np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1)
+
+def out_of_bounds(arrays: FurnitureArrays, width: float, height: float) -> np.ndarray:
+    """Get an (N,) boolean mask of the pieces whose rotated, scaled footprint reaches
+    outside a width x height room."""
+    boxes = bounding_boxes(arrays)
+    # Rotated corners carry rounding noise, e.g. -1e-14 for a piece against a wall
+    return ((boxes[:, 0] < -BOUNDS_TOLERANCE) | (boxes[:, 1] < -BOUNDS_TOLERANCE) |
+            (boxes[:, 2] > width + BOUNDS_TOLERANCE) | (boxes[:, 3] > height + BOUNDS_TOLERANCE))
+
+def _overlaps(rows: FurnitureArrays, columns: FurnitureArrays, expand) -> np.ndarray:
+    """Overlap test between pieces of rows (i) and columns (j), broadcast after applying expand
+    to the per-piece arrays of each side."""
+    center_x_i, center_y_i, half_width_i, half_height_i, sin_i, cos_i = (expand(a, 0) for a in _frames(rows))
+    center_x_j, center_y_j, half_width_j, half_height_j, sin_j, cos_j = (expand(a, 1) for a in _frames(columns))
+
+    # Offsets between centers: d[i, j] = center[j] - center[i]
+    dx = center_x_j - center_x_i
+    dy = center_y_j - center_y_i
+
+    # Projections of d onto the local axes of i and j
+    d_ui = dx * cos_i + dy * sin_i
+    d_vi = -dx * sin_i + dy * cos_i
+    d_uj = dx * cos_j + dy * sin_j
+    d_vj = -dx * sin_j + dy * cos_j
+
+    # |cos| and |sin| of the relative rotation between i and j
+    abs_cos = np.abs(cos_i * cos_j + sin_i * sin_j)
+    abs_sin = np.abs(sin_j * cos_i - cos_j * sin_i)
+
+    hw_i, hh_i, hw_j, hh_j = half_width_i, half_height_i, half_width_j, half_height_j
+
+    # Separating axis tests on the two local axes of each rectangle
+    overlaps = (
+        (np.abs(d_ui) <= hw_i + hw_j * abs_cos + hh_j * abs_sin) &
+        (np.abs(d_vi) <= hh_i + hw_j * abs_sin + hh_j * abs_cos) &
+        (np.abs(d_uj) <= hw_j + hw_i * abs_cos + hh_i * abs_sin) &
+        (np.abs(d_vj) <= hh_j + hw_i * abs_sin + hh_i * abs_cos)
+    )
+
+    is_circle_i = ~np.isnan(rows.radius)
+    is_circle_j = ~np.isnan(columns.radius)
+    if is_circle_i.any() or is_circle_j.any():
+        r_i = expand(np.nan_to_num(rows.radius), 0)
+        r_j = expand(np.nan_to_num(columns.radius), 1)
+
+        both_circles = (dx * dx + dy * dy) <= (r_i + r_j) ** 2
+
+        # Circle j against rectangle i: center of j in the frame of i
+        gap_x = np.maximum(np.abs(d_ui) - hw_i, 0.0)
+        gap_y = np.maximum(np.abs(d_vi) - hh_i, 0.0)
+        circle_j_box_i = gap_x * gap_x + gap_y * gap_y <= r_j * r_j
+
+        # Circle i against rectangle j: center of i in the frame of j
+        gap_x = np.maximum(np.abs(d_uj) - hw_j, 0.0)
+        gap_y = np.maximum(np.abs(d_vj) - hh_j, 0.0)
+        circle_i_box_j = gap_x * gap_x + gap_y * gap_y <= r_i * r_i
+
+        c_i, c_j = expand(is_circle_i, 0), expand(is_circle_j, 1)
+        overlaps = np.where(c_i & c_j, both_circles,
+                   np.where(c_j, circle_j_box_i,
+                   np.where(c_i, circle_i_box_j, overlaps)))
+    return overlaps
+
+def cross_overlap(rows: FurnitureArrays, columns: FurnitureArrays) -> np.ndarray:
+    """Get the (R, C) boolean matrix of which pieces of rows overlap which pieces of columns.
+
+    Uses separating-axis tests for rectangle pairs and distance tests when either
+    piece is circular. Every piece is treated as collidable.
+    """
+    return _overlaps(rows, columns, lambda array, side: array[:, None] if side == 0 else array[None, :])
+
+def paired_overlap(first: FurnitureArrays, second: FurnitureArrays) -> np.ndarray:
+    """Get whether first[k] overlaps second[k] for every k, for two views of the same length.
+    Same tests as cross_overlap, for a list of pairs instead of all combinations."""
+    return _overlaps(first, second, lambda array, side: array)
+
+def overlap_matrix(arrays: FurnitureArrays) -> np.ndarray:
+    """Get the symmetric (N, N) boolean matrix of overlapping pairs.
+
+    Uses separating-axis tests for rectangle pairs and distance tests when either
+    piece is circular. The diagonal and rows/columns of non-collidable items
+    (doors, windows and rugs) are False.
+    """
+    overlaps = cross_overlap(arrays, arrays)
+    overlaps &= arrays.collidable[:, None] & arrays.collidable[None, :]
+    np.fill_diagonal(overlaps, False)
+    return overlaps
+
+def hit_test(arrays: FurnitureArrays, points) -> np.ndarray:
+    """Get a (P, N) boolean mask of which pieces contain each of the P (x, y) points.
+
+    Matches Furniture.contains_point, i.e. every piece is tested as a rectangle.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    center_x, center_y, half_width, half_height, sin_r, cos_r = _frames(arrays)
+    rel_x = points[:, 0:1] - center_x[None, :]
+    rel_y = points[:, 1:2] - center_y[None, :]
+
+    # Rotate points into each piece's local frame
+    local_x = rel_x * cos_r[None, :] + rel_y * sin_r[None, :]
+    local_y = -rel_x * sin_r[None, :] + rel_y * cos_r[None, :]
+    return (np.abs(local_x) <= half_width[None, :]) & (np.abs(local_y) <= half_height[None, :])
@@ -0,0 +1,146 @@
+"""Indexed, immutable furniture catalog.
+
+A Catalog builds its indexes once: items by id, by category and by shape,
+a name to id map, and width- and height-sorted orders for range queries such
+as "items that fit in 80 x 60 cm". A range query binary searches both orders
+and filters whichever range holds fewer items by the other dimension.
+Catalogs and their items (frozen FurnitureItems) cannot be changed after they
+are built, so one instance can be shared by every session of the app.
+"""
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from furniture import FurnitureItem
+from assets.furniture_items import FURNITURE_ITEMS
+
+class Catalog:
+    """Immutable collection of furniture items with lookup and range-query indexes.
+
+    Items keep the order they were given in, and every query returns them in
+    that order. Range queries cost two binary searches plus a scan of the
+    items in the narrower of the width and height ranges. Item ids must be
+    unique; if several items share a name, id_for_name returns the first of
+    them.
+    """
+    __slots__ = ("_items", "_by_id", "_by_category", "_by_shape", "_id_by_name",
+                 "_widths", "_heights", "_width_order", "_sorted_widths", "_height_order", "_sorted_heights")
+
+    def __init__(self, items: Iterable[FurnitureItem]):
+        items = tuple(items)
+        by_id: Dict[str, FurnitureItem] = {}
+        by_category: Dict[str, List[FurnitureItem]] = {}
+        by_shape: Dict[str, List[FurnitureItem]] = {}
+        id_by_name: Dict[str, str] = {}
+        for item in items:
+            if item.id in by_id:
+                raise ValueError(f"Duplicate furniture item id {item.id!r}")
+            by_id[item.id] = item
+            by_category.setdefault(item.category, []).append(item)
+            by_shape.setdefault(item.shape, []).append(item)
+            id_by_name.setdefault(item.name, item.id)
+
+        widths = np.array([item.width for item in items], dtype=np.float64)
+        heights = np.array([item.height for item in items], dtype=np.float64)
+        width_order = np.argsort(widths, kind="stable")
+        sorted_widths = widths[width_order]
+        height_order = np.argsort(heights, kind="stable")
+        sorted_heights = heights[height_order]
+        for array in (widths, heights, width_order, sorted_widths, height_order, sorted_heights):
+            array.setflags(write=False)
+
+        # Attributes are set once here; __setattr__ and __delattr__ reject any later change
+        for name, value in (
+            ("_items", items),
+            ("_by_id", MappingProxyType(by_id)),
+            ("_by_category", MappingProxyType({key: tuple(value) for key, value in by_category.items()})),
+            ("_by_shape", MappingProxyType({key: tuple(value) for key, value in by_shape.items()})),
+            ("_id_by_name", MappingProxyType(id_by_name)),
+            ("_widths", widths),
+            ("_heights", heights),
+            ("_width_order", width_order),
+            ("_sorted_widths", sorted_widths),
+            ("_height_order", height_order),
+            ("_sorted_heights", sorted_heights),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Catalog is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Catalog is immutable")
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[FurnitureItem]:
+        return iter(self._items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._by_id
+
+    def get(self, item_id: str) -> Optional[FurnitureItem]:
+        """Get an item by id, or None if there is no such item."""
+        return self._by_id.get(item_id)
+
+    def id_for_name(self, name: str) -> Optional[str]:
+        """Get the id of the item with the given display name, or None."""
+        return self._id_by_name.get(name)
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        """Get the categories in order of first appearance."""
+        return tuple(self._by_category)
+
+    @property
+    def shapes(self) -> Tuple[str, ...]:
+        """Get the shapes in order of first appearance."""
+        return tuple(self._by_shape)
+
+    def items_in_category(self, category: str) -> Tuple[FurnitureItem, ...]:
+        return self._by_category.get(category, ())
+
+    def items_with_shape(self, shape: str) -> Tuple[FurnitureItem, ...]:
+        return self._by_shape.get(shape, ())
+
+    def _range_indexes(self, min_width: float, max_width: float,
+                       min_height: float, max_height: float) -> np.ndarray:
+        """Get the sorted indexes of items whose width and height are within the given ranges."""
+        # Binary search both ranges, then filter the smaller slice by the other dimension
+        width_start = np.searchsorted(self._sorted_widths, min_width, side="left")
+        width_end = np.searchsorted(self._sorted_widths, max_width, side="right")
+        height_start = np.searchsorted(self._sorted_heights, min_height, side="left")
+        height_end = np.searchsorted(self._sorted_heights, max_height, side="right")
+        if width_end - width_start <= height_end - height_start:
+            candidates = self._width_order[width_start:width_end]
+            heights = self._heights[candidates]
+            return np.sort(candidates[(heights >= min_height) & (heights <= max_height)])
+        candidates = self._height_order[height_start:height_end]
+        widths = self._widths[candidates]
+        return np.sort(candidates[(widths >= min_width) & (widths <= max_width)])
+
+    def items_in_range(self, min_width: float = 0, max_width: float = np.inf,
+                       min_height: float = 0, max_height: float = np.inf) -> Tuple[FurnitureItem, ...]:
+        """Get the items whose catalog width and height (in cm) are within the given ranges, inclusive."""
+        return tuple(self._items[index] for index in self._range_indexes(min_width, max_width, min_height, max_height))
+
+    def items_fitting(self, width: float, height: float, allow_rotation: bool = False) -> Tuple[FurnitureItem, ...]:
+        """Get the items that fit in a width x height (cm) area, optionally turned by 90 degrees."""
+        indexes = self._range_indexes(0, width, 0, height)
+        if allow_rotation:
+            indexes = np.union1d(indexes, self._range_indexes(0, height, 0, width))
+        return tuple(self._items[index] for index in indexes)
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+def get_catalog() -> Catalog:
+    """Get the catalog of the built-in furniture items, shared by every session of the app."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog(FURNITURE_ITEMS)
+        return _catalog
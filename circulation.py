@@ -0,0 +1,269 @@
+"""Walkway clearance and circulation analysis.
+
+The floor is rasterized with an OccupancyGrid (rugs are walked on, so they are
+left out). An exact Euclidean distance transform gives every free cell its
+clearance: the distance to the nearest furniture or wall. A walkway through a
+cell can then be at most twice that clearance wide. Starting from the doors,
+a vectorized widest-path search finds for every cell the widest corridor that
+reaches it, i.e. the path whose narrowest point is as wide as possible. A
+piece of furniture is reachable when some cell within reach of its footprint
+can be walked to through corridors at least WALKWAY_WIDTH wide.
+
+Distance fields and corridor widths are cached against the grid version, so
+re-analyzing an unchanged room only re-checks the furniture.
+"""
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from collision import circle_radius, is_collidable
+from furniture import Furniture
+from occupancy import OccupancyGrid
+from room import Room
+
+CIRCULATION_RESOLUTION = 10  # Grid cell size in cm
+WALKWAY_WIDTH = 60  # Narrowest corridor a person can walk through, in cm
+ACCESS_DISTANCE = 50  # How far from a piece a person can stand and still use it, in cm
+DOOR_ITEMS = ("door_single", "door_double")
+
+# (min_x, min_y, max_x, max_y) in cm
+BoundingBox = Tuple[float, float, float, float]
+
+class ItemAccess(NamedTuple):
+    """How well one piece of furniture can be reached from the doors."""
+    id: int
+    name: str
+    access_width: float  # Width of the narrowest point on the widest route to the piece, in cm
+    reachable: bool
+
+class CirculationReport(NamedTuple):
+    """Result of a circulation analysis."""
+    door_count: int
+    items: List[ItemAccess]
+    walkway_width: float
+
+    @property
+    def blocked(self) -> List[ItemAccess]:
+        """Get the pieces that cannot be reached through a walkway of walkway_width."""
+        return [item for item in self.items if not item.reachable]
+
+    @property
+    def min_corridor_width(self) -> Optional[float]:
+        """Get the narrowest corridor that must be walked through to reach every piece,
+        or None if there are no doors or no pieces."""
+        if self.door_count == 0 or not self.items:
+            return None
+        return min(item.access_width for item in self.items)
+
+def has_doors(room: Room) -> bool:
+    """Check if a room has a door to walk in through."""
+    return any(furniture.item_id in DOOR_ITEMS for furniture in room.furniture)
+
+def is_walkable(furniture: Furniture) -> bool:
+    """Check if a piece can be walked over or through: the pieces that do not collide
+    (doors, windows and rugs)."""
+    return not is_collidable(furniture.item_id)
+
+def _nearest_obstacle_1d(obstacles: np.ndarray) -> np.ndarray:
+    """Get the distance in cells from every cell to the nearest obstacle in its row.
+    The cells just outside both ends of a row count as obstacles (walls)."""
+    rows, cols = obstacles.shape
+    index = np.arange(cols)
+    left = np.where(obstacles, index, -1)
+    np.maximum.accumulate(left, axis=1, out=left)
+    right = np.where(obstacles, index, cols)
+    right = np.minimum.accumulate(right[:, ::-1], axis=1)[:, ::-1]
+    return np.minimum(index - left, right - index)
+
+def _lower_envelope(values: List[float]) -> List[float]:
+    """Get min over q of (p - q)^2 + values[q] for every p, with walls (value 0) just
+    beyond both ends. Felzenszwalb and Huttenlocher's lower envelope of parabolas, O(n)."""
+    n = len(values)
+    # Parabola q has its vertex at position q - 1; positions 0 and n + 1 are the walls
+    heights = [0.0] + values + [0.0]
+    vertices = [0]
+    bounds = [-math.inf, math.inf]  # Parabola vertices[k] is lowest between bounds[k] and bounds[k + 1]
+    for q in range(1, n + 2):
+        height = heights[q] + q * q
+        while True:
+            v = vertices[-1]
+            crossing = (height - heights[v] - v * v) / (2 * (q - v))
+            if crossing > bounds[-2]:
+                break
+            vertices.pop()
+            bounds.pop()
+        vertices.append(q)
+        bounds[-1] = crossing
+        bounds.append(math.inf)
+    result = []
+    k = 0
+    for p in range(1, n + 1):
+        while bounds[k + 1] < p:
+            k += 1
+        v = vertices[k]
+        result.append((p - v) ** 2 + heights[v])
+    return result
+
+def distance_transform(obstacles: np.ndarray) -> np.ndarray:
+    """Get the exact Euclidean distance in cells from every cell center to the nearest
+    obstacle cell center, treating the cells around the grid as obstacles (walls).
+
+    Separable in two passes: nearest obstacles along every row, then the lower envelope
+    of the squared row distances down every column, so the work is linear in the cells.
+    """
+    rows, cols = obstacles.shape
+    if obstacles.size == 0:
+        return np.zeros(obstacles.shape)
+    row_squared = (_nearest_obstacle_1d(obstacles).astype(np.float64) ** 2).T.tolist()
+    squared = np.array([_lower_envelope(column) for column in row_squared]).T
+    return np.sqrt(squared)
+
+def widest_paths(width: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    """Get, for every cell, the largest w such that the cell can be reached from a source
+    cell by an 8-connected path of cells with width >= w (0 where unreachable).
+
+    Relaxes all cells at once until nothing changes, so the number of numpy passes
+    grows with the path length rather than the number of cells.
+    """
+    best = np.where(sources, width, 0.0)
+    padded = np.zeros((width.shape[0] + 2, width.shape[1] + 2))
+    rows, cols = width.shape
+    while True:
+        padded[1:-1, 1:-1] = best
+        neighbors = best.copy()
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                if dr != 1 or dc != 1:
+                    np.maximum(neighbors, padded[dr:dr + rows, dc:dc + cols], out=neighbors)
+        relaxed = np.maximum(best, np.minimum(width, neighbors))
+        if np.array_equal(relaxed, best):
+            return best
+        best = relaxed
+
+class CirculationAnalyzer:
+    """Analyzes circulation in a room, caching work between calls.
+
+    Keep one analyzer per room being edited: the occupancy grid is updated
+    incrementally and the clearance and corridor fields are only recomputed
+    when furniture or doors have changed.
+    """
+    def __init__(self, resolution: float = CIRCULATION_RESOLUTION,
+                 walkway_width: float = WALKWAY_WIDTH,
+                 access_distance: float = ACCESS_DISTANCE):
+        self.resolution = resolution
+        self.walkway_width = walkway_width
+        self.access_distance = access_distance
+        self._grid: Optional[OccupancyGrid] = None
+        self._fields_key: Optional[tuple] = None
+        self._width: Optional[np.ndarray] = None
+        self._paths: Optional[np.ndarray] = None
+
+    def _sync_grid(self, room: Room) -> OccupancyGrid:
+        grid = self._grid
+        if grid is None or grid.width != room.width or grid.height != room.height:
+            grid = OccupancyGrid(room.width, room.height, self.resolution)
+            self._grid = grid
+        grid.sync(furniture for furniture in room.furniture if not is_walkable(furniture))
+        return grid
+
+    def _obstacles_with_walls(self, grid: OccupancyGrid, doors: List[BoundingBox]) -> Tuple[np.ndarray, int]:
+        """Get the occupied cells surrounded by a band of wall cells, open where doors meet a wall.
+        Returns the padded grid and the band thickness in cells."""
+        res = grid.resolution
+        pad = math.ceil(self.walkway_width / res)  # Thick enough that the implicit walls beyond never matter
+        rows, cols = grid.shape
+        obstacles = np.ones((rows + 2 * pad, cols + 2 * pad), dtype=bool)
+        for min_x, min_y, max_x, max_y in doors:
+            # Carry the opening through the wall band on each side the door touches
+            if min_x <= res:
+                min_x = -pad * res
+            if min_y <= res:
+                min_y = -pad * res
+            if max_x >= grid.width - res:
+                max_x = grid.width + pad * res
+            if max_y >= grid.height - res:
+                max_y = grid.height + pad * res
+            row0 = max(0, math.floor(min_y / res) + pad)
+            col0 = max(0, math.floor(min_x / res) + pad)
+            row1 = min(obstacles.shape[0], math.ceil(max_y / res) + pad)
+            col1 = min(obstacles.shape[1], math.ceil(max_x / res) + pad)
+            obstacles[row0:row1, col0:col1] = False
+        obstacles[pad:pad + rows, pad:pad + cols] = grid.occupied()
+        return obstacles, pad
+
+    def _door_cells(self, grid: OccupancyGrid, doors: List[BoundingBox]) -> np.ndarray:
+        """Get a boolean grid of the free cells at the doors."""
+        res = grid.resolution
+        sources = np.zeros(grid.shape, dtype=bool)
+        for min_x, min_y, max_x, max_y in doors:
+            # One cell of margin so doors along a wall touch the cells inside the room
+            row0, col0, row1, col1 = grid.cell_range(min_x - res, min_y - res, max_x + res, max_y + res)
+            sources[row0:row1, col0:col1] = True
+        return sources & ~grid.occupied()
+
+    def fields(self, room: Room) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (corridor width, reachable width) grids of a room, in cm.
+
+        The corridor width of a cell is the widest walkway that fits through it: twice the
+        distance to the nearest furniture edge or wall (0 for occupied cells). The reachable
+        width is the narrowest point on the widest route from a door to the cell (0 where
+        no route exists). Both are cached until furniture or doors change.
+        """
+        grid = self._sync_grid(room)
+        doors = [furniture.get_bounding_box() for furniture in room.furniture if furniture.item_id in DOOR_ITEMS]
+        key = (id(grid), grid.version, tuple(doors))
+        if key != self._fields_key:
+            obstacles, pad = self._obstacles_with_walls(grid, doors)
+            rows, cols = grid.shape
+            distance = distance_transform(obstacles)[pad:pad + rows, pad:pad + cols]
+            # Cell centers are half a cell from the edge of a neighboring obstacle cell
+            clearance = np.maximum(distance - 0.5, 0) * grid.resolution
+            self._width = np.where(grid.occupied(), 0.0, 2 * clearance)
+            self._paths = widest_paths(self._width, self._door_cells(grid, doors))
+            self._fields_key = key
+        return self._width, self._paths
+
+    def access_width(self, furniture: Furniture, paths: np.ndarray) -> float:
+        """Get the widest route (in cm) to any cell within access_distance of a piece."""
+        grid = self._grid
+        min_x, min_y, max_x, max_y = furniture.get_bounding_box()
+        reach = self.access_distance
+        row0, col0, row1, col1 = grid.cell_range(min_x - reach, min_y - reach, max_x + reach, max_y + reach)
+        if row0 >= row1 or col0 >= col1:
+            return 0.0
+
+        res = grid.resolution
+        geometry = furniture.get_geometry()
+        rel_x = (np.arange(col0, col1) + 0.5)[None, :] * res - geometry.center[0]
+        rel_y = (np.arange(row0, row1) + 0.5)[:, None] * res - geometry.center[1]
+        radius = circle_radius(furniture)
+        if radius is not None:
+            distance = np.maximum(np.hypot(rel_x, rel_y) - radius, 0)
+        else:
+            # Distance from the cell centers to the rotated rectangle, in its own frame
+            local_x = rel_x * geometry.cos + rel_y * geometry.sin
+            local_y = -rel_x * geometry.sin + rel_y * geometry.cos
+            distance = np.hypot(np.maximum(np.abs(local_x) - geometry.half_width, 0),
+                                np.maximum(np.abs(local_y) - geometry.half_height, 0))
+        window = paths[row0:row1, col0:col1]
+        return float(window[distance <= reach].max(initial=0.0))
+
+    def analyze(self, room: Room) -> CirculationReport:
+        """Check which furniture can be reached from the doors through walkways of walkway_width."""
+        door_count = sum(furniture.item_id in DOOR_ITEMS for furniture in room.furniture)
+        if not door_count:
+            # Nothing can be walked to without a door, so skip building the fields
+            return CirculationReport(0, [], self.walkway_width)
+        _, paths = self.fields(room)
+        items = []
+        for furniture in room.furniture:
+            if is_walkable(furniture):
+                continue
+            width = self.access_width(furniture, paths)
+            items.append(ItemAccess(furniture.id, furniture.name, width, width >= self.walkway_width))
+        return CirculationReport(door_count, items, self.walkway_width)
+
+def analyze_circulation(room: Room, walkway_width: float = WALKWAY_WIDTH) -> CirculationReport:
+    """Analyze a room once. Use a CirculationAnalyzer to reuse work across edits."""
+    return CirculationAnalyzer(walkway_width=walkway_width).analyze(room)
@@ -0,0 +1,104 @@
+"""Two-phase collision detection for furniture footprints.
+
+The broad phase compares axis-aligned bounding boxes; only pairs that pass it
+reach the exact narrow phase, which uses separating-axis tests on the rotated
+rectangles and distance tests for circular catalog items. Edges that exactly
+touch count as overlapping, matching the room's placement rules.
+
+Doors and windows sit in the walls and rugs are floor coverings that other
+furniture stands on, so none of them collide with anything (see is_collidable).
+"""
+from typing import Iterable, Optional, Tuple
+
+from furniture import Furniture, FurnitureGeometry
+
+BoundingBox = Tuple[float, float, float, float]
+
+def is_collidable(item_id: str) -> bool:
+    """Check if pieces of a catalog item take up floor space that other pieces cannot share.
+    False for doors and windows (placed in the walls) and rugs (floor coverings)."""
+    return not (item_id.startswith('door') or item_id.startswith('window') or item_id.startswith('rug'))
+
+def aabb_overlap(box_a: BoundingBox, box_b: BoundingBox) -> bool:
+    """Check if two (min_x, min_y, max_x, max_y) bounding boxes overlap."""
+    return (box_a[0] <= box_b[2] and box_a[2] >= box_b[0] and
+            box_a[1] <= box_b[3] and box_a[3] >= box_b[1])
+
+def obb_overlap(geometry_a: FurnitureGeometry, geometry_b: FurnitureGeometry) -> bool:
+    """Check if two oriented rectangles overlap using the separating axis theorem."""
+    dx = geometry_b.center[0] - geometry_a.center[0]
+    dy = geometry_b.center[1] - geometry_a.center[1]
+
+    # A rectangle only has two distinct edge normals: its local x and y axes
+    for axis_x, axis_y in ((geometry_a.cos, geometry_a.sin), (-geometry_a.sin, geometry_a.cos),
+                           (geometry_b.cos, geometry_b.sin), (-geometry_b.sin, geometry_b.cos)):
+        radius_a = (geometry_a.half_width * abs(geometry_a.cos * axis_x + geometry_a.sin * axis_y) +
+                    geometry_a.half_height * abs(-geometry_a.sin * axis_x + geometry_a.cos * axis_y))
+        radius_b = (geometry_b.half_width * abs(geometry_b.cos * axis_x + geometry_b.sin * axis_y) +
+                    geometry_b.half_height * abs(-geometry_b.sin * axis_x + geometry_b.cos * axis_y))
+        if abs(dx * axis_x + dy * axis_y) > radius_a + radius_b:
+            return False
+    return True
+
+def circle_overlap(center_a: Tuple[float, float], radius_a: float,
+                   center_b: Tuple[float, float], radius_b: float) -> bool:
+    """Check if two circles overlap."""
+    reach = radius_a + radius_b
+    return ((center_a[0] - center_b[0]) ** 2 + (center_a[1] - center_b[1]) ** 2) <= reach * reach
+
+def circle_obb_overlap(center: Tuple[float, float], radius: float, geometry: FurnitureGeometry) -> bool:
+    """Check if a circle overlaps an oriented rectangle."""
+    # Express the circle center in the rectangle's local frame
+    rel_x = center[0] - geometry.center[0]
+    rel_y = center[1] - geometry.center[1]
+    local_x = rel_x * geometry.cos + rel_y * geometry.sin
+    local_y = -rel_x * geometry.sin + rel_y * geometry.cos
+
+    # Distance from the circle center to the closest point of the rectangle
+    gap_x = max(abs(local_x) - geometry.half_width, 0.0)
+    gap_y = max(abs(local_y) - geometry.half_height, 0.0)
+    return gap_x * gap_x + gap_y * gap_y <= radius * radius
+
+def circle_radius(furniture: Furniture) -> Optional[float]:
+    """Get the footprint radius of circular furniture, or None if it is not a circle.
+
+    Only catalog items with shape "circle" and equal width and height are circles;
+    anything else (including stretched circles) is treated as a rectangle.
+    """
+    item = furniture.item
+    if item is None or item.shape != "circle" or furniture.width != furniture.height:
+        return None
+    return furniture.width * furniture.scale / 2
+
+def furniture_overlap(furniture_a: Furniture, furniture_b: Furniture, broad_phase: bool = True) -> bool:
+    """Check if two pieces of furniture overlap.
+
+    Set broad_phase to False when the bounding boxes are already known to overlap,
+    e.g. for candidates returned by the room's spatial index.
+    """
+    geometry_a = furniture_a.get_geometry()
+    geometry_b = furniture_b.get_geometry()
+    if broad_phase and not aabb_overlap(geometry_a.bounding_box, geometry_b.bounding_box):
+        return False
+
+    radius_a = circle_radius(furniture_a)
+    radius_b = circle_radius(furniture_b)
+    if radius_a is not None and radius_b is not None:
+        return circle_overlap(geometry_a.center, radius_a, geometry_b.center, radius_b)
+    if radius_a is not None:
+        return circle_obb_overlap(geometry_a.center, radius_a, geometry_b)
+    if radius_b is not None:
+        return circle_obb_overlap(geometry_b.center, radius_b, geometry_a)
+    return obb_overlap(geometry_a, geometry_b)
+
+def find_first_overlap(furniture: Furniture, candidates: Iterable[Furniture],
+                       broad_phase: bool = True) -> Optional[Furniture]:
+    """Get the first candidate that overlaps the furniture, or None.
+    Pieces that are not collidable never overlap anything."""
+    if not is_collidable(furniture.item_id):
+        return None
+    for candidate in candidates:
+        if (candidate is not furniture and is_collidable(candidate.item_id) and
+                furniture_overlap(furniture, candidate, broad_phase)):
+            return candidate
+    return None
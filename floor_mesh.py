@@ -0,0 +1,113 @@
+"""Batched floor pattern meshes.
+
+Each floor design is built as a single triangle mesh with one color per face,
+using NumPy to generate all planks/tiles/stripes at once instead of one trace
+per piece. Dimensions are in meters.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+# Pattern sizes in meters
+PLANK_WIDTH = 0.1
+TILE_SIZE = 0.2
+STRIPE_WIDTH = 0.15
+ZIGZAG_WIDTH = 0.2
+ZIGZAG_HEIGHT = 0.2
+
+class FloorMesh(NamedTuple):
+    """Triangle mesh of a floor pattern."""
+    vertices: np.ndarray  # (V, 3) float
+    faces: np.ndarray  # (F, 3) int vertex indices
+    face_colors: np.ndarray  # (F,) color strings
+
+def _rectangles_mesh(x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray,
+                     use_secondary: np.ndarray, primary: str, secondary: str) -> FloorMesh:
+    """Build a mesh of axis-aligned rectangles, two triangles each."""
+    count = len(x0)
+    vertices = np.zeros((count, 4, 3))
+    vertices[:, :, 0] = np.stack([x0, x1, x1, x0], axis=1)
+    vertices[:, :, 1] = np.stack([y0, y0, y1, y1], axis=1)
+
+    base = (np.arange(count) * 4)[:, None, None]
+    faces = (base + np.array([[0, 1, 2], [0, 2, 3]])[None, :, :]).reshape(-1, 3)
+    face_colors = np.repeat(np.where(use_secondary, secondary, primary), 2)
+    return FloorMesh(vertices.reshape(-1, 3), faces, face_colors)
+
+def _hardwood(width_m: float, height_m: float, primary: str, secondary: str) -> FloorMesh:
+    """Vertical planks of alternating color."""
+    index = np.arange(int(width_m / PLANK_WIDTH))
+    x0 = index * PLANK_WIDTH
+    x1 = np.minimum((index + 1) * PLANK_WIDTH, width_m)
+    return _rectangles_mesh(x0, np.zeros_like(x0), x1, np.full_like(x0, height_m),
+                            index % 2 == 1, primary, secondary)
+
+def _tile(width_m: float, height_m: float, primary: str, secondary: str) -> FloorMesh:
+    """Checkerboard of square tiles, clipped at the far walls."""
+    x_idx, y_idx = np.meshgrid(np.arange(int(width_m / TILE_SIZE) + 1),
+                               np.arange(int(height_m / TILE_SIZE) + 1), indexing="ij")
+    x_idx, y_idx = x_idx.ravel(), y_idx.ravel()
+    x0 = x_idx * TILE_SIZE
+    y0 = y_idx * TILE_SIZE
+    inside = (x0 < width_m) & (y0 < height_m)
+    x_idx, y_idx, x0, y0 = x_idx[inside], y_idx[inside], x0[inside], y0[inside]
+    x1 = np.minimum((x_idx + 1) * TILE_SIZE, width_m)
+    y1 = np.minimum((y_idx + 1) * TILE_SIZE, height_m)
+    return _rectangles_mesh(x0, y0, x1, y1, (x_idx + y_idx) % 2 == 1, primary, secondary)
+
+def _stripes(width_m: float, height_m: float, primary: str, secondary: str) -> FloorMesh:
+    """Horizontal stripes of alternating color."""
+    index = np.arange(int(height_m / STRIPE_WIDTH))
+    y0 = index * STRIPE_WIDTH
+    y1 = np.minimum((index + 1) * STRIPE_WIDTH, height_m)
+    return _rectangles_mesh(np.zeros_like(y0), y0, np.full_like(y0, width_m), y1,
+                            index % 2 == 1, primary, secondary)
+
+def _zigzag(width_m: float, height_m: float, primary: str, secondary: str) -> FloorMesh:
+    """Rows of alternating forward and backward slanted triangles."""
+    row, col = np.meshgrid(np.arange(int(height_m / ZIGZAG_HEIGHT)),
+                           np.arange(int(width_m / ZIGZAG_WIDTH) * 2), indexing="ij")
+    row, col = row.ravel(), col.ravel()
+    x = (col // 2) * ZIGZAG_WIDTH
+    y = row * ZIGZAG_HEIGHT
+    forward = col % 2 == 0
+
+    # Forward slant: (x, y), (x + w, y + h), (x, y + h)
+    # Backward slant: (x, y + h), (x, y), (x - w, y + h)
+    triangle_x = np.where(forward[:, None],
+                          np.stack([x, x + ZIGZAG_WIDTH, x], axis=1),
+                          np.stack([x, x, x - ZIGZAG_WIDTH], axis=1))
+    triangle_y = np.where(forward[:, None],
+                          np.stack([y, y + ZIGZAG_HEIGHT, y + ZIGZAG_HEIGHT], axis=1),
+                          np.stack([y + ZIGZAG_HEIGHT, y, y + ZIGZAG_HEIGHT], axis=1))
+
+    # Skip triangles that stick out of the room
+    inside = ((triangle_x >= 0) & (triangle_x <= width_m) &
+              (triangle_y >= 0) & (triangle_y <= height_m)).all(axis=1)
+    triangle_x, triangle_y = triangle_x[inside], triangle_y[inside]
+    use_secondary = (row + col)[inside] % 2 == 1
+
+    count = len(triangle_x)
+    vertices = np.zeros((count, 3, 3))
+    vertices[:, :, 0] = triangle_x
+    vertices[:, :, 1] = triangle_y
+    faces = np.arange(count * 3).reshape(-1, 3)
+    return FloorMesh(vertices.reshape(-1, 3), faces, np.where(use_secondary, secondary, primary))
+
+def _solid(width_m: float, height_m: float, primary: str, secondary: str) -> FloorMesh:
+    """Single rectangle in the primary color."""
+    return _rectangles_mesh(np.array([0.0]), np.array([0.0]), np.array([width_m]), np.array([height_m]),
+                            np.array([False]), primary, secondary)
+
+_PATTERN_BUILDERS = {
+    "Hardwood": _hardwood,
+    "Tile": _tile,
+    "Stripes": _stripes,
+    "Zigzag": _zigzag,
+}
+
+def build_floor_mesh(width_m: float, height_m: float, floor_design: str,
+                     primary: str, secondary: str) -> FloorMesh:
+    """Build the whole floor pattern as one mesh. Designs without a pattern get a solid floor."""
+    builder = _PATTERN_BUILDERS.get(floor_design, _solid)
+    return builder(width_m, height_m, primary, secondary)
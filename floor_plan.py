@@ -0,0 +1,190 @@
+"""Headless top-down floor plan renderer.
+
+Draws a Room as an RGB image with Pillow, without a browser or Plotly. The
+floor pattern is computed per pixel with NumPy (same pattern sizes as the 3D
+floor mesh) and cached per size and design, walls are drawn as bands in
+their wall colors, and furniture as rotated polygons from get_corners.
+Doors and windows are drawn on the wall they belong to. The image uses the
+room's coordinates: x to the right and y down, so the back wall is on top.
+
+Usage:
+    python floor_plan.py layouts.jsonl.gz -o thumbnails/ --size 256
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw
+
+import floor_mesh
+from collision import circle_radius
+from furniture import Furniture
+from room import Room
+from room_archive import ArchiveEntry, read_rooms
+from scene import resolve_wall_placement
+from utils import get_floor_design_color, get_wall_color_hex
+import assets.furniture_items  # Registers the catalog so circular items are drawn as circles
+
+DEFAULT_MAX_SIZE = 512  # Longest image side in pixels
+WALL_THICKNESS = 10  # Drawn wall thickness in cm
+OUTLINE_COLOR = (51, 51, 51)
+WINDOW_COLOR = (135, 206, 235)
+FALLBACK_COLOR = (160, 160, 160)  # For furniture colors Pillow cannot parse
+PNG_COMPRESS_LEVEL = 1  # Fast encoding; thumbnails are small anyway
+
+RGB = Tuple[int, int, int]
+
+@lru_cache(maxsize=256)
+def _rgb(color: str) -> RGB:
+    try:
+        return ImageColor.getrgb(color)[:3]
+    except ValueError:
+        return FALLBACK_COLOR
+
+def _pattern_index(design: str, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Get a (rows, cols) array that is 1 where the pattern uses the secondary color.
+    x and y are the pixel centers in meters, as a (1, cols) row and a (rows, 1) column."""
+    if design == "Hardwood":
+        # Vertical planks
+        return (np.floor(x / floor_mesh.PLANK_WIDTH).astype(np.int64) % 2).repeat(len(y), axis=0)
+    if design == "Tile":
+        return (np.floor(x / floor_mesh.TILE_SIZE).astype(np.int64) +
+                np.floor(y / floor_mesh.TILE_SIZE).astype(np.int64)) % 2
+    if design == "Stripes":
+        # Horizontal stripes
+        return (np.floor(y / floor_mesh.STRIPE_WIDTH).astype(np.int64) % 2).repeat(x.shape[1], axis=1)
+    if design == "Zigzag":
+        # Each cell is split by its diagonal: below it is a forward slant, above it a
+        # backward slant of the other color, as in floor_mesh._zigzag
+        row = np.floor(y / floor_mesh.ZIGZAG_HEIGHT).astype(np.int64)
+        u = x / floor_mesh.ZIGZAG_WIDTH % 1
+        v = y / floor_mesh.ZIGZAG_HEIGHT % 1
+        return (row + (u > v)) % 2
+    # Designs without a pattern get a solid floor, as in floor_mesh.build_floor_mesh
+    return np.zeros((len(y), x.shape[1]), dtype=np.int64)
+
+@lru_cache(maxsize=64)
+def floor_pattern(design: str, width_px: int, height_px: int, pixels_per_cm: float) -> np.ndarray:
+    """Get the (height_px, width_px, 3) uint8 floor image of a design. Cached and read-only."""
+    x = ((np.arange(width_px) + 0.5) / pixels_per_cm / 100)[None, :]
+    y = ((np.arange(height_px) + 0.5) / pixels_per_cm / 100)[:, None]
+    colors = get_floor_design_color(design)
+    palette = np.array([_rgb(colors["primary"]), _rgb(colors.get("secondary", colors["primary"]))], dtype=np.uint8)
+    pixels = palette[_pattern_index(design, x, y)]
+    pixels.setflags(write=False)
+    return pixels
+
+def image_size(room: Room, max_size: int = DEFAULT_MAX_SIZE) -> Tuple[int, int, float]:
+    """Get the (width, height) in pixels of a room's floor plan and its pixels per cm."""
+    pixels_per_cm = max_size / (max(room.width, room.height) + 2 * WALL_THICKNESS)
+    return (max(1, round((room.width + 2 * WALL_THICKNESS) * pixels_per_cm)),
+            max(1, round((room.height + 2 * WALL_THICKNESS) * pixels_per_cm)),
+            pixels_per_cm)
+
+def _wall_segment(furniture: Furniture, room: Room) -> Tuple[str, float, float]:
+    """Get the wall of a door or window and the span it covers along that wall, in cm."""
+    wall = resolve_wall_placement(furniture, room.width / 100, room.height / 100)
+    if wall in ("Left", "Right"):
+        start, length = furniture.y, furniture.height * furniture.scale
+    else:
+        start, length = furniture.x, furniture.width * furniture.scale
+    return wall, start, start + length
+
+def _draw_opening(draw: ImageDraw.ImageDraw, furniture: Furniture, room: Room,
+                  to_px: Callable[[float, float], Tuple[float, float]]) -> None:
+    """Draw a door or window as a block across its wall."""
+    wall, start, end = _wall_segment(furniture, room)
+    if wall == "Left":
+        box = (-WALL_THICKNESS, start, 0, end)
+    elif wall == "Right":
+        box = (room.width, start, room.width + WALL_THICKNESS, end)
+    elif wall == "Back":
+        box = (start, -WALL_THICKNESS, end, 0)
+    else:  # Front
+        box = (start, room.height, end, room.height + WALL_THICKNESS)
+    x0, y0 = to_px(box[0], box[1])
+    x1, y1 = to_px(box[2], box[3])
+    if furniture.item_id.startswith('door'):
+        draw.rectangle((x0, y0, x1, y1), fill=_rgb(furniture.color), outline=OUTLINE_COLOR)
+    else:
+        draw.rectangle((x0, y0, x1, y1), fill=WINDOW_COLOR, outline=OUTLINE_COLOR)
+
+def render_floor_plan(room: Room, max_size: int = DEFAULT_MAX_SIZE) -> Image.Image:
+    """Render a room as a top-down RGB floor plan whose longest side is max_size pixels."""
+    width_px, height_px, pixels_per_cm = image_size(room, max_size)
+    wall_px = WALL_THICKNESS * pixels_per_cm
+    pixels = np.empty((height_px, width_px, 3), dtype=np.uint8)
+
+    # Walls: left and right bands span the full height, back and front sit between them
+    left, top = round(wall_px), round(wall_px)
+    right, bottom = max(left, width_px - round(wall_px)), max(top, height_px - round(wall_px))
+    pixels[:, :left] = _rgb(get_wall_color_hex(getattr(room, 'left_wall_color', room.wall_color)))
+    pixels[:, right:] = _rgb(get_wall_color_hex(getattr(room, 'right_wall_color', room.wall_color)))
+    pixels[:top, left:right] = _rgb(get_wall_color_hex(getattr(room, 'back_wall_color', room.wall_color)))
+    pixels[bottom:, left:right] = _rgb(get_wall_color_hex(getattr(room, 'front_wall_color', room.wall_color)))
+    pixels[top:bottom, left:right] = floor_pattern(room.floor_design, right - left, bottom - top, pixels_per_cm)
+
+    image = Image.fromarray(pixels, "RGB")
+    draw = ImageDraw.Draw(image)
+
+    def to_px(x: float, y: float) -> Tuple[float, float]:
+        return (x + WALL_THICKNESS) * pixels_per_cm, (y + WALL_THICKNESS) * pixels_per_cm
+
+    # Rugs first so they never hide the furniture standing on them
+    for furniture in sorted(room.furniture, key=lambda f: not f.item_id.startswith('rug')):
+        if furniture.item_id.startswith('door') or furniture.item_id.startswith('window'):
+            _draw_opening(draw, furniture, room, to_px)
+            continue
+        fill = _rgb(furniture.color)
+        radius = circle_radius(furniture)
+        if radius is not None:
+            center_x, center_y = to_px(*furniture.get_center())
+            r = radius * pixels_per_cm
+            draw.ellipse((center_x - r, center_y - r, center_x + r, center_y + r), fill=fill, outline=OUTLINE_COLOR)
+        else:
+            draw.polygon([to_px(x, y) for x, y in furniture.get_corners()], fill=fill, outline=OUTLINE_COLOR)
+    return image
+
+def floor_plan_png(room: Room, max_size: int = DEFAULT_MAX_SIZE) -> bytes:
+    """Render a room's floor plan as PNG bytes."""
+    buffer = io.BytesIO()
+    render_floor_plan(room, max_size).save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+def _file_name(index: int, name: Optional[str]) -> str:
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name or "")
+    return f"{index:06d}_{safe}.png" if safe else f"{index:06d}.png"
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render floor plan PNGs for every room in JSON Lines archives.")
+    parser.add_argument("paths", nargs="+", help="JSON Lines archives (.jsonl, .jsonl.gz)")
+    parser.add_argument("-o", "--output", required=True, help="Directory to write the PNG files to")
+    parser.add_argument("--size", type=int, default=DEFAULT_MAX_SIZE, help="Longest image side in pixels")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    start = time.perf_counter()
+    count = errors = 0
+
+    def report_error(entry: ArchiveEntry) -> None:
+        nonlocal errors
+        errors += 1
+        print(f"Line {entry.line_number}: {entry.error}", file=sys.stderr)
+
+    for path in args.paths:
+        for name, room in read_rooms(path, report_error):
+            count += 1
+            with open(os.path.join(args.output, _file_name(count, name)), "wb") as file:
+                file.write(floor_plan_png(room, args.size))
+
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {count} rooms in {elapsed:.1f}s, {errors} unreadable", file=sys.stderr)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
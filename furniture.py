@@ -1,23 +1,72 @@
 import math
-from typing import Dict, Any, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
+import numpy as np
+
+@dataclass(frozen=True, slots=True)
 class FurnitureItem:
-    """Class representing a furniture item template."""
-    def __init__(self, id: str, name: str, category: str, width: int, height: int, 
-                 default_color: str, available_colors: List[str] = None, shape: str = "rectangle"):
-        self.id = id
-        self.name = name
-        self.category = category
-        self.width = width
-        self.height = height
-        self.default_color = default_color
-        self.available_colors = available_colors or [default_color]
-        self.shape = shape  # "rectangle", "circle", "custom", etc.
+    """Immutable furniture item template, shared by every piece and the catalog."""
+    id: str
+    name: str
+    category: str
+    width: int
+    height: int
+    default_color: str
+    available_colors: Tuple[str, ...] = ()
+    shape: str = "rectangle"  # "rectangle", "circle", "custom", etc.
+
+    def __post_init__(self):
+        # Any sequence is accepted, but stored as a tuple so shared items cannot be changed
+        object.__setattr__(self, "available_colors", tuple(self.available_colors or (self.default_color,)))
+
+class FurnitureGeometry(NamedTuple):
+    """Footprint geometry of a furniture instance, derived from its position, size, rotation and scale."""
+    center: Tuple[float, float]
+    half_width: float
+    half_height: float
+    sin: float  # Sine of the rotation
+    cos: float  # Cosine of the rotation
+    corners: Tuple[Tuple[float, float], ...]
+    bounding_box: Tuple[float, float, float, float]  # (min_x, min_y, max_x, max_y)
+
+class _GeometryAttribute:
+    """Attribute that affects the furniture footprint. Assigning it drops the cached geometry
+    and tells the room holding the furniture, if any, so its spatial index can follow."""
+    def __set_name__(self, owner, name: str):
+        self.storage_name = "_" + name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.storage_name)
+    
+    def __set__(self, instance, value) -> None:
+        setattr(instance, self.storage_name, value)
+        instance._geometry = None
+        instance.geometry_version += 1
+        listener = instance._on_geometry_change
+        if listener is not None:
+            listener(instance)
 
 class Furniture:
     """Class representing a furniture instance in the room."""
+    x = _GeometryAttribute()
+    y = _GeometryAttribute()
+    width = _GeometryAttribute()
+    height = _GeometryAttribute()
+    rotation = _GeometryAttribute()
+    scale = _GeometryAttribute()
+    
+    __slots__ = ("id", "item_id", "name", "color", "item", "wall",
+                 "_x", "_y", "_width", "_height", "_rotation", "_scale",
+                 "_geometry", "geometry_version", "_on_geometry_change")
+    
     def __init__(self, item_id: str, name: str, width: int, height: int, 
                  x: float, y: float, color: str, rotation: float = 0, scale: float = 1.0, id: int = None):
+        self._geometry: Optional[FurnitureGeometry] = None
+        self._on_geometry_change: Optional[Callable[['Furniture'], None]] = None  # Set by the Room holding it
+        self.geometry_version = 0  # Incremented whenever a geometric attribute is assigned
         self.id = id  # This will be set by the Room when added
         self.item_id = item_id
         self.name = name
@@ -31,56 +80,80 @@ class Furniture:
         self.item: Optional[FurnitureItem] = None  # Will be set when added to a room
         self.wall = "Auto"  # For doors and windows - which wall to place on ("Auto", "Left", "Right", "Front", "Back")
     
+    def get_geometry(self) -> FurnitureGeometry:
+        """Get the cached footprint geometry, computing it if the furniture has changed."""
+        geometry = self._geometry
+        if geometry is None:
+            # Calculate half-width and half-height
+            half_width = (self.width * self.scale) / 2
+            half_height = (self.height * self.scale) / 2
+            
+            # Get center of furniture
+            center_x = self.x + half_width
+            center_y = self.y + half_height
+            
+            rad = math.radians(self.rotation)
+            sin_r = math.sin(rad)
+            cos_r = math.cos(rad)
+            
+            # Rotate corners relative to center
+            corners = tuple(
+                (center_x + rel_x * cos_r - rel_y * sin_r, center_y + rel_x * sin_r + rel_y * cos_r)
+                for rel_x, rel_y in ((-half_width, -half_height), (half_width, -half_height),
+                                     (half_width, half_height), (-half_width, half_height))
+            )
+            xs = [corner[0] for corner in corners]
+            ys = [corner[1] for corner in corners]
+            
+            geometry = FurnitureGeometry(
+                center=(center_x, center_y),
+                half_width=half_width,
+                half_height=half_height,
+                sin=sin_r,
+                cos=cos_r,
+                corners=corners,
+                bounding_box=(min(xs), min(ys), max(xs), max(ys))
+            )
+            self._geometry = geometry
+        return geometry
+    
+    def copy(self) -> 'Furniture':
+        """Get an independent copy of the furniture. The cached geometry is shared
+        until either copy changes a geometric attribute."""
+        furniture = Furniture.__new__(Furniture)
+        for slot in Furniture.__slots__:
+            setattr(furniture, slot, getattr(self, slot))
+        furniture._on_geometry_change = None  # The copy is not in any room yet
+        return furniture
+    
     def contains_point(self, px: float, py: float) -> bool:
         """Check if the furniture contains the given point."""
-        # Get center of furniture
-        center_x = self.x + (self.width * self.scale) / 2
-        center_y = self.y + (self.height * self.scale) / 2
+        geometry = self.get_geometry()
         
         # Get point relative to center
-        rel_x = px - center_x
-        rel_y = py - center_y
+        rel_x = px - geometry.center[0]
+        rel_y = py - geometry.center[1]
         
         # Rotate point in opposite direction
-        rad = math.radians(-self.rotation)
-        rot_x = rel_x * math.cos(rad) - rel_y * math.sin(rad)
-        rot_y = rel_x * math.sin(rad) + rel_y * math.cos(rad)
+        rot_x = rel_x * geometry.cos + rel_y * geometry.sin
+        rot_y = -rel_x * geometry.sin + rel_y * geometry.cos
         
         # Check if point is within bounds
-        half_width = (self.width * self.scale) / 2
-        half_height = (self.height * self.scale) / 2
-        
-        return (abs(rot_x) <= half_width and 
-                abs(rot_y) <= half_height)
+        return (abs(rot_x) <= geometry.half_width and 
+                abs(rot_y) <= geometry.half_height)
     
-    def get_corners(self) -> List[Tuple[float, float]]:
+    def get_corners(self) -> Sequence[Tuple[float, float]]:
         """Get the four corners of the furniture accounting for rotation and scale."""
-        # Get center of furniture
-        center_x = self.x + (self.width * self.scale) / 2
-        center_y = self.y + (self.height * self.scale) / 2
-        
-        # Calculate half-width and half-height
-        half_width = (self.width * self.scale) / 2
-        half_height = (self.height * self.scale) / 2
-        
-        # Calculate corners relative to center
-        corners_rel = [
-            (-half_width, -half_height),
-            (half_width, -half_height),
-            (half_width, half_height),
-            (-half_width, half_height)
-        ]
-        
-        # Rotate corners
-        rad = math.radians(self.rotation)
-        corners = []
-        for rel_x, rel_y in corners_rel:
-            rot_x = rel_x * math.cos(rad) - rel_y * math.sin(rad)
-            rot_y = rel_x * math.sin(rad) + rel_y * math.cos(rad)
-            corners.append((center_x + rot_x, center_y + rot_y))
-        
-        return corners
+        return self.get_geometry().corners
     
+    def get_center(self) -> Tuple[float, float]:
+        """Get the center point of the furniture."""
+        return self.get_geometry().center
+    
+    def get_bounding_box(self) -> Tuple[float, float, float, float]:
+        """Get the axis-aligned bounding box (min_x, min_y, max_x, max_y) of the rotated furniture."""
+        return self.get_geometry().bounding_box
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the furniture to a dictionary for serialization."""
         return {
@@ -94,7 +167,7 @@ class Furniture:
             "color": self.color,
             "rotation": self.rotation,
             "scale": self.scale,
-            "wall": getattr(self, "wall", "Auto")  # Include wall attribute
+            "wall": self.wall
         }
     
     @classmethod
@@ -119,6 +192,109 @@ class Furniture:
             
         return furniture
 
+def _to_python_number(value) -> Union[int, float]:
+    """Convert a stored float back to an int when it is integral, as the original attribute usually was."""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+class StringColumn:
+    """Column of strings stored as integer codes into a table of distinct values."""
+    __slots__ = ("codes", "values")
+    
+    def __init__(self, codes: np.ndarray, values: Tuple[Hashable, ...]):
+        self.codes = codes
+        self.values = values
+    
+    @classmethod
+    def from_values(cls, values: Iterable[Hashable]) -> 'StringColumn':
+        """Intern the given values into a new column."""
+        table: Dict[Hashable, int] = {}
+        codes = [table.setdefault(value, len(table)) for value in values]
+        return cls(np.array(codes, dtype=np.int32), tuple(table))
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def __getitem__(self, index: int) -> Hashable:
+        return self.values[self.codes[index]]
+
+class FurnitureArray:
+    """Column-wise storage for many furniture instances.
+
+    Numeric attributes are kept in contiguous float arrays and strings are
+    interned per column, so a room costs a handful of arrays rather than one
+    object per piece. Index it to get regular Furniture objects back.
+    """
+    __slots__ = ("ids", "x", "y", "width", "height", "rotation", "scale",
+                 "item_ids", "names", "colors", "walls")
+    
+    def __init__(self, ids: np.ndarray, x: np.ndarray, y: np.ndarray, width: np.ndarray, height: np.ndarray,
+                 rotation: np.ndarray, scale: np.ndarray, item_ids: StringColumn, names: StringColumn,
+                 colors: StringColumn, walls: StringColumn):
+        self.ids = ids  # -1 for furniture without an ID
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.rotation = rotation
+        self.scale = scale
+        self.item_ids = item_ids
+        self.names = names
+        self.colors = colors
+        self.walls = walls
+    
+    @classmethod
+    def from_furniture(cls, furniture_list: Iterable[Furniture]) -> 'FurnitureArray':
+        """Store the given furniture column-wise."""
+        furniture_list = list(furniture_list)
+        
+        def floats(attribute: str) -> np.ndarray:
+            return np.array([getattr(furniture, attribute) for furniture in furniture_list], dtype=np.float64)
+        
+        return cls(
+            ids=np.array([-1 if f.id is None else f.id for f in furniture_list], dtype=np.int64),
+            x=floats("x"),
+            y=floats("y"),
+            width=floats("width"),
+            height=floats("height"),
+            rotation=floats("rotation"),
+            scale=floats("scale"),
+            item_ids=StringColumn.from_values(f.item_id for f in furniture_list),
+            names=StringColumn.from_values(f.name for f in furniture_list),
+            colors=StringColumn.from_values(f.color for f in furniture_list),
+            walls=StringColumn.from_values(f.wall for f in furniture_list)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, index: int) -> Furniture:
+        """Materialize the furniture at the given index."""
+        furniture_id = int(self.ids[index])
+        furniture = Furniture(
+            id=None if furniture_id < 0 else furniture_id,
+            item_id=self.item_ids[index],
+            name=self.names[index],
+            width=_to_python_number(self.width[index]),
+            height=_to_python_number(self.height[index]),
+            x=_to_python_number(self.x[index]),
+            y=_to_python_number(self.y[index]),
+            color=self.colors[index],
+            rotation=_to_python_number(self.rotation[index]),
+            scale=_to_python_number(self.scale[index])
+        )
+        furniture.wall = self.walls[index]
+        furniture.item = get_furniture_item_by_id(furniture.item_id)
+        return furniture
+    
+    def __iter__(self) -> Iterator[Furniture]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def to_furniture_list(self) -> List[Furniture]:
+        """Materialize all furniture."""
+        return list(self)
+
 # Dictionary to store furniture items
 _furniture_items: Dict[str, FurnitureItem] = {}
 
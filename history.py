@@ -0,0 +1,258 @@
+"""Delta-based undo/redo history for rooms.
+
+Instead of a full room snapshot per action, the history records small
+operations (add, remove, attribute changes) that know their own inverse.
+Undo and redo apply an operation in place, so their cost depends on the size
+of the change rather than the size of the room. Only whole-room replacements
+(loading a saved room or a template) store full room states, as shared
+immutable snapshots.
+
+The memory budget is checked against a structural estimate (sys.getsizeof of
+the containers and values an operation holds) instead of serializing every
+operation. Snapshot records shared by several replacements are counted once.
+"""
+import sys
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from furniture import Furniture
+from room import Room
+from room_snapshot import FurnitureRecord, RoomSnapshot
+
+# Default memory budget of an undo history, in estimated bytes
+UNDO_HISTORY_BUDGET_BYTES = 8 * 1024 * 1024
+
+def _dict_size(data: Dict[str, Any]) -> int:
+    """Estimate the memory of a flat dictionary. Keys are attribute names, interned and shared."""
+    return sys.getsizeof(data) + sum(sys.getsizeof(value) for value in data.values())
+
+def _record_size(record: FurnitureRecord) -> int:
+    return sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record)
+
+class Operation:
+    """A reversible change to a room."""
+    __slots__ = ()
+
+    def apply(self, room: Room) -> Room:
+        """Apply the change and return the resulting room (usually the same object)."""
+        raise NotImplementedError
+
+    def inverse(self) -> 'Operation':
+        """Get the operation that undoes this one."""
+        raise NotImplementedError
+
+    def size_estimate(self) -> int:
+        """Estimate the bytes held by this operation alone, without its shared_records."""
+        raise NotImplementedError
+
+    def shared_records(self) -> Iterable[FurnitureRecord]:
+        """Get the snapshot records this operation refers to, which other operations may share."""
+        return ()
+
+class AddFurniture(Operation):
+    """Furniture was added to the room."""
+    __slots__ = ("furniture_data", "index", "previous_next_id")
+
+    def __init__(self, furniture_data: Dict[str, Any], index: Optional[int] = None,
+                 previous_next_id: Optional[int] = None):
+        self.furniture_data = furniture_data
+        self.index = index  # Position in placement order, None for the end
+        self.previous_next_id = previous_next_id  # Room ID counter before the add, restored on undo
+
+    @classmethod
+    def from_furniture(cls, furniture: Furniture) -> 'AddFurniture':
+        """Record furniture that was just added to the end of the room by add_furniture."""
+        return cls(furniture.to_dict(), previous_next_id=furniture.id)
+
+    def apply(self, room: Room) -> Room:
+        room.restore_furniture(Furniture.from_dict(self.furniture_data), self.index)
+        return room
+
+    def inverse(self) -> Operation:
+        return RemoveFurniture(self.furniture_data, self.index, self.previous_next_id)
+
+    def size_estimate(self) -> int:
+        return sys.getsizeof(self) + _dict_size(self.furniture_data)
+
+class RemoveFurniture(Operation):
+    """Furniture was removed from the room."""
+    __slots__ = ("furniture_data", "index", "restore_next_id")
+
+    def __init__(self, furniture_data: Dict[str, Any], index: Optional[int] = None,
+                 restore_next_id: Optional[int] = None):
+        self.furniture_data = furniture_data
+        self.index = index  # Position in placement order before removal, None for the end
+        self.restore_next_id = restore_next_id  # Room ID counter to go back to when undoing an add
+
+    @classmethod
+    def from_furniture(cls, room: Room, furniture: Furniture) -> 'RemoveFurniture':
+        """Record furniture that is about to be removed from the room."""
+        index = room.furniture.index(furniture)
+        return cls(furniture.to_dict(), None if index == len(room.furniture) - 1 else index)
+
+    def apply(self, room: Room) -> Room:
+        room.remove_furniture(self.furniture_data["id"])
+        if self.restore_next_id is not None:
+            room.next_furniture_id = self.restore_next_id
+        return room
+
+    def inverse(self) -> Operation:
+        return AddFurniture(self.furniture_data, self.index)
+
+    def size_estimate(self) -> int:
+        return sys.getsizeof(self) + _dict_size(self.furniture_data)
+
+class SetFurnitureAttributes(Operation):
+    """Attributes of a furniture item changed (move, recolor, resize, rotate)."""
+    __slots__ = ("furniture_id", "old", "new")
+
+    def __init__(self, furniture_id: int, old: Dict[str, Any], new: Dict[str, Any]):
+        self.furniture_id = furniture_id
+        self.old = old
+        self.new = new
+
+    def apply(self, room: Room) -> Room:
+        room.set_furniture_attributes(self.furniture_id, self.new)
+        return room
+
+    def inverse(self) -> Operation:
+        return SetFurnitureAttributes(self.furniture_id, self.new, self.old)
+
+    def size_estimate(self) -> int:
+        return sys.getsizeof(self) + _dict_size(self.old) + _dict_size(self.new)
+
+class SetRoomAttributes(Operation):
+    """Room attributes changed (dimensions, wall colors, floor design)."""
+    __slots__ = ("old", "new")
+
+    def __init__(self, old: Dict[str, Any], new: Dict[str, Any]):
+        self.old = old
+        self.new = new
+
+    @classmethod
+    def capture(cls, room: Room, new: Dict[str, Any]) -> 'SetRoomAttributes':
+        """Record changing the given attributes of a room to new values, before they are applied."""
+        return cls({name: getattr(room, name) for name in new}, dict(new))
+
+    def apply(self, room: Room) -> Room:
+        for name, value in self.new.items():
+            setattr(room, name, value)
+        return room
+
+    def inverse(self) -> Operation:
+        return SetRoomAttributes(self.new, self.old)
+
+    def size_estimate(self) -> int:
+        return sys.getsizeof(self) + _dict_size(self.old) + _dict_size(self.new)
+
+class ReplaceRoom(Operation):
+    """The whole room was replaced, e.g. by loading a saved room or a template.
+
+    States are immutable snapshots, so consecutive replacements share the
+    records of furniture that did not change.
+    """
+    __slots__ = ("old_state", "new_state")
+
+    def __init__(self, old_state: RoomSnapshot, new_state: RoomSnapshot):
+        self.old_state = old_state
+        self.new_state = new_state
+
+    def apply(self, room: Room) -> Room:
+        return Room.from_snapshot(self.new_state)
+
+    def inverse(self) -> Operation:
+        return ReplaceRoom(self.new_state, self.old_state)
+
+    def size_estimate(self) -> int:
+        size = sys.getsizeof(self)
+        for state in (self.old_state, self.new_state):
+            # The snapshot and its record tuple; the records themselves are shared_records
+            size += sys.getsizeof(state) + sys.getsizeof(state.furniture)
+        return size
+
+    def shared_records(self) -> Iterable[FurnitureRecord]:
+        return self.old_state.furniture + self.new_state.furniture
+
+class UndoHistory:
+    """Undo/redo stacks of operations, bounded by an approximate memory budget.
+
+    Recording a new operation clears the redo stack. When the recorded
+    operations exceed the budget, the oldest ones are dropped. Pass
+    max_bytes=None for an unbounded history.
+    """
+    def __init__(self, max_bytes: Optional[int] = UNDO_HISTORY_BUDGET_BYTES):
+        self.max_bytes = max_bytes
+        self._undo: Deque[Operation] = deque()
+        self._redo: Deque[Operation] = deque()
+        self._size = 0
+        # References to each shared record (by id, as the operations keep it alive) and its size
+        self._record_refs: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory held by the undo and redo stacks."""
+        return self._size
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def _hold(self, operation: Operation) -> None:
+        """Add an operation's memory to the total, counting each shared record once."""
+        self._size += operation.size_estimate()
+        for record in operation.shared_records():
+            count, size = self._record_refs.get(id(record), (0, 0))
+            if count == 0:
+                size = _record_size(record)
+                self._size += size
+            self._record_refs[id(record)] = (count + 1, size)
+
+    def _release(self, operation: Operation) -> None:
+        """Remove an operation's memory from the total, and that of records no other operation holds."""
+        self._size -= operation.size_estimate()
+        for record in operation.shared_records():
+            count, size = self._record_refs[id(record)]
+            if count == 1:
+                del self._record_refs[id(record)]
+                self._size -= size
+            else:
+                self._record_refs[id(record)] = (count - 1, size)
+
+    def record(self, operation: Operation) -> None:
+        """Record an operation that has just been applied to the room."""
+        while self._redo:
+            self._release(self._redo.pop())
+        self._undo.append(operation)
+        self._hold(operation)
+        if self.max_bytes is not None:
+            # Always keep the latest operation, even if it alone exceeds the budget
+            while self._size > self.max_bytes and len(self._undo) > 1:
+                self._release(self._undo.popleft())
+
+    def undo(self, room: Room) -> Optional[Room]:
+        """Undo the latest operation. Returns the resulting room, or None if there is nothing to undo."""
+        if not self._undo:
+            return None
+        operation = self._undo.pop()
+        self._redo.append(operation)
+        return operation.inverse().apply(room)
+
+    def redo(self, room: Room) -> Optional[Room]:
+        """Redo the latest undone operation. Returns the resulting room, or None if there is nothing to redo."""
+        if not self._redo:
+            return None
+        operation = self._redo.pop()
+        self._undo.append(operation)
+        return operation.apply(room)
+
+    def clear(self) -> None:
+        """Forget all history."""
+        self._undo.clear()
+        self._redo.clear()
+        self._record_refs.clear()
+        self._size = 0
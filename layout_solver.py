@@ -0,0 +1,494 @@
+"""Automatic furniture placement by simulated annealing.
+
+Given a room and a list of catalog item IDs, the solver searches positions
+and quarter-turn rotations for the new pieces. Hard constraints are that every
+piece stays inside the room (by the same rule as add_furniture) and that no
+two pieces overlap. The soft score prefers pieces close to a wall and keeps
+the clearance zone in front of doors free. Furniture already in the room stays
+where it is.
+
+With quarter-turn rotations a rectangle's footprint is exactly its bounding
+box, so costs are box intersection areas. Pieces live in a SpatialGrid, and a
+move only re-evaluates the pieces near the moved one, so every step costs a
+few box tests regardless of the room size.
+
+solve_layout_parallel runs independent restarts with different seeds on a
+process pool and keeps the best layout. The pool is started once with the
+spawn method, kept small, and shared by every session of the app.
+"""
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from collision import find_first_overlap, is_collidable
+from furniture import Furniture, get_furniture_item_by_id
+from room import Room, SPATIAL_INDEX_CELL_SIZE
+from spatial_index import BoundingBox, SpatialGrid
+
+DEFAULT_TIME_BUDGET = 0.5  # Seconds
+DEFAULT_PATIENCE = 2000  # Iterations without improvement before a feasible search stops early
+SOLVER_POOL_WORKERS = min(4, os.cpu_count() or 1)  # Processes in the shared solver pool
+CANCEL_SLOTS = 64  # Parallel solves that can run on one pool at once
+ROTATIONS = (0, 90, 180, 270)
+
+# Score weights
+OVERLAP_WEIGHT = 1.0  # Per cm² of overlapping footprint
+CLEARANCE_WEIGHT = 0.2  # Per cm² of furniture in front of a door
+WALL_WEIGHT = 1.0  # Per cm between a piece and its nearest wall
+
+PLACEMENT_GAP = 1.0  # Minimum distance (cm) kept between pieces, since touching edges count as overlap
+DOOR_CLEARANCE = 60.0  # Depth (cm) of the zone kept free around doors
+
+INITIAL_TEMPERATURE = 500.0
+FINAL_TEMPERATURE = 0.5
+INITIAL_CANDIDATES = 20  # Random positions tried when first placing each piece
+
+class _EventLike(Protocol):
+    """Cancellation flag, e.g. threading.Event or multiprocessing.Event."""
+    def is_set(self) -> bool: ...
+
+class LayoutResult(NamedTuple):
+    """Outcome of a solver run."""
+    furniture: List[Furniture]  # New pieces, in the order of the requested item IDs, not yet added to the room
+    feasible: bool  # True if no pieces overlap
+    cost: float
+    iterations: int
+    elapsed: float  # Seconds
+    seed: Optional[int] = None  # Seed of the run that produced the layout
+
+class _Piece:
+    """Solver state of one piece of furniture."""
+    __slots__ = ("furniture", "movable", "collidable", "is_door", "width", "height",
+                 "x", "y", "rotation", "body", "zone")
+
+    def __init__(self, furniture: Furniture, movable: bool):
+        self.furniture = furniture
+        self.movable = movable
+        self.is_door = furniture.item_id.startswith('door')
+        self.collidable = is_collidable(furniture.item_id)
+        self.width = furniture.width * furniture.scale
+        self.height = furniture.height * furniture.scale
+        self.x = furniture.x
+        self.y = furniture.y
+        self.rotation = furniture.rotation
+        self.body: BoundingBox = furniture.get_bounding_box()
+        self.zone: BoundingBox = self.body  # Box indexed in the grid, covers everything the piece affects
+
+    def place(self, x: float, y: float, rotation: float) -> None:
+        """Move a (movable) piece, recomputing its boxes without trigonometry."""
+        self.x, self.y, self.rotation = x, y, rotation
+        extent_x, extent_y = _extents(self.width, self.height, rotation)
+        center_x = x + self.width / 2
+        center_y = y + self.height / 2
+        self.body = (center_x - extent_x / 2, center_y - extent_y / 2,
+                     center_x + extent_x / 2, center_y + extent_y / 2)
+        self.zone = _expand(self.body, DOOR_CLEARANCE if self.is_door else PLACEMENT_GAP)
+
+def _extents(width: float, height: float, rotation: float) -> Tuple[float, float]:
+    """Size of the footprint along x and y after a quarter-turn rotation."""
+    return (height, width) if rotation % 180 == 90 else (width, height)
+
+def _expand(box: BoundingBox, margin: float) -> BoundingBox:
+    return (box[0] - margin, box[1] - margin, box[2] + margin, box[3] + margin)
+
+def _intersection_area(a: BoundingBox, b: BoundingBox) -> float:
+    overlap_x = min(a[2], b[2]) - max(a[0], b[0])
+    overlap_y = min(a[3], b[3]) - max(a[1], b[1])
+    return overlap_x * overlap_y if overlap_x > 0 and overlap_y > 0 else 0.0
+
+class _LayoutState:
+    """Pieces, their spatial index and the incremental score."""
+    def __init__(self, room: Room, pieces: List[_Piece]):
+        self.room = room
+        self.pieces = pieces
+        self.grid = SpatialGrid(SPATIAL_INDEX_CELL_SIZE)
+        for piece in pieces:
+            if piece.is_door:
+                piece.zone = _expand(piece.body, DOOR_CLEARANCE)
+            elif piece.collidable:
+                piece.zone = _expand(piece.body, PLACEMENT_GAP)
+            self.grid.insert(piece, piece.zone)
+
+    def _pair_cost(self, a: _Piece, b: _Piece) -> float:
+        if a.collidable and b.collidable:
+            # Half the gap on each side keeps pieces PLACEMENT_GAP apart
+            return OVERLAP_WEIGHT * _intersection_area(_expand(a.body, PLACEMENT_GAP / 2),
+                                                       _expand(b.body, PLACEMENT_GAP / 2))
+        if a.is_door and b.collidable:
+            return CLEARANCE_WEIGHT * _intersection_area(a.zone, b.body)
+        if b.is_door and a.collidable:
+            return CLEARANCE_WEIGHT * _intersection_area(b.zone, a.body)
+        return 0.0
+
+    def _wall_cost(self, piece: _Piece) -> float:
+        min_x, min_y, max_x, max_y = piece.body
+        return WALL_WEIGHT * max(0.0, min(min_x, min_y, self.room.width - max_x, self.room.height - max_y))
+
+    def piece_cost(self, piece: _Piece) -> float:
+        """Score terms involving a piece: its wall distance and its interactions with nearby pieces."""
+        cost = self._wall_cost(piece) if piece.movable else 0.0
+        for other in self.grid.query(piece.zone):
+            if other is not piece:
+                cost += self._pair_cost(piece, other)
+        return cost
+
+    def total_cost(self) -> float:
+        cost = 0.0
+        for piece in self.pieces:
+            if piece.movable:
+                cost += self._wall_cost(piece)
+            for other in self.grid.query(piece.zone):
+                # Count every pair once
+                if id(other) < id(piece):
+                    cost += self._pair_cost(piece, other)
+        return cost
+
+    def move(self, piece: _Piece, x: float, y: float, rotation: float) -> None:
+        piece.place(x, y, rotation)
+        self.grid.update(piece, piece.zone)
+
+def _position_range(room: Room, piece: _Piece, rotation: float) -> Optional[Tuple[float, float, float, float]]:
+    """Get the (min_x, max_x, min_y, max_y) range of valid positions, or None if the piece does not fit.
+
+    Positions keep the rotated footprint inside the room and also satisfy
+    Room._constrain_furniture_position, so add_furniture does not move the piece.
+    """
+    extent_x, extent_y = _extents(piece.width, piece.height, rotation)
+    half_x = max(piece.width, extent_x) / 2
+    half_y = max(piece.height, extent_y) / 2
+    if 2 * half_x > room.width or 2 * half_y > room.height:
+        return None
+    return (half_x - piece.width / 2, room.width - half_x - piece.width / 2,
+            half_y - piece.height / 2, room.height - half_y - piece.height / 2)
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+def _new_pieces(item_ids: Sequence[str]) -> List[_Piece]:
+    pieces = []
+    for item_id in item_ids:
+        item = get_furniture_item_by_id(item_id)
+        if item is None:
+            raise ValueError(f"Unknown furniture item: {item_id}")
+        furniture = Furniture(item_id=item.id, name=item.name, width=item.width, height=item.height,
+                              x=0, y=0, color=item.default_color)
+        furniture.item = item
+        pieces.append(_Piece(furniture, movable=True))
+    return pieces
+
+def _is_feasible(room: Room, furniture: List[Furniture]) -> bool:
+    """Exact check that no new piece overlaps another piece, using the same tests as add_furniture."""
+    grid = SpatialGrid(SPATIAL_INDEX_CELL_SIZE)
+    for existing in room.furniture:
+        if is_collidable(existing.item_id):
+            grid.insert(existing, existing.get_bounding_box())
+    for new in furniture:
+        if not is_collidable(new.item_id):
+            continue
+        if find_first_overlap(new, grid.query(new.get_bounding_box())) is not None:
+            return False
+        grid.insert(new, new.get_bounding_box())
+    return True
+
+def _furniture_at(pieces: List[_Piece], placements: List[Tuple[float, float, float]]) -> List[Furniture]:
+    """Move the furniture of the pieces to the given placements."""
+    for piece, (x, y, rotation) in zip(pieces, placements):
+        piece.furniture.x, piece.furniture.y, piece.furniture.rotation = x, y, rotation
+    return [piece.furniture for piece in pieces]
+
+def solve_layout(room: Room, item_ids: Sequence[str], time_budget: float = DEFAULT_TIME_BUDGET,
+                 seed: Optional[int] = None, max_iterations: Optional[int] = None,
+                 patience: int = DEFAULT_PATIENCE, target_cost: Optional[float] = None,
+                 cancel: Optional[_EventLike] = None) -> LayoutResult:
+    """Find positions and rotations for new pieces of the given catalog items in a room.
+
+    The search anneals until the time budget (in seconds) or max_iterations runs
+    out, or stops early once the layout is feasible and has not improved for
+    `patience` iterations. With max_iterations set, the cooling schedule follows
+    the iteration count, so a fixed seed gives the same result unless the time
+    budget runs out first. The search also stops as soon as a valid layout
+    scores target_cost or better, or when the cancel event is set.
+    The room is not modified; see apply_layout.
+    Raises ValueError for unknown item IDs or items too large for the room.
+    """
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    movable = _new_pieces(item_ids)
+    if not movable:
+        return LayoutResult([], True, 0.0, 0, 0.0, seed)
+    for piece in movable:
+        if all(_position_range(room, piece, rotation) is None for rotation in ROTATIONS):
+            raise ValueError(f"{piece.furniture.name} does not fit in the room")
+
+    def random_placement(piece: _Piece) -> Tuple[float, float, float]:
+        rotations = [rotation for rotation in ROTATIONS if _position_range(room, piece, rotation) is not None]
+        rotation = rng.choice(rotations)
+        min_x, max_x, min_y, max_y = _position_range(room, piece, rotation)
+        return rng.uniform(min_x, max_x), rng.uniform(min_y, max_y), rotation
+
+    fixed = [_Piece(furniture, movable=False) for furniture in room.furniture]
+    state = _LayoutState(room, fixed)
+
+    # Greedy start: place pieces one by one at the best of a few random spots
+    for piece in movable:
+        piece.place(*random_placement(piece))
+        state.grid.insert(piece, piece.zone)
+        state.pieces.append(piece)
+        best_cost, best_placement = state.piece_cost(piece), (piece.x, piece.y, piece.rotation)
+        for _ in range(INITIAL_CANDIDATES - 1):
+            state.move(piece, *random_placement(piece))
+            cost = state.piece_cost(piece)
+            if cost < best_cost:
+                best_cost, best_placement = cost, (piece.x, piece.y, piece.rotation)
+        state.move(piece, *best_placement)
+
+    cost = state.total_cost()
+    best_cost = cost
+    best = [(piece.x, piece.y, piece.rotation) for piece in movable]
+    since_improvement = 0
+    best_checked = False  # Whether the current best layout already failed the feasibility check
+    iterations = 0
+    step_scale = max(room.width, room.height) / 4
+    progress = 0.0
+
+    while max_iterations is None or iterations < max_iterations:
+        # Checking the clock every step would dominate the cost of a step
+        if iterations % 64 == 0:
+            time_used = (time.perf_counter() - start) / time_budget if time_budget > 0 else 1.0
+            if time_used >= 1.0:
+                break
+            # With an iteration limit the schedule follows iterations, so seeded runs are reproducible
+            progress = iterations / max_iterations if max_iterations else time_used
+            if cancel is not None and cancel.is_set():
+                break
+            reached_target = target_cost is not None and best_cost <= target_cost
+            if (reached_target or since_improvement >= patience) and not best_checked:
+                # Good enough or converged; stop if the best layout is valid, otherwise keep searching
+                if _is_feasible(room, _furniture_at(movable, best)):
+                    break
+                best_checked = True
+            if since_improvement >= patience:
+                since_improvement = 0
+        iterations += 1
+        since_improvement += 1
+        temperature = INITIAL_TEMPERATURE * (FINAL_TEMPERATURE / INITIAL_TEMPERATURE) ** progress
+
+        piece = rng.choice(movable)
+        old_placement = (piece.x, piece.y, piece.rotation)
+        move_kind = rng.random()
+        if move_kind < 0.15:
+            new_placement = random_placement(piece)
+        else:
+            rotation = piece.rotation
+            if move_kind < 0.3:
+                rotation = (rotation + rng.choice((90, 180, 270))) % 360
+            position_range = _position_range(room, piece, rotation)
+            if position_range is None:
+                continue
+            min_x, max_x, min_y, max_y = position_range
+            step = max(1.0, step_scale * (1.0 - progress))
+            new_placement = (_clamp(piece.x + rng.gauss(0, step), min_x, max_x),
+                             _clamp(piece.y + rng.gauss(0, step), min_y, max_y), rotation)
+
+        old_cost = state.piece_cost(piece)
+        state.move(piece, *new_placement)
+        delta = state.piece_cost(piece) - old_cost
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            cost += delta
+            if cost < best_cost - 1e-9:
+                best_cost = cost
+                best = [(p.x, p.y, p.rotation) for p in movable]
+                since_improvement = 0
+                best_checked = False
+        else:
+            state.move(piece, *old_placement)
+
+    furniture = _furniture_at(movable, best)
+    return LayoutResult(furniture, _is_feasible(room, furniture), best_cost, iterations,
+                        time.perf_counter() - start, seed)
+
+def apply_layout(room: Room, result: LayoutResult) -> List[Tuple[bool, str]]:
+    """Add the pieces of a solver result to the room with add_furniture. Returns its (success, message) results."""
+    return [room.add_furniture(furniture) for furniture in result.furniture]
+
+def restart_seeds(seed: Optional[int], restarts: int) -> List[int]:
+    """Derive independent, reproducible seeds for the restarts of a parallel solve."""
+    return [int(value) for value in np.random.SeedSequence(seed).generate_state(restarts)]
+
+def _best_result(results: List[LayoutResult]) -> LayoutResult:
+    """Pick the best layout: valid before invalid, then lowest cost, then earliest restart."""
+    return min(enumerate(results), key=lambda entry: (not entry[1].feasible, entry[1].cost, entry[0]))[1]
+
+def _reached_target(result: LayoutResult, target_cost: Optional[float]) -> bool:
+    return target_cost is not None and result.feasible and result.cost <= target_cost
+
+class _CancelFlag:
+    """Cancellation flag of one parallel solve: a byte in shared memory that pool workers can see."""
+    def __init__(self, flags, slot: int):
+        self.flags = flags
+        self.slot = slot
+
+    def is_set(self) -> bool:
+        return bool(self.flags[self.slot])
+
+    def set(self) -> None:
+        self.flags[self.slot] = 1
+
+class _SolverPool:
+    """Process pool for solver restarts, with a cancellation flag slot per running solve.
+
+    Workers are started with the spawn method: forking a threaded server such as
+    Streamlit can copy a held lock into the child and deadlock it. The flags are
+    handed to the workers when they start, so one pool serves any number of solves.
+    """
+    def __init__(self, workers: int):
+        context = multiprocessing.get_context("spawn")
+        self.workers = workers
+        self._flags = context.Array("b", CANCEL_SLOTS, lock=False)
+        self._free_slots = list(range(CANCEL_SLOTS))
+        self._slots_lock = threading.Lock()
+        self._slot_available = threading.Semaphore(CANCEL_SLOTS)
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                            initializer=_init_worker, initargs=(self._flags,))
+
+    @contextmanager
+    def cancel_flag(self) -> Iterator[_CancelFlag]:
+        """Lease a cleared cancellation flag for one solve."""
+        self._slot_available.acquire()
+        with self._slots_lock:
+            slot = self._free_slots.pop()
+        self._flags[slot] = 0
+        try:
+            yield _CancelFlag(self._flags, slot)
+        finally:
+            with self._slots_lock:
+                self._free_slots.append(slot)
+            self._slot_available.release()
+
+    def warm_up(self) -> None:
+        """Start the worker processes in the background, so the first solve does not wait for them."""
+        for _ in range(self.workers):
+            self.executor.submit(_warm_up)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+_solver_pool: Optional[_SolverPool] = None
+_solver_pool_lock = threading.Lock()
+
+def get_solver_pool() -> _SolverPool:
+    """Get the process pool shared by every parallel solve that does not ask for a worker count."""
+    global _solver_pool
+    with _solver_pool_lock:
+        if _solver_pool is None:
+            _solver_pool = _SolverPool(SOLVER_POOL_WORKERS)
+            _solver_pool.warm_up()
+        return _solver_pool
+
+def _discard_solver_pool(pool: _SolverPool) -> None:
+    """Drop a broken shared pool so the next solve starts a new one."""
+    global _solver_pool
+    with _solver_pool_lock:
+        if _solver_pool is pool:
+            _solver_pool = None
+    pool.shutdown()
+
+# Cancellation flags of a worker process, set up by _init_worker
+_worker_flags = None
+
+def _init_worker(flags) -> None:
+    global _worker_flags
+    _worker_flags = flags
+
+def _warm_up() -> None:
+    pass
+
+def _solve_restart(room_data: bytes, item_ids: Sequence[str], seed: int, cancel_slot: int, time_budget: float,
+                   max_iterations: Optional[int], patience: int, target_cost: Optional[float]) -> LayoutResult:
+    """Run one restart in a worker process. The room arrives in the binary format of room_codec."""
+    cancel = _CancelFlag(_worker_flags, cancel_slot)
+    result = solve_layout(Room.from_bytes(room_data), item_ids, time_budget, seed, max_iterations,
+                          patience, target_cost, cancel)
+    if _reached_target(result, target_cost):
+        # Tell the other workers of this solve to stop
+        cancel.set()
+    return result
+
+def _solve_on_pool(pool: _SolverPool, room: Room, item_ids: Sequence[str], seeds: List[int], time_budget: float,
+                   max_iterations: Optional[int], patience: int, target_cost: Optional[float]) -> List[LayoutResult]:
+    results: List[LayoutResult] = []
+    room_data = room.to_bytes()
+    with pool.cancel_flag() as cancel:
+        futures = [
+            pool.executor.submit(_solve_restart, room_data, list(item_ids), restart_seed, cancel.slot,
+                                 time_budget, max_iterations, patience, target_cost)
+            for restart_seed in seeds
+        ]
+        # Waits for every restart, so the flag is not reused while one still reads it
+        for future in futures:
+            if future.cancelled():
+                continue
+            results.append(future.result())
+            if cancel.is_set():
+                # Restarts that have not started yet are no longer needed
+                for pending in futures:
+                    pending.cancel()
+    return results
+
+def solve_layout_parallel(room: Room, item_ids: Sequence[str], restarts: Optional[int] = None,
+                          workers: Optional[int] = None, time_budget: float = DEFAULT_TIME_BUDGET,
+                          seed: Optional[int] = None, max_iterations: Optional[int] = None,
+                          patience: int = DEFAULT_PATIENCE, target_cost: Optional[float] = None) -> LayoutResult:
+    """Run independent solver restarts on a process pool and return the best layout.
+
+    Restart i uses the i-th seed of restart_seeds(seed, restarts), and every
+    restart gets the full time budget. As soon as one restart finds a valid
+    layout scoring target_cost or better, the others are cancelled. Without a
+    target and with max_iterations set, a fixed seed gives the same result for
+    any number of workers. Without a worker count the restarts run on the
+    shared pool of SOLVER_POOL_WORKERS processes (see get_solver_pool); with an
+    explicit count a pool of that size is started for this call, and with one
+    worker the restarts run in this process. restarts defaults to the number
+    of workers. The room is not modified; see apply_layout.
+    """
+    pool = None if workers else get_solver_pool()
+    workers = pool.workers if pool else workers
+    restarts = restarts or workers
+    seeds = restart_seeds(seed, restarts)
+    # Fail in the caller for unknown or oversized items rather than in every worker
+    for piece in _new_pieces(item_ids):
+        if all(_position_range(room, piece, rotation) is None for rotation in ROTATIONS):
+            raise ValueError(f"{piece.furniture.name} does not fit in the room")
+
+    if workers == 1 or restarts == 1:
+        results: List[LayoutResult] = []
+        for restart_seed in seeds:
+            result = solve_layout(room, item_ids, time_budget, restart_seed, max_iterations,
+                                  patience, target_cost)
+            results.append(result)
+            if _reached_target(result, target_cost):
+                break
+        return _best_result(results)
+
+    if pool is None:
+        own_pool = _SolverPool(min(workers, restarts))
+        try:
+            return _best_result(_solve_on_pool(own_pool, room, item_ids, seeds, time_budget,
+                                               max_iterations, patience, target_cost))
+        finally:
+            own_pool.shutdown()
+    try:
+        results = _solve_on_pool(pool, room, item_ids, seeds, time_budget, max_iterations, patience, target_cost)
+    except BrokenProcessPool:
+        _discard_solver_pool(pool)
+        raise
+    return _best_result(results)
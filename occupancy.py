@@ -0,0 +1,156 @@
+"""Raster view of the floor space taken by furniture.
+
+The floor is divided into square cells of a fixed resolution (in cm). A cell
+is occupied by a piece when the cell center lies inside the piece's footprint,
+using the rotated rectangle of Furniture.get_corners or the circle of circular
+catalog items. Cells count how many pieces cover them, so pieces can be added,
+moved and removed one at a time without redrawing the others. A summed-area
+table answers "is this rectangle free" in constant time.
+"""
+import math
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+
+from collision import circle_radius
+from furniture import Furniture
+
+# (row offset, column offset, boolean mask) of a footprint within the grid
+Footprint = Tuple[int, int, np.ndarray]
+
+class OccupancyGrid:
+    """Per-cell count of the pieces covering a room floor.
+
+    counts[row, col] covers x in [col, col + 1) * resolution and y in
+    [row, row + 1) * resolution. Entries are keyed by their furniture objects.
+    """
+    def __init__(self, width: float, height: float, resolution: float = 5.0):
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self.width = width
+        self.height = height
+        self.resolution = resolution
+        self.counts = np.zeros((math.ceil(height / resolution), math.ceil(width / resolution)), dtype=np.uint16)
+        self._footprints: Dict[Hashable, Optional[Footprint]] = {}
+        self._versions: Dict[Hashable, int] = {}  # geometry_version of each entry when it was drawn
+        self._summed_area: Optional[np.ndarray] = None
+        self.version = 0  # Incremented whenever a cell changes
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.counts.shape
+
+    def __len__(self) -> int:
+        return len(self._footprints)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._footprints
+
+    def occupied(self) -> np.ndarray:
+        """Get a boolean (rows, cols) array of cells covered by at least one piece."""
+        return self.counts > 0
+
+    def footprint(self, furniture: Furniture) -> Optional[Footprint]:
+        """Rasterize a piece's footprint, clipped to the grid. Returns None if it covers no cells."""
+        min_x, min_y, max_x, max_y = furniture.get_bounding_box()
+        rows, cols = self.counts.shape
+        res = self.resolution
+        # Cells whose centers can lie inside the bounding box
+        col0 = max(0, math.ceil(min_x / res - 0.5))
+        col1 = min(cols, math.floor(max_x / res - 0.5) + 1)
+        row0 = max(0, math.ceil(min_y / res - 0.5))
+        row1 = min(rows, math.floor(max_y / res - 0.5) + 1)
+        if col0 >= col1 or row0 >= row1:
+            return None
+
+        center_x = (np.arange(col0, col1) + 0.5) * res
+        center_y = (np.arange(row0, row1) + 0.5) * res
+        geometry = furniture.get_geometry()
+        rel_x = center_x[None, :] - geometry.center[0]
+        rel_y = center_y[:, None] - geometry.center[1]
+        radius = circle_radius(furniture)
+        if radius is not None:
+            mask = rel_x * rel_x + rel_y * rel_y <= radius * radius
+        else:
+            # Rotate cell centers into the piece's frame, as Furniture.contains_point does
+            local_x = rel_x * geometry.cos + rel_y * geometry.sin
+            local_y = -rel_x * geometry.sin + rel_y * geometry.cos
+            mask = (np.abs(local_x) <= geometry.half_width) & (np.abs(local_y) <= geometry.half_height)
+        return row0, col0, mask
+
+    def _draw(self, footprint: Optional[Footprint], delta: int) -> None:
+        if footprint is None:
+            return
+        row0, col0, mask = footprint
+        window = self.counts[row0:row0 + mask.shape[0], col0:col0 + mask.shape[1]]
+        if delta > 0:
+            window += mask
+        else:
+            window -= mask
+        self._summed_area = None
+        self.version += 1
+
+    def add(self, furniture: Furniture) -> None:
+        """Draw a piece, replacing its previous footprint if it was already drawn."""
+        self.remove(furniture)
+        footprint = self.footprint(furniture)
+        self._draw(footprint, 1)
+        self._footprints[furniture] = footprint
+        self._versions[furniture] = furniture.geometry_version
+
+    def remove(self, furniture: Furniture) -> bool:
+        """Erase a piece. Returns False if it was not drawn."""
+        if furniture not in self._footprints:
+            return False
+        self._draw(self._footprints.pop(furniture), -1)
+        del self._versions[furniture]
+        return True
+
+    def sync(self, furniture_list: Iterable[Furniture]) -> int:
+        """Make the grid show exactly the given pieces, redrawing only pieces that are new or moved.
+        Returns the number of pieces drawn or erased."""
+        current = set()
+        changes = 0
+        for furniture in furniture_list:
+            current.add(furniture)
+            if self._versions.get(furniture) != furniture.geometry_version:
+                self.add(furniture)
+                changes += 1
+        for furniture in [key for key in self._footprints if key not in current]:
+            self.remove(furniture)
+            changes += 1
+        return changes
+
+    def summed_area_table(self) -> np.ndarray:
+        """Get the (rows + 1, cols + 1) summed-area table of occupied cells.
+        table[r, c] is the number of occupied cells above and left of cell (r, c)."""
+        if self._summed_area is None:
+            table = np.zeros((self.counts.shape[0] + 1, self.counts.shape[1] + 1), dtype=np.int64)
+            np.cumsum(np.cumsum(self.occupied(), axis=0), axis=1, out=table[1:, 1:])
+            self._summed_area = table
+        return self._summed_area
+
+    def cell_range(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Tuple[int, int, int, int]:
+        """Get the (row0, col0, row1, col1) half-open range of cells touched by a rectangle in cm, clipped to the grid."""
+        rows, cols = self.counts.shape
+        res = self.resolution
+        return (max(0, math.floor(min_y / res)), max(0, math.floor(min_x / res)),
+                min(rows, math.ceil(max_y / res)), min(cols, math.ceil(max_x / res)))
+
+    def occupied_cells(self, min_x: float, min_y: float, max_x: float, max_y: float) -> int:
+        """Count the occupied cells touched by a rectangle (in cm) in constant time."""
+        row0, col0, row1, col1 = self.cell_range(min_x, min_y, max_x, max_y)
+        if row0 >= row1 or col0 >= col1:
+            return 0
+        table = self.summed_area_table()
+        return int(table[row1, col1] - table[row0, col1] - table[row1, col0] + table[row0, col0])
+
+    def is_free(self, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        """Check in constant time that no occupied cell touches a rectangle (in cm)."""
+        return self.occupied_cells(min_x, min_y, max_x, max_y) == 0
+
+    def free_fraction(self) -> float:
+        """Get the fraction of floor cells that are not occupied."""
+        if self.counts.size == 0:
+            return 1.0
+        return 1.0 - int(self.summed_area_table()[-1, -1]) / self.counts.size
@@ -1,6 +1,43 @@
+import hashlib
 import json
-from typing import List, Optional, Dict, Any, Tuple
+import numpy as np
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterator, Mapping
 from furniture import Furniture, get_furniture_item_by_id
+from spatial_index import SpatialGrid
+from collision import find_first_overlap, is_collidable
+from occupancy import OccupancyGrid
+from room_snapshot import FurnitureRecord, RoomSnapshot
+import batch_geometry
+
+# Size (in cm) of the spatial index cells used for collision and hit-testing
+SPATIAL_INDEX_CELL_SIZE = 100
+
+# Default search area and grid step (in cm) of find_nearest_free_position
+FREE_POSITION_SEARCH_RADIUS = 200
+FREE_POSITION_SEARCH_STEP = 5
+FREE_POSITION_BATCH_SIZE = 1024  # Candidate positions tested exactly at once
+
+# Default cell size (in cm) of occupancy rasters
+OCCUPANCY_RESOLUTION = 5
+
+def _snapshot_state(furniture: Furniture) -> tuple:
+    """Get what a piece's snapshot record depends on. geometry_version covers position,
+    size, rotation and scale."""
+    return (furniture.geometry_version, furniture.id, furniture.item_id,
+            furniture.name, furniture.color, furniture.wall)
+
+@lru_cache(maxsize=8)
+def _search_offsets(step: float, max_radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the (dx, dy) offsets of a square grid within max_radius, sorted by distance from the origin."""
+    count = int(max_radius // step)
+    steps = np.arange(-count, count + 1) * step
+    offset_x, offset_y = (grid.ravel() for grid in np.meshgrid(steps, steps, indexing="ij"))
+    distance = np.hypot(offset_x, offset_y)
+    order = np.argsort(distance, kind="stable")
+    order = order[distance[order] <= max_radius]
+    return offset_x[order], offset_y[order]
 
 class Room:
     def __init__(self, width: int = 500, height: int = 400, wall_color: str = "White", floor_design: str = "Hardwood"):
@@ -13,8 +50,19 @@ class Room:
         self.front_wall_color = wall_color
         self.back_wall_color = wall_color
         self.floor_design = floor_design
-        self.furniture: List[Furniture] = []
         self.next_furniture_id = 1
+        # Furniture by ID in placement order; the furniture property is a cached view of it
+        self._furniture_by_id: Dict[int, Furniture] = {}
+        self._furniture_view: Optional[Tuple[Furniture, ...]] = None
+        self._names_by_id: Optional[Mapping[int, str]] = None
+        # Spatial index of furniture bounding boxes, keyed by the furniture objects. Pieces
+        # report geometry changes into _moved_furniture and are re-indexed before the next query
+        self._spatial_index = SpatialGrid(SPATIAL_INDEX_CELL_SIZE)
+        self._moved_furniture: Set[Furniture] = set()
+        # Occupancy rasters by resolution, brought up to date when requested
+        self._occupancy_grids: Dict[float, OccupancyGrid] = {}
+        # Record of each piece in the latest snapshot, with the state it was taken from
+        self._snapshot_records: Dict[Furniture, Tuple[tuple, FurnitureRecord]] = {}
     
     def add_furniture(self, furniture: Furniture) -> Tuple[bool, str]:
         """Add a furniture item to the room with a unique ID.
@@ -29,17 +77,40 @@ class Room:
         self._constrain_furniture_position(furniture)
         
         # Check for overlaps with existing furniture
-        # Skip this check for doors and windows as they are placed on walls
-        if not (furniture.item_id.startswith('door') or furniture.item_id.startswith('window')):
+        # Skip this check for doors and windows (placed on walls) and rugs (floor coverings)
+        if is_collidable(furniture.item_id):
             overlapping_furniture = self._check_furniture_overlap(furniture)
             if overlapping_furniture:
                 # Reset the furniture ID counter since we're not adding this item
                 self.next_furniture_id -= 1
                 return False, f"Cannot place {furniture.name} here. It overlaps with {overlapping_furniture.name}."
         
-        self.furniture.append(furniture)
+        self._index_furniture(furniture)
         return True, f"Added {furniture.name} to the room."
     
+    @property
+    def furniture(self) -> Tuple[Furniture, ...]:
+        """Get the furniture in placement order. Use add_furniture, remove_furniture and
+        restore_furniture to change it."""
+        if self._furniture_view is None:
+            self._furniture_view = tuple(self._furniture_by_id.values())
+        return self._furniture_view
+    
+    def _index_furniture(self, furniture: Furniture) -> None:
+        """Append furniture to the room and register it in the lookup indexes."""
+        self._furniture_by_id[furniture.id] = furniture
+        self._furniture_view = None
+        self._names_by_id = None
+        self._spatial_index.insert(furniture, furniture.get_bounding_box())
+        furniture._on_geometry_change = self._moved_furniture.add
+    
+    def _sync_spatial_index(self) -> None:
+        """Re-index the furniture whose geometry was assigned since it was last indexed."""
+        moved = self._moved_furniture
+        while moved:
+            furniture = moved.pop()
+            self._spatial_index.update(furniture, furniture.get_bounding_box())
+    
     def _constrain_furniture_position(self, furniture: Furniture) -> None:
         """Make sure furniture stays within room boundaries."""
         # Calculate effective dimensions based on rotation
@@ -54,23 +125,64 @@ class Room:
     
     def remove_furniture(self, furniture_id: int) -> bool:
         """Remove a furniture item from the room by ID."""
-        for i, furniture in enumerate(self.furniture):
-            if furniture.id == furniture_id:
-                del self.furniture[i]
-                return True
-        return False
+        furniture = self._furniture_by_id.pop(furniture_id, None)
+        if furniture is None:
+            return False
+        self._furniture_view = None
+        self._names_by_id = None
+        self._spatial_index.remove(furniture)
+        self._moved_furniture.discard(furniture)
+        furniture._on_geometry_change = None
+        return True
+    
+    def restore_furniture(self, furniture: Furniture, index: Optional[int] = None) -> None:
+        """Put furniture back into the room with its existing ID, without overlap checks.
+        Used to replay history; index is its position in placement order (default: last)."""
+        furniture.item = get_furniture_item_by_id(furniture.item_id)
+        self.next_furniture_id = max(self.next_furniture_id, furniture.id + 1)
+        if index is None or index >= len(self._furniture_by_id):
+            self._index_furniture(furniture)
+        else:
+            # Rebuild the ordered index with the furniture at its old position
+            pieces = list(self._furniture_by_id.values())
+            pieces.insert(index, furniture)
+            self._furniture_by_id = {piece.id: piece for piece in pieces}
+            self._furniture_view = None
+            self.reindex_furniture()
+    
+    def set_furniture_attributes(self, furniture_id: int, attributes: Dict[str, Any]) -> bool:
+        """Set attributes (position, color, scale, ...) of a furniture item without overlap checks.
+        Used to replay history. Returns False if there is no furniture with that ID."""
+        furniture = self.get_furniture_by_id(furniture_id)
+        if furniture is None:
+            return False
+        for name, value in attributes.items():
+            setattr(furniture, name, value)
+        if "name" in attributes:
+            self._names_by_id = None
+        return True
     
     def get_furniture_by_id(self, furniture_id: int) -> Optional[Furniture]:
         """Get a furniture item by its ID."""
-        for furniture in self.furniture:
-            if furniture.id == furniture_id:
-                return furniture
-        return None
+        return self._furniture_by_id.get(furniture_id)
+    
+    def iter_ids(self) -> Iterator[int]:
+        """Iterate over furniture IDs in placement order."""
+        return iter(self._furniture_by_id)
+    
+    def names_by_id(self) -> Mapping[int, str]:
+        """Get a read-only ID -> name view of the furniture, in placement order."""
+        if self._names_by_id is None:
+            self._names_by_id = MappingProxyType(
+                {furniture_id: furniture.name for furniture_id, furniture in self._furniture_by_id.items()}
+            )
+        return self._names_by_id
     
     def get_furniture_at_position(self, x: float, y: float) -> Optional[Furniture]:
         """Get furniture at the given position (if any)."""
-        # Check furniture in reverse order (top items first)
-        for furniture in reversed(self.furniture):
+        # Check nearby furniture in reverse order (top items first)
+        self._sync_spatial_index()
+        for furniture in reversed(self._spatial_index.query_point(x, y)):
             if furniture.contains_point(x, y):
                 return furniture
         return None
@@ -87,49 +199,171 @@ class Room:
             furniture.y = y
             self._constrain_furniture_position(furniture)
             
-            # Check for overlaps (except for doors and windows)
-            if not (furniture.item_id.startswith('door') or furniture.item_id.startswith('window')):
+            # Check for overlaps (except for doors, windows and rugs)
+            if is_collidable(furniture.item_id):
                 overlapping_furniture = self._check_furniture_overlap(furniture)
                 if overlapping_furniture and overlapping_furniture.id != furniture.id:
                     # Revert to original position if overlap detected
                     furniture.x, furniture.y = original_x, original_y
                     return False
-            
             return True
         return False
     
     def _check_furniture_overlap(self, furniture: Furniture) -> Optional[Furniture]:
         """Check if furniture overlaps with any existing furniture in the room.
         Returns the first overlapping furniture item or None if no overlap."""
-        for existing_furniture in self.furniture:
-            # Skip checking against itself or doors/windows
-            if (existing_furniture.id == furniture.id or 
-                existing_furniture.item_id.startswith('door') or 
-                existing_furniture.item_id.startswith('window')):
-                continue
-                
-            # Simple bounding box collision detection using corners
-            # Get corners for both furniture items
-            furniture_corners = furniture.get_corners()
-            existing_furniture_corners = existing_furniture.get_corners()
-            
-            # Get bounding boxes (min/max coordinates) for both items
-            f_min_x = min(corner[0] for corner in furniture_corners)
-            f_max_x = max(corner[0] for corner in furniture_corners)
-            f_min_y = min(corner[1] for corner in furniture_corners)
-            f_max_y = max(corner[1] for corner in furniture_corners)
-            
-            e_min_x = min(corner[0] for corner in existing_furniture_corners)
-            e_max_x = max(corner[0] for corner in existing_furniture_corners)
-            e_min_y = min(corner[1] for corner in existing_furniture_corners)
-            e_max_y = max(corner[1] for corner in existing_furniture_corners)
-            
-            # Check for overlap using AABB (Axis-Aligned Bounding Box) collision detection
-            if (f_min_x <= e_max_x and f_max_x >= e_min_x and
-                f_min_y <= e_max_y and f_max_y >= e_min_y):
-                return existing_furniture
-                
+        # Broad phase: only items whose bounding boxes touch this one can overlap it
+        self._sync_spatial_index()
+        candidates = (
+            existing_furniture
+            for existing_furniture in self._spatial_index.query(furniture.get_bounding_box())
+            # Skip checking against itself or doors, windows and rugs
+            if existing_furniture.id != furniture.id and is_collidable(existing_furniture.item_id)
+        )
+        
+        # Narrow phase: exact rotated-rectangle and circle tests
+        return find_first_overlap(furniture, candidates, broad_phase=False)
+
+    def find_nearest_free_position(self, furniture: Furniture, max_radius: float = FREE_POSITION_SEARCH_RADIUS,
+                                   step: float = FREE_POSITION_SEARCH_STEP,
+                                   max_batches: Optional[int] = None) -> Optional[Tuple[float, float]]:
+        """Find the closest position to the furniture's current one where add_furniture would accept it.
+        The rotation is kept. Positions are searched on a grid of the given step (in cm), nearest first,
+        up to max_radius away. Returns (x, y), or None if there is no free spot within the radius.
+        max_batches bounds the exact footprint tests for interactive use: once that many batches of
+        FREE_POSITION_BATCH_SIZE candidates have been tested, the nearest position whose bounding box
+        is clear of every obstacle is returned, which may be a little farther than the nearest free one."""
+        # Start from where add_furniture would put it
+        max_x = max(0, self.width - furniture.width)
+        max_y = max(0, self.height - furniture.height)
+        start_x = max(0, min(max_x, furniture.x))
+        start_y = max(0, min(max_y, furniture.y))
+        if not is_collidable(furniture.item_id):
+            return start_x, start_y
+        
+        offset_x, offset_y = _search_offsets(step, max_radius)
+        candidate_x = start_x + offset_x
+        candidate_y = start_y + offset_y
+        # Skip positions that add_furniture would move back inside the room
+        inside = (candidate_x >= 0) & (candidate_x <= max_x) & (candidate_y >= 0) & (candidate_y <= max_y)
+        candidate_x, candidate_y = candidate_x[inside], candidate_y[inside]
+        if len(candidate_x) == 0:
+            return None
+        
+        # Bounding box of the furniture at each candidate position
+        probe = Furniture.from_dict(furniture.to_dict())
+        probe.item = furniture.item
+        probe.x, probe.y = start_x, start_y
+        min_x, min_y, max_box_x, max_box_y = probe.get_bounding_box()
+        shift_x = candidate_x - start_x
+        shift_y = candidate_y - start_y
+        
+        # Obstacles anywhere in the searched area, filtered like _check_furniture_overlap
+        self._sync_spatial_index()
+        obstacles = [
+            existing for existing in self._spatial_index.query(
+                (min_x - max_radius, min_y - max_radius, max_box_x + max_radius, max_box_y + max_radius))
+            if existing.id != furniture.id and is_collidable(existing.item_id)
+        ]
+        if not obstacles:
+            return float(candidate_x[0]), float(candidate_y[0])
+        boxes = np.array([existing.get_bounding_box() for existing in obstacles])
+        
+        # (C, K) bounding-box hits between candidates and obstacles, touching edges count
+        hits = ((min_x + shift_x)[:, None] <= boxes[None, :, 2]) & ((max_box_x + shift_x)[:, None] >= boxes[None, :, 0]) & \
+               ((min_y + shift_y)[:, None] <= boxes[None, :, 3]) & ((max_box_y + shift_y)[:, None] >= boxes[None, :, 1])
+        clear = ~hits.any(axis=1)
+        first_clear = int(np.argmax(clear)) if clear.any() else len(clear)
+        
+        # Candidates before the first clear one only touch obstacles' boxes, which may still leave
+        # their exact (rotated or circular) footprints free, so test those exactly in batches
+        probe_arrays = batch_geometry.furniture_arrays([probe])
+        obstacle_arrays = batch_geometry.furniture_arrays(obstacles)
+        exact_end = first_clear
+        if max_batches is not None:
+            exact_end = min(exact_end, max_batches * FREE_POSITION_BATCH_SIZE)
+        for chunk_start in range(0, exact_end, FREE_POSITION_BATCH_SIZE):
+            chunk_end = min(exact_end, chunk_start + FREE_POSITION_BATCH_SIZE)
+            # Only the (candidate, obstacle) pairs whose boxes touch can overlap
+            candidate_index, obstacle_index = np.nonzero(hits[chunk_start:chunk_end])
+            candidate_index += chunk_start
+            candidates = {name: np.repeat(column, len(candidate_index))
+                          for name, column in probe_arrays._asdict().items()}
+            candidates.update(x=candidate_x[candidate_index], y=candidate_y[candidate_index])
+            overlapping = batch_geometry.paired_overlap(
+                batch_geometry.FurnitureArrays(**candidates),
+                batch_geometry.FurnitureArrays(
+                    **{name: column[obstacle_index] for name, column in obstacle_arrays._asdict().items()})
+            )
+            blocked = np.zeros(chunk_end - chunk_start, dtype=bool)
+            blocked[candidate_index[overlapping] - chunk_start] = True
+            if not blocked.all():
+                index = chunk_start + int(np.argmin(blocked))
+                return float(candidate_x[index]), float(candidate_y[index])
+        if first_clear < len(clear):
+            return float(candidate_x[first_clear]), float(candidate_y[first_clear])
         return None
+
+    def reindex_furniture(self) -> None:
+        """Rebuild the lookup indexes from scratch. Geometry changes are picked up on their
+        own, so this is only needed after changing furniture IDs or names directly."""
+        pieces = self.furniture
+        self._furniture_by_id = {furniture.id: furniture for furniture in pieces}
+        self._furniture_view = None
+        self._names_by_id = None
+        self._spatial_index.clear()
+        self._moved_furniture.clear()
+        for furniture in pieces:
+            self._spatial_index.insert(furniture, furniture.get_bounding_box())
+            furniture._on_geometry_change = self._moved_furniture.add
+    
+    def furniture_arrays(self) -> batch_geometry.FurnitureArrays:
+        """Get a struct-of-arrays view of the furniture, in placement order."""
+        return batch_geometry.furniture_arrays(self.furniture)
+    
+    def corners_array(self) -> np.ndarray:
+        """Get the rotated corners of all furniture as an (N, 4, 2) array, in placement order."""
+        return batch_geometry.corners(self.furniture_arrays())
+    
+    def overlap_matrix(self) -> np.ndarray:
+        """Get an (N, N) boolean matrix of overlapping furniture pairs, in placement order.
+        Doors and windows never overlap anything, matching add_furniture."""
+        return batch_geometry.overlap_matrix(self.furniture_arrays())
+    
+    def out_of_bounds_furniture(self) -> List[int]:
+        """Get the indexes of furniture whose rotated, scaled footprint reaches outside the room."""
+        return np.flatnonzero(batch_geometry.out_of_bounds(self.furniture_arrays(), self.width, self.height)).tolist()
+    
+    def hit_test_many(self, points) -> np.ndarray:
+        """Get a (P, N) boolean mask of which furniture contains each of the P (x, y) points."""
+        return batch_geometry.hit_test(self.furniture_arrays(), points)
+    
+    def occupancy_grid(self, resolution_cm: float = OCCUPANCY_RESOLUTION) -> OccupancyGrid:
+        """Get a raster of the floor taken by furniture (doors, windows and rugs excluded).
+        The grid is kept between calls and only pieces added, moved or removed since are redrawn.
+        It is shared, so treat it as read-only."""
+        grid = self._occupancy_grids.get(resolution_cm)
+        if grid is None or grid.width != self.width or grid.height != self.height:
+            grid = OccupancyGrid(self.width, self.height, resolution_cm)
+            self._occupancy_grids[resolution_cm] = grid
+        grid.sync(
+            furniture for furniture in self.furniture if is_collidable(furniture.item_id)
+        )
+        return grid
+    
+    def content_hash(self) -> str:
+        """Get a stable hash of everything that affects how the room looks.
+        Rooms with equal dimensions, colors, floor design and furniture hash the same."""
+        content = [
+            self.width, self.height, self.wall_color,
+            self.left_wall_color, self.right_wall_color, self.front_wall_color, self.back_wall_color,
+            self.floor_design,
+            [
+                [f.id, f.item_id, f.name, f.width, f.height, f.x, f.y, f.color, f.rotation, f.scale, f.wall]
+                for f in self.furniture
+            ]
+        ]
+        return hashlib.sha256(json.dumps(content, separators=(",", ":")).encode("utf-8")).hexdigest()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the room to a dictionary for serialization."""
@@ -169,6 +403,65 @@ class Room:
             furniture = Furniture.from_dict(f_data)
             # Don't use add_furniture as we want to preserve IDs
             furniture.item = get_furniture_item_by_id(furniture.item_id)
-            room.furniture.append(furniture)
+            room._index_furniture(furniture)
         
         return room
+    
+    def copy(self) -> 'Room':
+        """Get an independent copy of the room, furniture included, without overlap checks."""
+        room = Room(self.width, self.height, self.wall_color, self.floor_design)
+        room.left_wall_color = self.left_wall_color
+        room.right_wall_color = self.right_wall_color
+        room.front_wall_color = self.front_wall_color
+        room.back_wall_color = self.back_wall_color
+        room.next_furniture_id = self.next_furniture_id
+        for furniture in self.furniture:
+            room._index_furniture(furniture.copy())
+        return room
+    
+    def snapshot(self) -> RoomSnapshot:
+        """Get an immutable snapshot of the room. Furniture that has not changed since the
+        previous snapshot keeps the very same record, so snapshots share memory."""
+        records = []
+        cache = {}
+        for furniture in self.furniture:
+            state = _snapshot_state(furniture)
+            cached = self._snapshot_records.get(furniture)
+            if cached is None or cached[0] != state:
+                cached = (state, FurnitureRecord.from_furniture(furniture))
+            cache[furniture] = cached
+            records.append(cached[1])
+        # Replacing the dict also drops records of removed furniture
+        self._snapshot_records = cache
+        return RoomSnapshot(
+            self.width, self.height, self.wall_color,
+            self.left_wall_color, self.right_wall_color, self.front_wall_color, self.back_wall_color,
+            self.floor_design, self.next_furniture_id, tuple(records)
+        )
+    
+    @classmethod
+    def from_snapshot(cls, snapshot: RoomSnapshot) -> 'Room':
+        """Create a room from a snapshot. Its next snapshot reuses the records of this one."""
+        room = cls(snapshot.width, snapshot.height, snapshot.wall_color, snapshot.floor_design)
+        room.left_wall_color = snapshot.left_wall_color
+        room.right_wall_color = snapshot.right_wall_color
+        room.front_wall_color = snapshot.front_wall_color
+        room.back_wall_color = snapshot.back_wall_color
+        room.next_furniture_id = snapshot.next_furniture_id
+        for record in snapshot.furniture:
+            furniture = record.to_furniture()
+            furniture.item = get_furniture_item_by_id(furniture.item_id)
+            room._index_furniture(furniture)
+            room._snapshot_records[furniture] = (_snapshot_state(furniture), record)
+        return room
+    
+    def to_bytes(self) -> bytes:
+        """Serialize the room to the compact binary format of room_codec."""
+        from room_codec import encode_room  # room_codec imports this module
+        return encode_room(self)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Room':
+        """Create a room from the compact binary format of room_codec."""
+        from room_codec import decode_room
+        return decode_room(data)
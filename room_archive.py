@@ -0,0 +1,107 @@
+"""Streaming import/export of rooms as JSON Lines archives.
+
+Each line holds one room as produced by Room.to_dict, plus an optional "name"
+key. Archives whose path ends in ".gz" are gzip-compressed. Reading and
+writing are generator based, so archives of any size are processed in
+constant memory, and a bad line is reported as an error entry instead of
+aborting the rest of the stream.
+"""
+import gzip
+import json
+import os
+from typing import IO, Any, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+from room import Room
+import assets.furniture_items  # Registers the catalog so loaded furniture gets its catalog item
+
+PathOrFile = Union[str, "os.PathLike[str]", IO[str]]
+
+class ArchiveEntry(NamedTuple):
+    """One line of an archive: either a room or the reason it could not be read."""
+    line_number: int  # 1-based
+    name: Optional[str]
+    room: Optional[Room]  # None if the line could not be read
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def open_archive(path: Union[str, "os.PathLike[str]"], mode: str = "r") -> IO[str]:
+    """Open an archive file for text reading ("r") or writing ("w"), gzip-compressed if it ends in .gz."""
+    if os.fspath(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def _lines(source: PathOrFile) -> Iterator[str]:
+    if isinstance(source, (str, os.PathLike)):
+        with open_archive(source) as file:
+            yield from file
+    else:
+        yield from source
+
+def parse_line(line_number: int, line: str) -> ArchiveEntry:
+    """Parse one archive line into an entry, reporting problems as an error entry."""
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        return ArchiveEntry(line_number, None, None, f"Invalid JSON: {e}")
+    if not isinstance(data, dict):
+        return ArchiveEntry(line_number, None, None, f"Expected a JSON object, got {type(data).__name__}")
+    name = data.get("name")
+    try:
+        room = Room.from_dict(data)
+    except (TypeError, ValueError, KeyError, AttributeError) as e:
+        return ArchiveEntry(line_number, name, None, f"Invalid room: {e}")
+    return ArchiveEntry(line_number, name, room)
+
+def read_archive(source: PathOrFile) -> Iterator[ArchiveEntry]:
+    """Stream the entries of an archive given by path or open text file. Blank lines are skipped."""
+    for line_number, line in enumerate(_lines(source), start=1):
+        if line.strip():
+            yield parse_line(line_number, line)
+
+def read_rooms(source: PathOrFile,
+               on_error: Optional[Callable[[ArchiveEntry], None]] = None) -> Iterator[Tuple[Optional[str], Room]]:
+    """Stream the (name, room) pairs of an archive, passing entries that failed to on_error (if given)."""
+    for entry in read_archive(source):
+        if entry.ok:
+            yield entry.name, entry.room
+        elif on_error is not None:
+            on_error(entry)
+
+def room_line(room: Room, name: Optional[str] = None) -> str:
+    """Serialize a room as one archive line, without the trailing newline."""
+    data: Any = room.to_dict()
+    if name is not None:
+        data = {"name": name, **data}
+    return json.dumps(data, separators=(",", ":"))
+
+def write_archive(destination: PathOrFile,
+                  rooms: Iterable[Union[Room, Tuple[Optional[str], Room]]]) -> int:
+    """Write rooms, or (name, room) pairs, to an archive given by path or open text file.
+    Rooms are consumed one at a time. Returns the number of rooms written."""
+    if isinstance(destination, (str, os.PathLike)):
+        with open_archive(destination, "w") as file:
+            return write_archive(file, rooms)
+
+    count = 0
+    for entry in rooms:
+        name, room = (None, entry) if isinstance(entry, Room) else entry
+        destination.write(room_line(room, name))
+        destination.write("\n")
+        count += 1
+    return count
+
+def transform_archive(source: PathOrFile, destination: PathOrFile,
+                      transform: Callable[[Room], Optional[Room]],
+                      on_error: Optional[Callable[[ArchiveEntry], None]] = None) -> int:
+    """Re-export an archive, applying transform to every room (return None to drop a room).
+    Lines that cannot be read are passed to on_error and skipped. Returns the number of rooms written."""
+    def transformed() -> Iterator[Tuple[Optional[str], Room]]:
+        for name, room in read_rooms(source, on_error):
+            result = transform(room)
+            if result is not None:
+                yield name, result
+
+    return write_archive(destination, transformed())
@@ -0,0 +1,205 @@
+"""Compact versioned binary format for rooms.
+
+Layout (little-endian):
+    header      magic b"ILDR", format version (u8)
+    strings     count (u32), then per string its UTF-8 length (u16) and bytes
+    room        width, height (f64), int flags (u8), wall_color, left/right/
+                front/back wall colors, floor_design (i32 string indexes),
+                next_furniture_id (i64), furniture count (u32)
+    furniture   one packed FURNITURE_RECORD per piece, in placement order
+    overrides   count (u32), then one packed OVERRIDE_RECORD per piece whose
+                name or size differs from its catalog item
+
+Every string (item IDs, colors, wall placements, names) is stored once in the
+string table and referenced by index; -1 stands for None. Names and sizes are
+normally those of the catalog item, so they are only stored as overrides.
+Numbers are stored as f64 with a bit per field recording whether the value
+was an int, so decoding gives back exactly what was encoded.
+"""
+import struct
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from furniture import Furniture, get_furniture_item_by_id
+from room import Room
+import assets.furniture_items  # Registers the catalog that default names and sizes come from
+
+MAGIC = b"ILDR"
+FORMAT_VERSION = 1
+MAX_STRING_BYTES = 0xFFFF  # Longest string the u16 length prefix can hold, in UTF-8 bytes
+
+FURNITURE_RECORD = np.dtype([
+    ("id", "<i8"),  # -1 for furniture without an ID
+    ("item_id", "<i4"),
+    ("color", "<i4"),
+    ("wall", "<i4"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("rotation", "<f8"),
+    ("scale", "<f8"),
+    ("int_fields", "u1"),  # Bit set per numeric field (x, y, rotation, scale) that was an int
+])
+OVERRIDE_RECORD = np.dtype([
+    ("index", "<u4"),  # Position of the piece in the furniture table
+    ("name", "<i4"),
+    ("width", "<f8"),
+    ("height", "<f8"),
+    ("int_fields", "u1"),  # Bit set per numeric field (width, height) that was an int
+])
+
+_HEADER = struct.Struct("<4sB")
+_COUNT = struct.Struct("<I")
+_STRING_LENGTH = struct.Struct("<H")
+_ROOM = struct.Struct("<ddB6iqI")
+
+class _StringTable:
+    """Interns strings while encoding."""
+    def __init__(self):
+        self.indexes: Dict[str, int] = {}
+
+    def __call__(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        return self.indexes.setdefault(value, len(self.indexes))
+
+    def to_bytes(self) -> bytes:
+        parts = [_COUNT.pack(len(self.indexes))]
+        for value in self.indexes:
+            encoded = value.encode("utf-8")
+            if len(encoded) > MAX_STRING_BYTES:
+                raise ValueError(f"Cannot encode room: string {value[:40]!r}... is {len(encoded)} "
+                                 f"UTF-8 bytes long, more than {MAX_STRING_BYTES}")
+            parts.append(_STRING_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+
+def _int_flags(*values) -> int:
+    """Pack whether each value is an int into a bit mask."""
+    flags = 0
+    for bit, value in enumerate(values):
+        if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+            flags |= 1 << bit
+    return flags
+
+def _number(value: float, flags: int, bit: int):
+    """Restore a stored number to the type recorded in flags."""
+    return int(value) if flags & (1 << bit) else value
+
+def encode_room(room: Room) -> bytes:
+    """Serialize a room to the binary format.
+    Raises ValueError if a string (such as a furniture name) is longer than MAX_STRING_BYTES."""
+    intern = _StringTable()
+    wall_colors = [intern(color) for color in (room.wall_color, room.left_wall_color, room.right_wall_color,
+                                               room.front_wall_color, room.back_wall_color, room.floor_design)]
+
+    records = []
+    overrides = []
+    for index, furniture in enumerate(room.furniture):
+        records.append((
+            -1 if furniture.id is None else furniture.id,
+            intern(furniture.item_id), intern(furniture.color), intern(furniture.wall),
+            furniture.x, furniture.y, furniture.rotation, furniture.scale,
+            _int_flags(furniture.x, furniture.y, furniture.rotation, furniture.scale)
+        ))
+        item = get_furniture_item_by_id(furniture.item_id)
+        size_flags = _int_flags(furniture.width, furniture.height)
+        if (item is None or furniture.name != item.name or
+                furniture.width != item.width or furniture.height != item.height or
+                size_flags != _int_flags(item.width, item.height)):
+            overrides.append((index, intern(furniture.name), furniture.width, furniture.height, size_flags))
+
+    # The string table is written first, so build the rest before it
+    body = b"".join([
+        _ROOM.pack(room.width, room.height, _int_flags(room.width, room.height), *wall_colors,
+                   room.next_furniture_id, len(records)),
+        np.array(records, dtype=FURNITURE_RECORD).tobytes(),
+        _COUNT.pack(len(overrides)),
+        np.array(overrides, dtype=OVERRIDE_RECORD).tobytes()
+    ])
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + intern.to_bytes() + body
+
+def decode_room(data: bytes) -> Room:
+    """Deserialize a room from the binary format.
+    Raises ValueError if the data is not a room in a supported format version, or is
+    truncated or corrupt."""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("Not a binary room: data is truncated")
+    magic, version = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary room: bad magic bytes")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary room format version {version}")
+    offset = _HEADER.size
+
+    try:
+        (string_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        strings: List[str] = []
+        for _ in range(string_count):
+            (length,) = _STRING_LENGTH.unpack_from(view, offset)
+            offset += _STRING_LENGTH.size
+            if offset + length > len(view):
+                raise ValueError("string table is truncated")
+            strings.append(bytes(view[offset:offset + length]).decode("utf-8"))
+            offset += length
+
+        width, height, size_flags, *colors, next_furniture_id, furniture_count = _ROOM.unpack_from(view, offset)
+        offset += _ROOM.size
+        furniture_table = np.frombuffer(view, dtype=FURNITURE_RECORD, count=furniture_count, offset=offset)
+        offset += furniture_table.nbytes
+        (override_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        override_table = np.frombuffer(view, dtype=OVERRIDE_RECORD, count=override_count, offset=offset)
+    except (struct.error, ValueError) as e:
+        raise ValueError(f"Corrupt binary room: {e}") from e
+
+    def string(index: int) -> Optional[str]:
+        if index < 0:
+            return None
+        if index >= len(strings):
+            raise ValueError(f"Corrupt binary room: string index {index} is out of range")
+        return strings[index]
+
+    wall_color, left_wall_color, right_wall_color, front_wall_color, back_wall_color, floor_design = (
+        string(index) for index in colors)
+    room = Room(width=_number(width, size_flags, 0), height=_number(height, size_flags, 1),
+                wall_color=wall_color, floor_design=floor_design)
+    room.left_wall_color = left_wall_color
+    room.right_wall_color = right_wall_color
+    room.front_wall_color = front_wall_color
+    room.back_wall_color = back_wall_color
+    room.next_furniture_id = next_furniture_id
+
+    overrides = {row[0]: row[1:] for row in override_table.tolist()}
+    for index, row in enumerate(furniture_table.tolist()):
+        furniture_id, item_index, color, wall, x, y, rotation, scale, flags = row
+        item_id = string(item_index)
+        if item_id is None:
+            raise ValueError(f"Corrupt binary room: furniture {index} has no item ID")
+        item = get_furniture_item_by_id(item_id)
+        if index in overrides:
+            name_index, item_width, item_height, size_flags = overrides[index]
+            name = string(name_index)
+            item_width, item_height = _number(item_width, size_flags, 0), _number(item_height, size_flags, 1)
+        elif item is None:
+            raise ValueError(f"Corrupt binary room: unknown item {item_id!r} has no stored name and size")
+        else:
+            name, item_width, item_height = item.name, item.width, item.height
+        furniture = Furniture(
+            id=None if furniture_id < 0 else furniture_id,
+            item_id=item_id,
+            name=name,
+            width=item_width,
+            height=item_height,
+            x=_number(x, flags, 0),
+            y=_number(y, flags, 1),
+            color=string(color),
+            rotation=_number(rotation, flags, 2),
+            scale=_number(scale, flags, 3)
+        )
+        furniture.wall = string(wall)
+        furniture.item = item
+        room._index_furniture(furniture)
+    return room
@@ -0,0 +1,63 @@
+"""Immutable room snapshots.
+
+A RoomSnapshot is a frozen view of a room: its attributes plus a tuple of
+frozen furniture records. Snapshots are shared instead of copied, and
+Room.snapshot reuses the record of every piece that has not changed since
+the previous snapshot, so consecutive snapshots (undo entries, template
+states, solver candidates) only hold new records for the pieces that changed.
+"""
+from typing import Any, Dict, NamedTuple, Tuple, Union
+
+from furniture import Furniture
+
+Number = Union[int, float]
+
+class FurnitureRecord(NamedTuple):
+    """Frozen state of one piece of furniture, with the fields of Furniture.to_dict."""
+    id: int
+    item_id: str
+    name: str
+    width: Number
+    height: Number
+    x: Number
+    y: Number
+    color: str
+    rotation: Number
+    scale: Number
+    wall: str
+
+    @classmethod
+    def from_furniture(cls, furniture: Furniture) -> 'FurnitureRecord':
+        return cls(furniture.id, furniture.item_id, furniture.name, furniture.width, furniture.height,
+                   furniture.x, furniture.y, furniture.color, furniture.rotation, furniture.scale, furniture.wall)
+
+    def to_furniture(self) -> Furniture:
+        """Create a new furniture instance in this state (without its catalog item)."""
+        furniture = Furniture(self.item_id, self.name, self.width, self.height, self.x, self.y,
+                              self.color, self.rotation, self.scale, self.id)
+        furniture.wall = self.wall
+        return furniture
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+class RoomSnapshot(NamedTuple):
+    """Frozen state of a room. Create with Room.snapshot, restore with Room.from_snapshot."""
+    width: Number
+    height: Number
+    wall_color: str
+    left_wall_color: str
+    right_wall_color: str
+    front_wall_color: str
+    back_wall_color: str
+    floor_design: str
+    next_furniture_id: int
+    furniture: Tuple[FurnitureRecord, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary format of Room.to_dict."""
+        data = self._asdict()
+        # Same key order as Room.to_dict
+        data["furniture"] = [record.to_dict() for record in data.pop("furniture")]
+        data["next_furniture_id"] = data.pop("next_furniture_id")
+        return data
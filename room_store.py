@@ -0,0 +1,149 @@
+"""Persistent saved-rooms store backed by a local SQLite database.
+
+Rooms are stored by name as zlib-compressed blobs in the binary format of
+room_codec (older compressed JSON blobs can still be read). The name is the
+primary key and (updated_at, name) has its own index, so saving, loading and
+each page of a listing are index lookups rather than scans. Listing pages
+with a cursor (keyset pagination) and never decompresses room data.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+import room_codec
+from room import Room
+
+# Database file used by the app, can be overridden with the ROOM_STORE_PATH environment variable
+DEFAULT_STORE_PATH = os.environ.get("ROOM_STORE_PATH", "saved_rooms.db")
+DEFAULT_PAGE_SIZE = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rooms (
+    name TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    furniture_count INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rooms_updated_at ON rooms (updated_at DESC, name);
+"""
+
+class SavedRoomInfo(NamedTuple):
+    """Summary of a saved room, as returned by listings."""
+    name: str
+    updated_at: float  # Seconds since the epoch
+    furniture_count: int
+
+def _encode(room: Room) -> bytes:
+    return zlib.compress(room.to_bytes())
+
+def _decode(data: bytes) -> Room:
+    data = zlib.decompress(data)
+    if data.startswith(room_codec.MAGIC):
+        return Room.from_bytes(data)
+    return Room.from_dict(json.loads(data.decode("utf-8")))
+
+class RoomStore:
+    """Saved rooms in a SQLite database file.
+
+    A connection is opened per operation, so one store can be shared by every
+    Streamlit session. Use ":memory:" as the path for a private in-memory store.
+    """
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # An in-memory database only lives as long as its connection, so keep a single one
+        self._memory_connection = (sqlite3.connect(":memory:", check_same_thread=False)
+                                   if path == ":memory:" else None)
+        with self._transaction() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._memory_connection is not None:
+            return self._memory_connection
+        return sqlite3.connect(self.path, timeout=10)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold a connection for one transaction, committing on success and rolling back on error."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    yield conn
+            finally:
+                if conn is not self._memory_connection:
+                    conn.close()
+
+    def _execute(self, sql: str, params=()) -> List[tuple]:
+        with self._transaction() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def save(self, name: str, room: Room) -> None:
+        """Save a room, replacing any room with the same name."""
+        self._execute(
+            "INSERT OR REPLACE INTO rooms (name, updated_at, furniture_count, data) VALUES (?, ?, ?, ?)",
+            (name, time.time(), len(room.furniture), _encode(room))
+        )
+
+    def save_state(self, name: str, state: Dict[str, Any]) -> None:
+        """Save a room state (as returned by Room.to_dict), replacing any room with the same name."""
+        self.save(name, Room.from_dict(state))
+
+    def load(self, name: str) -> Optional[Room]:
+        """Load a saved room, or None if there is no room with that name."""
+        rows = self._execute("SELECT data FROM rooms WHERE name = ?", (name,))
+        return _decode(rows[0][0]) if rows else None
+
+    def load_state(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the state of a saved room, or None if there is no room with that name."""
+        room = self.load(name)
+        return room.to_dict() if room is not None else None
+
+    def delete(self, name: str) -> bool:
+        """Delete a saved room. Returns False if there was no room with that name."""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM rooms WHERE name = ?", (name,)).rowcount > 0
+
+    def __contains__(self, name: str) -> bool:
+        return bool(self._execute("SELECT 1 FROM rooms WHERE name = ?", (name,)))
+
+    def count(self) -> int:
+        """Get the number of saved rooms."""
+        return self._execute("SELECT COUNT(*) FROM rooms")[0][0]
+
+    def list_rooms(self, limit: int = DEFAULT_PAGE_SIZE,
+                   after: Optional[SavedRoomInfo] = None) -> List[SavedRoomInfo]:
+        """List saved rooms, most recently saved first, one page at a time.
+
+        Pass the last room of the previous page as after to get the next page.
+        """
+        if after is None:
+            rows = self._execute(
+                "SELECT name, updated_at, furniture_count FROM rooms "
+                "ORDER BY updated_at DESC, name LIMIT ?", (limit,)
+            )
+        else:
+            rows = self._execute(
+                "SELECT name, updated_at, furniture_count FROM rooms "
+                "WHERE updated_at < ? OR (updated_at = ? AND name > ?) "
+                "ORDER BY updated_at DESC, name LIMIT ?",
+                (after.updated_at, after.updated_at, after.name, limit)
+            )
+        return [SavedRoomInfo(*row) for row in rows]
+
+# Shared by every session of the app, since imported modules survive Streamlit reruns
+_room_store: Optional[RoomStore] = None
+_room_store_lock = threading.Lock()
+
+def get_room_store() -> RoomStore:
+    """Get the app's shared room store, creating the database on first use."""
+    global _room_store
+    with _room_store_lock:
+        if _room_store is None:
+            _room_store = RoomStore()
+        return _room_store
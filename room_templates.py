@@ -1,6 +1,11 @@
 from typing import Dict, Any, List
+
+import numpy as np
+
 from room import Room
+from room_snapshot import RoomSnapshot
 from furniture import Furniture, get_furniture_item_by_id
+import assets.furniture_items  # Registers the catalog, which templates are validated against
 
 # Define room templates
 ROOM_TEMPLATES = {
@@ -148,7 +153,7 @@ ROOM_TEMPLATES = {
             {
                 "item_id": "dining_chair",
                 "x": 150,
-                "y": 280,
+                "y": 305,
                 "color": "#8B4513",
                 "rotation": 180,
                 "scale": 1.0
@@ -156,7 +161,7 @@ ROOM_TEMPLATES = {
             {
                 "item_id": "dining_chair",
                 "x": 250,
-                "y": 280,
+                "y": 305,
                 "color": "#8B4513",
                 "rotation": 180,
                 "scale": 1.0
@@ -317,41 +322,73 @@ ROOM_TEMPLATES = {
     }
 }
 
-def load_room_template(template_name: str) -> Room:
-    """Load a room template by name."""
-    if template_name not in ROOM_TEMPLATES:
-        return Room()
-    
-    template = ROOM_TEMPLATES[template_name]
+class TemplateError(ValueError):
+    """Raised when the template data is invalid."""
+
+def compile_template(name: str, template: Dict[str, Any]) -> Room:
+    """Build and validate a template room. Raises TemplateError listing every problem found."""
+    problems = []
     room = Room(
         width=template["width"],
         height=template["height"],
         wall_color=template["wall_color"],
         floor_design=template["floor_design"]
     )
-    
-    # Add furniture
     for i, furniture_data in enumerate(template["furniture"]):
         item_id = furniture_data["item_id"]
         item = get_furniture_item_by_id(item_id)
+        if item is None:
+            problems.append(f"furniture {i}: unknown item {item_id!r}")
+            continue
         
-        if item:
-            furniture = Furniture(
-                id=i+1,  # Give it a unique ID
-                item_id=item_id,
-                name=item.name,
-                width=item.width,
-                height=item.height,
-                x=furniture_data["x"],
-                y=furniture_data["y"],
-                color=furniture_data["color"],
-                rotation=furniture_data["rotation"],
-                scale=furniture_data["scale"]
-            )
-            room.add_furniture(furniture)
+        furniture = Furniture(
+            id=room.next_furniture_id,
+            item_id=item_id,
+            name=item.name,
+            width=item.width,
+            height=item.height,
+            x=furniture_data["x"],
+            y=furniture_data["y"],
+            color=furniture_data["color"],
+            rotation=furniture_data["rotation"],
+            scale=furniture_data["scale"]
+        )
+        # Checked as a whole below instead of one add_furniture call at a time
+        room.restore_furniture(furniture)
+    
+    for index in room.out_of_bounds_furniture():
+        problems.append(f"{room.furniture[index].name} (id {room.furniture[index].id}) is outside the room")
+    for i, j in np.argwhere(np.triu(room.overlap_matrix())).tolist():
+        problems.append(f"{room.furniture[i].name} (id {room.furniture[i].id}) overlaps "
+                        f"{room.furniture[j].name} (id {room.furniture[j].id})")
     
+    if problems:
+        raise TemplateError(f"Invalid room template {name!r}: " + "; ".join(problems))
     return room
 
+# Validated once at import; loading a template copies the prebuilt room
+_COMPILED_TEMPLATES: Dict[str, Room] = {
+    name: compile_template(name, template) for name, template in ROOM_TEMPLATES.items()
+}
+
+_TEMPLATE_SNAPSHOTS: Dict[str, RoomSnapshot] = {
+    name: room.snapshot() for name, room in _COMPILED_TEMPLATES.items()
+}
+
+def load_room_template(template_name: str) -> Room:
+    """Load a room template by name."""
+    template = _COMPILED_TEMPLATES.get(template_name)
+    if template is None:
+        return Room()
+    return template.copy()
+
+def get_template_snapshot(template_name: str) -> RoomSnapshot:
+    """Get the immutable snapshot of a room template. Repeated calls return the same snapshot."""
+    snapshot = _TEMPLATE_SNAPSHOTS.get(template_name)
+    if snapshot is None:
+        return Room().snapshot()
+    return snapshot
+
 def get_room_template_names() -> List[str]:
     """Get a list of available room template names."""
-    return list(ROOM_TEMPLATES.keys())
\ No newline at end of file
+    return list(ROOM_TEMPLATES.keys())
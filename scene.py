@@ -0,0 +1,316 @@
+"""Backend-neutral 3D scene of a room.
+
+build_scene turns a Room into a few batched primitives (triangle meshes, line
+sets and labels) stored as NumPy arrays, in meters. Rendering backends such as
+scene_plotly only translate these primitives; they never look at the Room.
+"""
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from floor_mesh import build_floor_mesh
+from furniture import Furniture
+from room import Room
+from utils import get_wall_color_hex, get_floor_design_color
+
+DEFAULT_ROOM_HEIGHT = 2.5  # Wall height in meters
+FURNITURE_THICKNESS = 0.05  # Height of the furniture outline boxes in meters
+WALL_OPACITY = 0.95  # Slightly transparent to make it look like interior wall
+DOOR_OPACITY = 0.9
+DOOR_HEIGHT_RATIO = 0.8  # Door height as a fraction of the wall height
+LABEL_OFFSET = 0.1  # Distance of labels from walls / above furniture in meters
+
+class MeshPrimitive(NamedTuple):
+    """Triangle mesh with one color per face."""
+    name: str
+    vertices: np.ndarray  # (V, 3)
+    faces: np.ndarray  # (F, 3) vertex indices
+    face_colors: np.ndarray  # (F,) color strings
+    opacity: float = 1.0
+
+class LineSet(NamedTuple):
+    """Polylines of a single color. NaN rows in points separate the polylines."""
+    name: str
+    points: np.ndarray  # (P, 3)
+    color: str
+    width: float
+
+class LabelSet(NamedTuple):
+    """Text labels anchored at 3D positions."""
+    name: str
+    positions: np.ndarray  # (L, 3)
+    texts: Tuple[str, ...]
+
+class Scene(NamedTuple):
+    """All primitives needed to draw a room."""
+    meshes: Tuple[MeshPrimitive, ...]
+    lines: Tuple[LineSet, ...]
+    labels: Tuple[LabelSet, ...]
+
+_QUAD_FACES = np.array([[0, 1, 2], [0, 2, 3]])
+
+def _quads_mesh(name: str, quads: List[np.ndarray], colors: List[str], opacity: float = 1.0) -> MeshPrimitive:
+    """Build one mesh from (4, 3) quads, two triangles per quad."""
+    if not quads:
+        return MeshPrimitive(name, np.zeros((0, 3)), np.zeros((0, 3), dtype=int), np.array([], dtype=str), opacity)
+    vertices = np.concatenate(quads)
+    faces = (np.arange(len(quads)) * 4)[:, None, None] + _QUAD_FACES[None, :, :]
+    return MeshPrimitive(name, vertices, faces.reshape(-1, 3), np.repeat(colors, 2), opacity)
+
+def build_floor(room: Room) -> MeshPrimitive:
+    """Build the floor pattern mesh."""
+    floor_colors = get_floor_design_color(room.floor_design)
+    primary = floor_colors["primary"]
+    secondary = floor_colors.get("secondary", primary)
+    mesh = build_floor_mesh(room.width / 100, room.height / 100, room.floor_design, primary, secondary)
+    return MeshPrimitive("Floor", mesh.vertices, mesh.faces, mesh.face_colors)
+
+def build_walls(room: Room, room_height: float = DEFAULT_ROOM_HEIGHT) -> MeshPrimitive:
+    """Build the four walls (no ceiling) as one mesh."""
+    width_m = room.width / 100
+    height_m = room.height / 100
+    quads = [
+        # Left
+        np.array([[0, 0, 0], [0, height_m, 0], [0, height_m, room_height], [0, 0, room_height]]),
+        # Back
+        np.array([[0, 0, 0], [width_m, 0, 0], [width_m, 0, room_height], [0, 0, room_height]]),
+        # Right
+        np.array([[width_m, 0, 0], [width_m, height_m, 0], [width_m, height_m, room_height], [width_m, 0, room_height]]),
+        # Front
+        np.array([[0, height_m, 0], [width_m, height_m, 0], [width_m, height_m, room_height], [0, height_m, room_height]]),
+    ]
+    colors = [
+        get_wall_color_hex(getattr(room, 'left_wall_color', room.wall_color)),
+        get_wall_color_hex(getattr(room, 'back_wall_color', room.wall_color)),
+        get_wall_color_hex(getattr(room, 'right_wall_color', room.wall_color)),
+        get_wall_color_hex(getattr(room, 'front_wall_color', room.wall_color)),
+    ]
+    return _quads_mesh("Walls", [quad.astype(float) for quad in quads], colors, WALL_OPACITY)
+
+def resolve_wall_placement(furniture: Furniture, width_m: float, height_m: float) -> str:
+    """Get the wall a door or window is on, auto-detecting the nearest wall if needed."""
+    wall_placement = getattr(furniture, "wall", "Auto")
+    if wall_placement != "Auto":
+        return wall_placement
+
+    f_x = furniture.x / 100
+    f_y = furniture.y / 100
+    distance_to_left = f_x
+    distance_to_right = width_m - f_x
+    distance_to_back = f_y
+    distance_to_front = height_m - f_y
+    min_distance = min(distance_to_left, distance_to_right, distance_to_back, distance_to_front)
+
+    if min_distance == distance_to_left:
+        return "Left"
+    elif min_distance == distance_to_right:
+        return "Right"
+    elif min_distance == distance_to_back:
+        return "Back"
+    return "Front"
+
+def _wall_rectangle(wall_placement: str, f_x: float, f_y: float, f_width: float, f_height: float,
+                    width_m: float, height_m: float, z_bottom: float, z_top: float) -> np.ndarray:
+    """Get the (4, 3) corners of a rectangle lying on a wall."""
+    if wall_placement == "Left":
+        x_values, y_values = [0, 0, 0, 0], [f_y, f_y + f_height, f_y + f_height, f_y]
+    elif wall_placement == "Right":
+        x_values, y_values = [width_m] * 4, [f_y, f_y + f_height, f_y + f_height, f_y]
+    elif wall_placement == "Back":
+        x_values, y_values = [f_x, f_x + f_width, f_x + f_width, f_x], [0, 0, 0, 0]
+    else:  # Front
+        x_values, y_values = [f_x, f_x + f_width, f_x + f_width, f_x], [height_m] * 4
+    return np.column_stack([x_values, y_values, [z_bottom, z_bottom, z_top, z_top]]).astype(float)
+
+def _wall_label_position(wall_placement: str, f_x: float, f_y: float, f_width: float, f_height: float,
+                         width_m: float, height_m: float, room_height: float) -> Tuple[float, float, float]:
+    """Get the label position of a door or window, slightly offset from its wall."""
+    if wall_placement == "Left":
+        return -LABEL_OFFSET, f_y + f_height / 2, room_height / 2
+    elif wall_placement == "Right":
+        return width_m + LABEL_OFFSET, f_y + f_height / 2, room_height / 2
+    elif wall_placement == "Back":
+        return f_x + f_width / 2, -LABEL_OFFSET, room_height / 2
+    return f_x + f_width / 2, height_m + LABEL_OFFSET, room_height / 2
+
+def _furniture_outline(furniture: Furniture) -> np.ndarray:
+    """Get the outline of a furniture box as a polyline following its rotated footprint."""
+    corners = np.asarray(furniture.get_corners()) / 100
+    bottom = np.column_stack([corners, np.zeros(4)])
+    top = np.column_stack([corners, np.full(4, FURNITURE_THICKNESS)])
+    # Bottom face, top face, then the edges connecting them (same path as the original line boxes)
+    path = [
+        bottom[0], bottom[1], bottom[2], bottom[3], bottom[0],
+        top[0], top[1], top[2], top[3], top[0],
+        bottom[0], top[0], top[1], bottom[1],
+        bottom[1], top[1], top[3], bottom[3],
+        bottom[3], top[3], top[2], bottom[2],
+    ]
+    return np.array(path)
+
+class FurnitureGeometry3D(NamedTuple):
+    """3D primitives of one piece of furniture, before batching."""
+    kind: str  # "door", "window" or "box"
+    shape: np.ndarray  # Door quad (4, 3), window loop (5, 3) or box outline polyline
+    color: str
+    label_position: Tuple[float, float, float]
+    label: str
+
+def build_furniture_geometry(furniture: Furniture, room: Room,
+                             room_height: float = DEFAULT_ROOM_HEIGHT) -> FurnitureGeometry3D:
+    """Build the 3D primitives of one piece of furniture."""
+    width_m = room.width / 100
+    height_m = room.height / 100
+    f_width = furniture.width / 100 * furniture.scale
+    f_height = furniture.height / 100 * furniture.scale
+    f_x = furniture.x / 100
+    f_y = furniture.y / 100
+
+    is_door = furniture.item_id.startswith('door')
+    if is_door or furniture.item_id.startswith('window'):
+        wall_placement = resolve_wall_placement(furniture, width_m, height_m)
+        label_position = _wall_label_position(wall_placement, f_x, f_y, f_width, f_height,
+                                              width_m, height_m, room_height)
+        if is_door:
+            quad = _wall_rectangle(wall_placement, f_x, f_y, f_width, f_height, width_m, height_m,
+                                   0, room_height * DOOR_HEIGHT_RATIO)
+            return FurnitureGeometry3D("door", quad, furniture.color, label_position, furniture.name)
+
+        # Windows are drawn as a closed loop on the middle third of the wall
+        quad = _wall_rectangle(wall_placement, f_x, f_y, f_width, f_height, width_m, height_m,
+                               room_height / 3, 2 * room_height / 3)
+        loop = np.vstack([quad, quad[:1]])
+        return FurnitureGeometry3D("window", loop, furniture.color, label_position, furniture.name)
+
+    center_x, center_y = furniture.get_center()
+    label_position = (center_x / 100, center_y / 100, FURNITURE_THICKNESS + LABEL_OFFSET)
+    return FurnitureGeometry3D("box", _furniture_outline(furniture), furniture.color, label_position, furniture.name)
+
+def _line_set(name: str, color: str, shapes: List[np.ndarray], width: float) -> LineSet:
+    """Merge polylines into one NaN-separated line set."""
+    pieces = []
+    gap = np.full((1, 3), np.nan)
+    for shape in shapes:
+        if pieces:
+            pieces.append(gap)
+        pieces.append(shape)
+    return LineSet(name, np.concatenate(pieces), color, width)
+
+def _group_furniture(pieces: List[FurnitureGeometry3D]) -> Dict[Tuple[str, str], List[FurnitureGeometry3D]]:
+    """Group pieces into batches: all doors together, boxes and windows per color (boxes first)."""
+    groups: Dict[Tuple[str, str], List[FurnitureGeometry3D]] = {}
+    for piece in sorted(pieces, key=lambda piece: piece.kind == "window"):
+        key = (piece.kind, "") if piece.kind == "door" else (piece.kind, piece.color)
+        groups.setdefault(key, []).append(piece)
+    return groups
+
+def _batch_group(kind: str, color: str, pieces: List[FurnitureGeometry3D]) -> Union[MeshPrimitive, LineSet]:
+    """Batch a group of pieces into a single primitive."""
+    if kind == "door":
+        return _quads_mesh("Doors", [piece.shape for piece in pieces], [piece.color for piece in pieces], DOOR_OPACITY)
+    if kind == "window":
+        return _line_set("Windows", color, [piece.shape for piece in pieces], 6)
+    return _line_set("Furniture", color, [piece.shape for piece in pieces], 4)
+
+def _label_set(pieces: List[FurnitureGeometry3D]) -> LabelSet:
+    """Put the labels of all pieces into one label set."""
+    return LabelSet("Labels", np.array([piece.label_position for piece in pieces], dtype=float),
+                    tuple(piece.label for piece in pieces))
+
+def _split_batches(batches: List[Union[MeshPrimitive, LineSet]], labels: List[LabelSet]
+                   ) -> Tuple[List[MeshPrimitive], List[LineSet], List[LabelSet]]:
+    """Split batched primitives into meshes and line sets."""
+    meshes = [batch for batch in batches if isinstance(batch, MeshPrimitive)]
+    lines = [batch for batch in batches if isinstance(batch, LineSet)]
+    return meshes, lines, labels
+
+def assemble_furniture(pieces: List[FurnitureGeometry3D]) -> Tuple[List[MeshPrimitive], List[LineSet], List[LabelSet]]:
+    """Batch per-furniture primitives into one door mesh, line sets per color and one label set."""
+    batches = [_batch_group(kind, color, group) for (kind, color), group in _group_furniture(pieces).items()]
+    return _split_batches(batches, [_label_set(pieces)] if pieces else [])
+
+def _same_pieces(first: Tuple[FurnitureGeometry3D, ...], second: Tuple[FurnitureGeometry3D, ...]) -> bool:
+    """Check if two piece sequences hold the very same objects."""
+    return len(first) == len(second) and all(a is b for a, b in zip(first, second))
+
+class SceneBuilder:
+    """Builds room scenes incrementally, keeping each layer cached until its inputs change.
+
+    The floor is keyed by the room size and floor design, the walls by the room
+    size and wall colors, and each piece of furniture by its ID, geometry and
+    color. Batches of furniture are only re-merged when one of their pieces
+    changed. Unchanged layers are returned as the very same primitive objects,
+    so backends can reuse whatever they built from them.
+    """
+    def __init__(self, room_height: float = DEFAULT_ROOM_HEIGHT):
+        self.room_height = room_height
+        self.layer_builds = {"floor": 0, "walls": 0, "furniture": 0}
+        self._floor: Optional[Tuple[Hashable, MeshPrimitive]] = None
+        self._walls: Optional[Tuple[Hashable, MeshPrimitive]] = None
+        self._furniture: Dict[int, Tuple[Hashable, FurnitureGeometry3D]] = {}
+        self._batches: Dict[Tuple[str, str], Tuple[Tuple[FurnitureGeometry3D, ...], Union[MeshPrimitive, LineSet]]] = {}
+        self._labels: Optional[Tuple[Tuple[FurnitureGeometry3D, ...], LabelSet]] = None
+    
+    def _furniture_key(self, furniture: Furniture, room: Room) -> Hashable:
+        """Get everything a piece's 3D primitives depend on."""
+        key = (furniture.item_id, furniture.name, furniture.color, furniture.wall,
+               furniture.x, furniture.y, furniture.width, furniture.height, furniture.rotation, furniture.scale)
+        if furniture.item_id.startswith('door') or furniture.item_id.startswith('window'):
+            # Doors and windows are placed relative to the walls
+            key += (room.width, room.height)
+        return key
+    
+    def _assemble(self, pieces: List[FurnitureGeometry3D]) -> Tuple[List[MeshPrimitive], List[LineSet], List[LabelSet]]:
+        """Batch the pieces, reusing batches whose pieces did not change."""
+        batches = {}
+        for (kind, color), group in _group_furniture(pieces).items():
+            group = tuple(group)
+            cached = self._batches.get((kind, color))
+            if cached is None or not _same_pieces(cached[0], group):
+                cached = (group, _batch_group(kind, color, list(group)))
+            batches[(kind, color)] = cached
+        self._batches = batches
+        
+        if not pieces:
+            self._labels = None
+        elif self._labels is None or not _same_pieces(self._labels[0], tuple(pieces)):
+            self._labels = (tuple(pieces), _label_set(pieces))
+        
+        return _split_batches([batch for _, batch in batches.values()],
+                              [self._labels[1]] if self._labels else [])
+    
+    def build(self, room: Room) -> Scene:
+        """Build the scene of a room, rebuilding only the layers that changed since the last call."""
+        floor_key = (room.width, room.height, room.floor_design)
+        if self._floor is None or self._floor[0] != floor_key:
+            self._floor = (floor_key, build_floor(room))
+            self.layer_builds["floor"] += 1
+        
+        walls_key = (room.width, room.height, room.wall_color, getattr(room, 'left_wall_color', None),
+                     getattr(room, 'back_wall_color', None), getattr(room, 'right_wall_color', None),
+                     getattr(room, 'front_wall_color', None))
+        if self._walls is None or self._walls[0] != walls_key:
+            self._walls = (walls_key, build_walls(room, self.room_height))
+            self.layer_builds["walls"] += 1
+        
+        furniture_layers = {}
+        for furniture in room.furniture:
+            key = self._furniture_key(furniture, room)
+            layer = self._furniture.get(furniture.id)
+            if layer is None or layer[0] != key:
+                layer = (key, build_furniture_geometry(furniture, room, self.room_height))
+                self.layer_builds["furniture"] += 1
+            furniture_layers[furniture.id] = layer
+        # Replacing the dict also drops layers of removed furniture
+        self._furniture = furniture_layers
+        
+        furniture_meshes, lines, labels = self._assemble([piece for _, piece in furniture_layers.values()])
+        return Scene(
+            meshes=(self._floor[1], self._walls[1], *furniture_meshes),
+            lines=tuple(lines),
+            labels=tuple(labels)
+        )
+
+def build_scene(room: Room, room_height: float = DEFAULT_ROOM_HEIGHT) -> Scene:
+    """Build the full scene of a room from scratch."""
+    return SceneBuilder(room_height).build(room)
@@ -0,0 +1,188 @@
+"""Plotly backend for scene.Scene."""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+import plotly.graph_objects as go
+
+from room import Room
+from scene import Scene, MeshPrimitive, LineSet, LabelSet, SceneBuilder
+
+FIGURE_HEIGHT = 700  # Make the 3D visualization larger
+FIGURE_CACHE_SIZE = 32  # Number of figures kept by the shared figure cache
+
+PrimitiveType = Union[MeshPrimitive, LineSet, LabelSet]
+
+def mesh_trace(mesh: MeshPrimitive) -> go.Mesh3d:
+    """Convert a mesh primitive to a Mesh3d trace."""
+    return go.Mesh3d(
+        x=mesh.vertices[:, 0],
+        y=mesh.vertices[:, 1],
+        z=mesh.vertices[:, 2],
+        i=mesh.faces[:, 0],
+        j=mesh.faces[:, 1],
+        k=mesh.faces[:, 2],
+        facecolor=mesh.face_colors,
+        opacity=mesh.opacity,
+        flatshading=True,
+        name=mesh.name
+    )
+
+def line_trace(line_set: LineSet) -> go.Scatter3d:
+    """Convert a line set to a Scatter3d line trace."""
+    return go.Scatter3d(
+        x=line_set.points[:, 0],
+        y=line_set.points[:, 1],
+        z=line_set.points[:, 2],
+        mode='lines',
+        line=dict(color=line_set.color, width=line_set.width),
+        name=line_set.name
+    )
+
+def label_trace(label_set: LabelSet) -> go.Scatter3d:
+    """Convert a label set to a Scatter3d text trace."""
+    return go.Scatter3d(
+        x=label_set.positions[:, 0],
+        y=label_set.positions[:, 1],
+        z=label_set.positions[:, 2],
+        mode='text',
+        text=list(label_set.texts),
+        textposition='top center',
+        textfont=dict(
+            size=12,
+            color='black'
+        ),
+        name=label_set.name
+    )
+
+def scene_traces(scene: Scene) -> List[Union[go.Mesh3d, go.Scatter3d]]:
+    """Convert every primitive in a scene to a Plotly trace."""
+    return ([mesh_trace(mesh) for mesh in scene.meshes] +
+            [line_trace(line_set) for line_set in scene.lines] +
+            [label_trace(label_set) for label_set in scene.labels])
+
+def figure_layout(camera_eye: Tuple[float, float, float]) -> go.Layout:
+    """Build the layout of a room figure viewed from the given camera position."""
+    camera_x, camera_y, camera_z = camera_eye
+    return go.Layout(
+        scene=dict(
+            xaxis=dict(showticklabels=False, title=""),
+            yaxis=dict(showticklabels=False, title=""),
+            zaxis=dict(showticklabels=False, title=""),
+            aspectmode='data',
+            camera=dict(
+                eye=dict(x=camera_x, y=camera_y, z=camera_z),
+                up=dict(x=0, y=0, z=1)
+            )
+        ),
+        margin=dict(l=0, r=0, b=0, t=0),
+        height=FIGURE_HEIGHT
+    )
+
+def build_figure(scene: Scene, camera_eye: Tuple[float, float, float],
+                 traces: Optional[List[Union[go.Mesh3d, go.Scatter3d]]] = None) -> go.Figure:
+    """Build the 3D room figure viewed from the given camera position.
+    Pass traces to reuse already converted primitives of the scene.
+
+    The traces and the layout were validated when they were built, so the figure
+    copies them without validating them again. Figures are meant to be shown as
+    they are; later updates to them are not validated either.
+    """
+    if traces is None:
+        traces = scene_traces(scene)
+    return go.Figure(data=traces, layout=figure_layout(camera_eye), _validate=False)
+
+
+class FigureBuilder:
+    """Builds room figures incrementally for one editing session.
+
+    Scene layers that did not change since the previous build keep their
+    primitive objects, and their already converted traces are reused. Building
+    the figure still copies every trace, but without validating it again.
+    """
+    def __init__(self, scene_builder: Optional[SceneBuilder] = None):
+        self.scene_builder = scene_builder or SceneBuilder()
+        # Traces keyed by id() of the primitive they were built from; the primitive is kept alive alongside
+        self._traces: Dict[int, Tuple[PrimitiveType, Union[go.Mesh3d, go.Scatter3d]]] = {}
+    
+    def _trace(self, primitive: PrimitiveType, convert) -> Union[go.Mesh3d, go.Scatter3d]:
+        cached = self._traces.get(id(primitive))
+        if cached is not None and cached[0] is primitive:
+            return cached[1]
+        trace = convert(primitive)
+        self._traces[id(primitive)] = (primitive, trace)
+        return trace
+    
+    def traces(self, scene: Scene) -> List[Union[go.Mesh3d, go.Scatter3d]]:
+        """Get the traces of a scene, converting only the layers that changed since the last call."""
+        traces = ([self._trace(mesh, mesh_trace) for mesh in scene.meshes] +
+                  [self._trace(line_set, line_trace) for line_set in scene.lines] +
+                  [self._trace(label_set, label_trace) for label_set in scene.labels])
+        
+        # Forget traces of layers that are no longer in the scene
+        live_ids = {id(primitive) for primitive in (*scene.meshes, *scene.lines, *scene.labels)}
+        self._traces = {key: value for key, value in self._traces.items() if key in live_ids}
+        return traces
+    
+    def build(self, room: Room, camera_eye: Tuple[float, float, float]) -> go.Figure:
+        """Build the figure of a room, converting only the scene layers that changed."""
+        scene = self.scene_builder.build(room)
+        return build_figure(scene, camera_eye, self.traces(scene))
+
+class FigureCache:
+    """Bounded LRU cache of room figures keyed by the room content hash and camera.
+
+    Figures are shared between callers and must not be modified. The cache is
+    safe to use from several Streamlit sessions at once.
+    """
+    def __init__(self, max_entries: int = FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._figures: "OrderedDict[Hashable, go.Figure]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._figures)
+    
+    def get_figure(self, room: Room, camera_eye: Tuple[float, float, float],
+                   figure_builder: Optional[FigureBuilder] = None) -> go.Figure:
+        """Get the figure of a room, building it only if this room and camera were not seen recently.
+        On a miss, figure_builder (if given) rebuilds only the layers that changed."""
+        key = (room.content_hash(), tuple(camera_eye))
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return fig
+            self.misses += 1
+        
+        # Build outside the lock so other sessions are not blocked
+        if figure_builder is None:
+            figure_builder = FigureBuilder()
+        fig = figure_builder.build(room, camera_eye)
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig
+    
+    def clear(self) -> None:
+        """Drop all cached figures."""
+        with self._lock:
+            self._figures.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and the current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._figures)}
+
+# Shared by every session of the app, since imported modules survive Streamlit reruns
+_figure_cache = FigureCache()
+
+def get_room_figure(room: Room, camera_eye: Tuple[float, float, float],
+                    figure_builder: Optional[FigureBuilder] = None) -> go.Figure:
+    """Get the figure of a room from the shared figure cache."""
+    return _figure_cache.get_figure(room, camera_eye, figure_builder)
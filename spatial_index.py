@@ -0,0 +1,115 @@
+import math
+from typing import Dict, Hashable, Iterator, List, Set, Tuple
+
+BoundingBox = Tuple[float, float, float, float]  # (min_x, min_y, max_x, max_y)
+
+class SpatialGrid:
+    """Uniform grid of axis-aligned bounding boxes for broad-phase queries.
+
+    Every entry is registered in each cell its bounding box touches, so overlap
+    and point queries only look at entries stored in nearby cells. Query results
+    are returned in insertion order so callers can keep "first added wins" or
+    "topmost first" semantics without scanning everything.
+    """
+    def __init__(self, cell_size: float = 100.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._boxes: Dict[Hashable, BoundingBox] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._boxes
+
+    def _cell_range(self, box: BoundingBox) -> Iterator[Tuple[int, int]]:
+        """Yield the grid cells covered by a bounding box."""
+        min_x, min_y, max_x, max_y = box
+        first_col = math.floor(min_x / self.cell_size)
+        last_col = math.floor(max_x / self.cell_size)
+        first_row = math.floor(min_y / self.cell_size)
+        last_row = math.floor(max_y / self.cell_size)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                yield col, row
+
+    def insert(self, key: Hashable, box: BoundingBox) -> None:
+        """Add an entry, replacing any existing entry with the same key."""
+        if key in self._boxes:
+            self.update(key, box)
+            return
+        self._boxes[key] = box
+        self._order[key] = self._next_order
+        self._next_order += 1
+        for cell in self._cell_range(box):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove an entry. Returns False if the key was not indexed."""
+        box = self._boxes.pop(key, None)
+        if box is None:
+            return False
+        del self._order[key]
+        for cell in self._cell_range(box):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+        return True
+
+    def update(self, key: Hashable, box: BoundingBox) -> None:
+        """Move an entry to a new bounding box, keeping its insertion order."""
+        old_box = self._boxes.get(key)
+        if old_box is None:
+            self.insert(key, box)
+            return
+        if old_box == box:
+            return
+        old_cells = set(self._cell_range(old_box))
+        new_cells = set(self._cell_range(box))
+        for cell in old_cells - new_cells:
+            bucket = self._cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+        for cell in new_cells - old_cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._boxes[key] = box
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._cells.clear()
+        self._boxes.clear()
+        self._order.clear()
+        self._next_order = 0
+
+    def get_box(self, key: Hashable) -> BoundingBox:
+        """Get the indexed bounding box for a key."""
+        return self._boxes[key]
+
+    def query(self, box: BoundingBox) -> List[Hashable]:
+        """Get keys whose bounding boxes intersect the given box (edges touching count)."""
+        min_x, min_y, max_x, max_y = box
+        candidates: Set[Hashable] = set()
+        for cell in self._cell_range(box):
+            bucket = self._cells.get(cell)
+            if bucket:
+                candidates.update(bucket)
+
+        hits = []
+        for key in candidates:
+            e_min_x, e_min_y, e_max_x, e_max_y = self._boxes[key]
+            if (min_x <= e_max_x and max_x >= e_min_x and
+                min_y <= e_max_y and max_y >= e_min_y):
+                hits.append(key)
+        hits.sort(key=self._order.__getitem__)
+        return hits
+
+    def query_point(self, x: float, y: float) -> List[Hashable]:
+        """Get keys whose bounding boxes contain the given point."""
+        return self.query((x, y, x, y))
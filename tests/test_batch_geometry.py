@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+import assets.furniture_items  # Registers the catalog
+import batch_geometry
+from furniture import Furniture, FurnitureArray, get_furniture_item_by_id
+
+
+def _random_furniture(seed, count=60):
+    rng = random.Random(seed)
+    pieces = []
+    for index in range(count):
+        item = get_furniture_item_by_id(rng.choice(["armchair", "plant", "desk", "rug_round", "door_single"]))
+        piece = Furniture(item.id, item.name, item.width, item.height, rng.uniform(-50, 450), rng.uniform(-50, 350),
+                          item.default_color, rotation=rng.choice([0, 15, 45, 90, 200]),
+                          scale=rng.choice([0.5, 1.0, 1.25]), id=index + 1)
+        piece.item = item
+        pieces.append(piece)
+    return pieces
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_corners_and_boxes_match_the_per_object_geometry(seed):
+    pieces = _random_furniture(seed)
+    arrays = batch_geometry.furniture_arrays(pieces)
+    assert np.allclose(batch_geometry.corners(arrays), [piece.get_corners() for piece in pieces])
+    assert np.allclose(batch_geometry.bounding_boxes(arrays), [piece.get_bounding_box() for piece in pieces])
+
+
+def test_column_storage_gives_the_same_view():
+    pieces = _random_furniture(1)
+    from_objects = batch_geometry.furniture_arrays(pieces)
+    from_columns = batch_geometry.furniture_arrays(FurnitureArray.from_furniture(pieces))
+    for name, column in from_objects._asdict().items():
+        assert np.array_equal(column, getattr(from_columns, name), equal_nan=column.dtype.kind == "f"), name
+
+
+def test_out_of_bounds_allows_rounding_noise():
+    against_wall = Furniture("desk", "Desk", 100, 50, 0, 0, "#000000", rotation=180)
+    outside = Furniture("desk", "Desk", 100, 50, 450, 0, "#000000", rotation=90)
+    inside = Furniture("desk", "Desk", 100, 50, 200, 200, "#000000", rotation=45)
+    arrays = batch_geometry.furniture_arrays([against_wall, outside, inside])
+    assert batch_geometry.out_of_bounds(arrays, 500, 400).tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_hit_test_matches_contains_point(seed):
+    pieces = _random_furniture(seed, count=30)
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-50, 500, size=(200, 2))
+    expected = [[piece.contains_point(x, y) for piece in pieces] for x, y in points]
+    assert batch_geometry.hit_test(batch_geometry.furniture_arrays(pieces), points).tolist() == expected
+
+
+def test_cross_and_paired_overlap_agree_with_the_matrix():
+    pieces = _random_furniture(4, count=40)
+    arrays = batch_geometry.furniture_arrays(pieces)
+    columns_by_name = arrays._asdict()
+    rows = batch_geometry.FurnitureArrays(**{name: column[:15] for name, column in columns_by_name.items()})
+    columns = batch_geometry.FurnitureArrays(**{name: column[15:] for name, column in columns_by_name.items()})
+    cross = batch_geometry.cross_overlap(rows, columns)
+    # cross_overlap ignores collidability, overlap_matrix does not
+    collidable = arrays.collidable[:15, None] & arrays.collidable[None, 15:]
+    assert np.array_equal(cross & collidable, batch_geometry.overlap_matrix(arrays)[:15, 15:])
+
+    row_index, column_index = np.indices(cross.shape).reshape(2, -1)
+    paired = batch_geometry.paired_overlap(
+        batch_geometry.FurnitureArrays(**{name: column[row_index] for name, column in rows._asdict().items()}),
+        batch_geometry.FurnitureArrays(**{name: column[column_index] for name, column in columns._asdict().items()}))
+    assert np.array_equal(paired, cross.ravel())
@@ -0,0 +1,64 @@
+import pytest
+
+from catalog import Catalog, get_catalog
+from furniture import FurnitureItem
+
+
+def _item(item_id, name, width, height, category="Test"):
+    return FurnitureItem(id=item_id, name=name, category=category, width=width, height=height,
+                         default_color="#000000", available_colors=["#000000"])
+
+
+def test_catalog_cannot_be_changed():
+    catalog = get_catalog()
+    with pytest.raises(AttributeError):
+        catalog._items = ()
+    with pytest.raises(AttributeError):
+        del catalog._items
+    with pytest.raises(AttributeError):
+        del catalog._by_id
+    assert len(catalog) > 0
+
+
+def test_catalog_items_cannot_be_changed():
+    item = get_catalog().get("plant")
+    assert isinstance(item.available_colors, tuple)
+    with pytest.raises(AttributeError):
+        item.available_colors = ["#FFFFFF"]
+    with pytest.raises(AttributeError):
+        item.available_colors.append("#FFFFFF")
+
+
+@pytest.mark.parametrize("min_width, max_width, min_height, max_height", [
+    (0, 1000, 40, 40),  # Narrow height range, filtered by width
+    (45, 45, 0, 1000),  # Narrow width range, filtered by height
+    (50, 120, 30, 90),
+    (300, 1000, 300, 1000),
+])
+def test_items_in_range_matches_a_linear_scan(min_width, max_width, min_height, max_height):
+    catalog = get_catalog()
+    expected = [item for item in catalog
+                if min_width <= item.width <= max_width and min_height <= item.height <= max_height]
+    assert list(catalog.items_in_range(min_width, max_width, min_height, max_height)) == expected
+
+
+def test_items_fitting_matches_a_linear_scan():
+    catalog = get_catalog()
+    for width, height in [(50, 50), (80, 60), (100, 200), (250, 120)]:
+        fitting = [item for item in catalog if item.width <= width and item.height <= height]
+        assert list(catalog.items_fitting(width, height)) == fitting
+        turned = [item for item in catalog
+                  if (item.width <= width and item.height <= height) or
+                  (item.width <= height and item.height <= width)]
+        assert list(catalog.items_fitting(width, height, allow_rotation=True)) == turned
+
+
+def test_shared_names_keep_their_own_ids():
+    catalog = Catalog([_item("a", "Table", 10, 10, "Kitchen"), _item("b", "Table", 20, 20, "Office")])
+    assert catalog.id_for_name("Table") == "a"
+    assert [item.id for item in catalog.items_in_category("Office")] == ["b"]
+
+
+def test_duplicate_ids_are_rejected():
+    with pytest.raises(ValueError):
+        Catalog([_item("a", "One", 10, 10), _item("a", "Two", 20, 20)])
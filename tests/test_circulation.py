@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+import assets.furniture_items  # Registers the catalog
+from circulation import (CIRCULATION_RESOLUTION, WALKWAY_WIDTH, CirculationAnalyzer, analyze_circulation,
+                         distance_transform)
+from furniture import Furniture
+from room import Room
+
+
+def _divided_room(gap):
+    """A room split by a divider from the back wall, leaving a gap of the given width at the front."""
+    room = Room(500, 400)
+    room.add_furniture(Furniture("door_single", "Single Door", 80, 20, -30, 180, "#8B4513", rotation=90))
+    room.add_furniture(Furniture("wardrobe", "Divider", 20, 400 - gap, 240, 0, "#FFFFFF"))
+    room.add_furniture(Furniture("armchair", "Near Chair", 60, 60, 100, 50, "#FFFFFF"))
+    room.add_furniture(Furniture("armchair", "Far Chair", 60, 60, 400, 50, "#FFFFFF"))
+    return room
+
+
+def _access(report, name):
+    return next(item for item in report.items if item.name == name)
+
+
+def _brute_force_distance(obstacles):
+    rows, cols = obstacles.shape
+    # Obstacle centers, including the ring of wall cells around the grid
+    points = np.array([(row, col) for row in range(-1, rows + 1) for col in range(-1, cols + 1)
+                       if not (0 <= row < rows and 0 <= col < cols) or obstacles[row, col]])
+    row_index, col_index = np.indices(obstacles.shape)
+    squared = (row_index[..., None] - points[:, 0]) ** 2 + (col_index[..., None] - points[:, 1]) ** 2
+    return np.sqrt(squared.min(axis=-1))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 6), (6, 1), (9, 7), (23, 31)])
+@pytest.mark.parametrize("density", [0.0, 0.1, 0.5, 1.0])
+def test_distance_transform_matches_brute_force(shape, density):
+    obstacles = np.random.default_rng(len(shape) + shape[0] * 31 + shape[1]).random(shape) < density
+    assert np.allclose(distance_transform(obstacles), _brute_force_distance(obstacles))
+
+
+def test_furniture_behind_a_closed_divider_is_blocked():
+    report = analyze_circulation(_divided_room(0))
+    assert [item.name for item in report.blocked] == ["Far Chair"]
+    assert _access(report, "Far Chair").access_width == 0
+    assert _access(report, "Near Chair").reachable
+
+
+def test_a_narrow_gap_blocks_and_a_wide_gap_does_not():
+    narrow = _access(analyze_circulation(_divided_room(40)), "Far Chair")
+    assert 0 < narrow.access_width < WALKWAY_WIDTH
+    assert not narrow.reachable
+
+    report = analyze_circulation(_divided_room(100))
+    wide = _access(report, "Far Chair")
+    assert wide.reachable
+    # The widest route to the far chair is limited by the gap, up to one grid cell
+    assert abs(wide.access_width - 100) <= CIRCULATION_RESOLUTION
+    assert report.min_corridor_width == wide.access_width
+    assert not report.blocked
+
+
+def test_rooms_without_doors_are_not_analyzed(monkeypatch):
+    room = _divided_room(100)
+    room.remove_furniture(room.furniture[0].id)
+    analyzer = CirculationAnalyzer()
+
+    def fail(room):
+        raise AssertionError("fields computed for a room without doors")
+
+    monkeypatch.setattr(analyzer, "fields", fail)
+    report = analyzer.analyze(room)
+    assert report.door_count == 0
+    assert report.items == []
+    assert report.min_corridor_width is None
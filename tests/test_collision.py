@@ -0,0 +1,87 @@
+import math
+import random
+
+import assets.furniture_items  # Registers the catalog
+import batch_geometry
+from collision import circle_radius, find_first_overlap, furniture_overlap, is_collidable
+from furniture import Furniture, get_furniture_item_by_id
+
+
+def _piece(item_id, width, height, x, y, rotation=0, scale=1.0):
+    furniture = Furniture(item_id, item_id, width, height, x, y, "#000000", rotation=rotation, scale=scale)
+    furniture.item = get_furniture_item_by_id(item_id)
+    return furniture
+
+
+def _diamond(center_x, center_y, size=100):
+    """A size x size square turned by 45 degrees around the given center."""
+    return _piece("desk", size, size, center_x - size / 2, center_y - size / 2, rotation=45)
+
+
+def test_rectangles_touching_edges_overlap():
+    assert furniture_overlap(_piece("desk", 100, 50, 0, 0), _piece("desk", 100, 50, 100, 0))
+    assert not furniture_overlap(_piece("desk", 100, 50, 0, 0), _piece("desk", 100, 50, 100.5, 0))
+
+
+def test_rotated_rectangle_touching_a_rectangle_overlaps():
+    half_diagonal = 50 * math.sqrt(2)
+    # The left corner of the diamond touches the right edge of the box
+    diamond = _diamond(100 + half_diagonal - 1e-9, 50)
+    assert furniture_overlap(_piece("desk", 100, 100, 0, 0), diamond)
+
+
+def test_rotated_rectangle_separated_inside_bounding_box():
+    half_diagonal = 50 * math.sqrt(2)
+    # Near the box's corner the diamond's bounding box overlaps, but its edge passes outside
+    diamond = _diamond(100 + half_diagonal / 2 + 5, 100 + half_diagonal / 2 + 5)
+    box = _piece("desk", 100, 100, 0, 0)
+    min_x, min_y, _, _ = diamond.get_bounding_box()
+    assert min_x < 100 and min_y < 100
+    assert not furniture_overlap(box, diamond)
+    assert furniture_overlap(box, _diamond(100 + half_diagonal / 2 - 5, 100 + half_diagonal / 2 - 5))
+
+
+def test_circle_against_rectangle_corner():
+    box = _piece("desk", 100, 100, 0, 0)
+    radius = 20
+    for distance, expected in ((radius + 1, False), (radius - 1, True)):
+        offset = distance / math.sqrt(2)
+        plant = _piece("plant", 40, 40, 100 + offset - radius, 100 + offset - radius)
+        assert circle_radius(plant) == radius
+        assert furniture_overlap(box, plant) is expected
+        assert furniture_overlap(plant, box) is expected
+
+
+def test_stretched_circle_is_a_rectangle():
+    box = _piece("desk", 100, 100, 0, 0)
+    # 21 cm from the corner diagonally: clear of a circle, but inside the stretched item's box
+    offset = 21 / math.sqrt(2)
+    stretched = _piece("plant", 40, 42, 100 + offset - 20, 100 + offset - 20)
+    assert circle_radius(stretched) is None
+    assert furniture_overlap(box, stretched)
+
+
+def test_doors_windows_and_rugs_never_collide():
+    assert not is_collidable("door_single")
+    assert not is_collidable("window")
+    assert not is_collidable("rug_round")
+    table = _piece("coffee_table", 100, 60, 0, 0)
+    rug = _piece("rug_rectangular", 200, 150, 0, 0)
+    assert find_first_overlap(table, [rug]) is None
+    assert find_first_overlap(rug, [table]) is None
+
+
+def test_find_first_overlap_agrees_with_overlap_matrix():
+    rng = random.Random(4)
+    items = [("desk", 120, 60), ("plant", 40, 40), ("armchair", 80, 80), ("plant", 50, 30), ("rug_round", 120, 120)]
+    pieces = []
+    for _ in range(120):
+        item_id, width, height = rng.choice(items)
+        pieces.append(_piece(item_id, width, height, rng.uniform(0, 900), rng.uniform(0, 900),
+                             rotation=rng.choice([0, 15, 45, 90, 130]), scale=rng.choice([0.8, 1.0, 1.3])))
+    matrix = batch_geometry.overlap_matrix(batch_geometry.furniture_arrays(pieces))
+    for i, piece in enumerate(pieces):
+        for j, other in enumerate(pieces):
+            if i != j:
+                assert (find_first_overlap(piece, [other]) is not None) == matrix[i, j], (i, j)
+    assert matrix.any() and not matrix.all()
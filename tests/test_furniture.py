@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from furniture import Furniture
+
+
+def _table():
+    return Furniture("coffee_table", "Coffee Table", 100, 60, 200, 100, "#D2B48C")
+
+
+def test_geometry_is_cached_until_it_changes():
+    table = _table()
+    geometry = table.get_geometry()
+    assert table.get_geometry() is geometry
+    assert table.get_center() == (250, 130)
+    assert table.get_bounding_box() == (200, 100, 300, 160)
+    # Non-geometric attributes keep the cache
+    table.color = "#000000"
+    table.name = "Side Table"
+    assert table.get_geometry() is geometry
+
+
+@pytest.mark.parametrize("attribute, value", [("x", 50), ("y", 50), ("width", 80), ("height", 80),
+                                              ("rotation", 30), ("scale", 1.5)])
+def test_geometric_writes_invalidate_the_cache(attribute, value):
+    table = _table()
+    expected = Furniture.from_dict({**table.to_dict(), attribute: value}).get_geometry()
+    geometry = table.get_geometry()
+    version = table.geometry_version
+    setattr(table, attribute, value)
+    assert table.geometry_version == version + 1
+    assert table.get_geometry() is not geometry
+    assert table.get_geometry() == expected
+
+
+def test_rotated_corners_and_bounding_box():
+    table = _table()
+    table.rotation = 90
+    # A quarter turn about the center swaps the extents
+    min_x, min_y, max_x, max_y = table.get_bounding_box()
+    assert (min_x, min_y, max_x, max_y) == pytest.approx((220, 80, 280, 180))
+    assert table.get_geometry().sin == pytest.approx(1)
+    assert table.contains_point(250, 175)
+    assert not table.contains_point(290, 130)
+    table.rotation = 45
+    reach = (50 + 30) / math.sqrt(2)
+    assert table.get_bounding_box() == pytest.approx((250 - reach, 130 - reach, 250 + reach, 130 + reach))
+
+
+def test_copies_share_geometry_until_either_changes():
+    table = _table()
+    geometry = table.get_geometry()
+    copy = table.copy()
+    assert copy.get_geometry() is geometry
+    copy.x = 0
+    assert copy.get_bounding_box() == (0, 100, 100, 160)
+    assert table.get_bounding_box() == (200, 100, 300, 160)
@@ -0,0 +1,132 @@
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture
+from history import (AddFurniture, RemoveFurniture, ReplaceRoom, SetFurnitureAttributes,
+                     SetRoomAttributes, UndoHistory)
+from room import Room
+from room_templates import get_template_snapshot
+
+
+def _room_with_three_pieces():
+    room = Room(600, 500)
+    for x in (0, 150, 300):
+        room.add_furniture(Furniture("armchair", "Armchair", 80, 80, x, 0, "#A52A2A"))
+    return room
+
+
+def _state(room):
+    return room.to_dict()
+
+
+def test_undo_and_redo_of_an_add_restore_id_and_counter():
+    room = _room_with_three_pieces()
+    history = UndoHistory()
+    before = _state(room)
+    piece = Furniture("plant", "Plant", 40, 40, 400, 300, "#228B22")
+    room.add_furniture(piece)
+    history.record(AddFurniture.from_furniture(piece))
+    after = _state(room)
+
+    room = history.undo(room)
+    assert _state(room) == before
+    assert room.get_furniture_by_id(piece.id) is None
+    room = history.redo(room)
+    assert _state(room) == after
+    assert room.furniture[-1].id == piece.id
+
+
+def test_undo_of_a_remove_puts_the_piece_back_at_its_index():
+    room = _room_with_three_pieces()
+    history = UndoHistory()
+    before = _state(room)
+    middle = room.furniture[1]
+    history.record(RemoveFurniture.from_furniture(room, middle))
+    room.remove_furniture(middle.id)
+    after = _state(room)
+
+    room = history.undo(room)
+    assert _state(room) == before
+    assert [furniture.id for furniture in room.furniture] == [1, 2, 3]
+    assert room.next_furniture_id == 4
+    room = history.redo(room)
+    assert _state(room) == after
+
+
+def test_undo_and_redo_of_attribute_changes():
+    room = _room_with_three_pieces()
+    history = UndoHistory()
+    before = _state(room)
+    piece = room.furniture[0]
+    operation = SetFurnitureAttributes(piece.id, {"x": piece.x, "color": piece.color}, {"x": 10, "color": "#000000"})
+    room = operation.apply(room)
+    history.record(operation)
+    history.record(SetRoomAttributes.capture(room, {"wall_color": "Beige"}))
+    room.wall_color = "Beige"
+    after = _state(room)
+
+    room = history.undo(history.undo(room))
+    assert _state(room) == before
+    room = history.redo(history.redo(room))
+    assert _state(room) == after
+    assert room.get_furniture_by_id(piece.id).x == 10
+
+
+def test_undo_of_a_replacement_restores_the_old_room():
+    room = _room_with_three_pieces()
+    history = UndoHistory()
+    before = _state(room)
+    operation = ReplaceRoom(room.snapshot(), get_template_snapshot("Living Room"))
+    room = operation.apply(room)
+    history.record(operation)
+    after = _state(room)
+
+    room = history.undo(room)
+    assert _state(room) == before
+    room = history.redo(room)
+    assert _state(room) == after
+
+
+def test_recording_clears_redo():
+    room = _room_with_three_pieces()
+    history = UndoHistory()
+    history.record(SetRoomAttributes.capture(room, {"wall_color": "Beige"}))
+    history.undo(room)
+    assert history.can_redo()
+    history.record(SetRoomAttributes.capture(room, {"wall_color": "Cream"}))
+    assert not history.can_redo()
+    assert len(history) == 1
+
+
+def test_oldest_operations_are_dropped_over_budget():
+    room = _room_with_three_pieces()
+    one = SetFurnitureAttributes(1, {"x": 0}, {"x": 5})
+    history = UndoHistory(max_bytes=3 * one.size_estimate())
+    for step in range(10):
+        history.record(SetFurnitureAttributes(1, {"x": step}, {"x": step + 1}))
+    assert len(history) == 3
+    assert history.size_bytes <= history.max_bytes
+    history.clear()
+    assert history.size_bytes == 0
+
+
+def test_shared_snapshot_records_are_counted_once():
+    room = Room(2000, 2000)
+    for index in range(100):
+        room.add_furniture(Furniture("plant", "Plant", 40, 40, (index % 10) * 100, (index // 10) * 100, "#228B22"))
+    first = room.snapshot()
+    room.update_furniture_position(1, 1500, 1500)
+    second = room.snapshot()
+    third = Room.from_snapshot(first).snapshot()
+
+    history = UndoHistory(max_bytes=None)
+    history.record(ReplaceRoom(first, second))
+    size_after_one = history.size_bytes
+    history.record(ReplaceRoom(second, third))
+    # The second replacement only adds its own overhead, not another 200 records
+    assert history.size_bytes - size_after_one < ReplaceRoom(second, third).size_estimate() + 1000
+
+    # Dropping operations releases the records no other operation holds
+    latest = SetRoomAttributes({"wall_color": "White"}, {"wall_color": "Beige"})
+    history.max_bytes = latest.size_estimate()
+    history.record(latest)
+    assert len(history) == 1
+    assert history.size_bytes == latest.size_estimate()
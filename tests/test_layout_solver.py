@@ -0,0 +1,35 @@
+import threading
+
+import assets.furniture_items  # Registers the catalog
+from layout_solver import get_solver_pool, solve_layout_parallel
+from room import Room
+
+ITEMS = ["sofa_3seater", "armchair", "coffee_table", "plant"]
+
+
+def test_same_seed_gives_same_layout_for_any_pool():
+    room = Room(600, 500)
+    in_process = solve_layout_parallel(room, ITEMS, restarts=3, workers=1, seed=3, max_iterations=2000)
+    own_pool = solve_layout_parallel(room, ITEMS, restarts=3, workers=3, seed=3, max_iterations=2000)
+    shared_pool = solve_layout_parallel(room, ITEMS, restarts=3, seed=3, max_iterations=2000)
+    assert in_process.feasible
+    assert ([piece.to_dict() for piece in in_process.furniture] ==
+            [piece.to_dict() for piece in own_pool.furniture] ==
+            [piece.to_dict() for piece in shared_pool.furniture])
+
+
+def test_shared_pool_is_reused_by_concurrent_solves():
+    room = Room(600, 500)
+    pool = get_solver_pool()
+    results = []
+
+    def solve(target_cost):
+        results.append(solve_layout_parallel(room, ITEMS, target_cost=target_cost, time_budget=0.2))
+
+    threads = [threading.Thread(target=solve, args=(1e9 if i % 2 else None,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert get_solver_pool() is pool
+    assert len(results) == 4 and all(result.feasible for result in results)
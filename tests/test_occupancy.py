@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture, get_furniture_item_by_id
+from occupancy import OccupancyGrid
+
+
+def _piece(item_id, width, height, x, y, rotation=0):
+    furniture = Furniture(item_id, item_id, width, height, x, y, "#000000", rotation=rotation)
+    furniture.item = get_furniture_item_by_id(item_id)
+    return furniture
+
+
+def _random_grid(seed):
+    rng = random.Random(seed)
+    grid = OccupancyGrid(400, 300, resolution=10)
+    for _ in range(12):
+        grid.add(_piece(rng.choice(["desk", "plant"]), 60, 60, rng.uniform(-30, 370), rng.uniform(-30, 270),
+                        rotation=rng.choice([0, 30, 45])))
+    return grid, rng
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_summed_area_counts_match_the_cells(seed):
+    grid, rng = _random_grid(seed)
+    occupied = grid.occupied()
+    for _ in range(200):
+        min_x, min_y = rng.uniform(-50, 420), rng.uniform(-50, 320)
+        max_x, max_y = min_x + rng.uniform(0, 200), min_y + rng.uniform(0, 200)
+        row0, col0, row1, col1 = grid.cell_range(min_x, min_y, max_x, max_y)
+        expected = int(occupied[row0:row1, col0:col1].sum()) if row0 < row1 and col0 < col1 else 0
+        assert grid.occupied_cells(min_x, min_y, max_x, max_y) == expected
+        assert grid.is_free(min_x, min_y, max_x, max_y) == (expected == 0)
+    assert grid.free_fraction() == pytest.approx(1 - occupied.mean())
+
+
+def test_cells_follow_the_footprint_and_are_counted_per_piece():
+    grid = OccupancyGrid(100, 100, resolution=10)
+    first = _piece("desk", 30, 20, 10, 10)
+    second = _piece("desk", 30, 20, 30, 10)
+    grid.add(first)
+    grid.add(second)
+    # Cells whose centers lie inside each rectangle: columns 1-3 and 3-5, rows 1-2
+    expected = np.zeros((10, 10), dtype=int)
+    expected[1:3, 1:4] += 1
+    expected[1:3, 3:6] += 1
+    assert np.array_equal(grid.counts, expected)
+    assert not grid.is_free(35, 15, 36, 16)
+
+    grid.remove(first)
+    assert grid.is_free(10, 10, 30, 30)
+    assert grid.occupied_cells(30, 10, 60, 30) == 6
+
+
+def test_sync_redraws_only_moved_pieces_and_refreshes_the_table():
+    grid = OccupancyGrid(200, 200, resolution=10)
+    pieces = [_piece("desk", 40, 40, 0, 0), _piece("plant", 40, 40, 100, 100)]
+    assert grid.sync(pieces) == 2
+    assert grid.sync(pieces) == 0
+    assert not grid.is_free(0, 0, 40, 40)
+    version = grid.version
+
+    pieces[0].x = 150
+    assert grid.sync(pieces) == 1
+    assert grid.version > version
+    assert grid.is_free(0, 0, 40, 40)
+    assert not grid.is_free(150, 0, 190, 40)
+    assert grid.sync(pieces[1:]) == 1
+    assert grid.is_free(0, 0, 200, 90)
+    assert len(grid) == 1
+
+
+def test_pieces_outside_the_grid_are_clipped():
+    grid = OccupancyGrid(100, 100, resolution=10)
+    grid.add(_piece("desk", 50, 50, -40, 80))
+    assert grid.occupied_cells(-100, -100, 200, 200) == 2
+    grid.add(_piece("desk", 50, 50, 300, 300))
+    assert grid.occupied_cells(-100, -100, 200, 200) == 2
@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture, get_furniture_item_by_id
+from room import Room
+
+
+def _crowded_room(seed):
+    rng = random.Random(seed)
+    room = Room(1200, 1000)
+    while len(room.furniture) < 300:
+        item = get_furniture_item_by_id(rng.choice(["armchair", "plant", "coffee_table", "nightstand", "desk"]))
+        piece = Furniture(item.id, item.name, item.width, item.height, rng.uniform(0, 1150), rng.uniform(0, 950),
+                          item.default_color, rotation=rng.choice([0, 30, 45, 90]))
+        piece.id = room.next_furniture_id
+        room.next_furniture_id += 1
+        room.restore_furniture(piece)
+    return room, rng
+
+
+@pytest.mark.parametrize("max_batches", [None, 1])
+def test_free_position_is_accepted_by_add_furniture(max_batches):
+    room, rng = _crowded_room(0)
+    for _ in range(20):
+        # A new piece, so the search and add_furniture check it against the same obstacles
+        piece = room.furniture[rng.randrange(len(room.furniture))].copy()
+        piece.id = None
+        piece.x, piece.y = rng.uniform(0, 1100), rng.uniform(0, 900)
+        position = room.find_nearest_free_position(piece, max_batches=max_batches)
+        if position is None:
+            continue
+        candidate = piece.copy()
+        candidate.x, candidate.y = position
+        trial = room.copy()
+        success, message = trial.add_furniture(candidate)
+        assert success, message
+
+
+def test_copy_keeps_circular_item():
+    room = Room()
+    room.add_furniture(Furniture("plant", "Plant", 40, 40, 100, 100, "#228B22"))
+    assert room.furniture[0].copy().item.shape == "circle"
+
+
+def test_rugs_do_not_block_furniture():
+    room = Room()
+    assert room.add_furniture(Furniture("rug_rectangular", "Rug", 200, 150, 100, 100, "#DEB887"))[0]
+    assert room.add_furniture(Furniture("coffee_table", "Coffee Table", 100, 60, 150, 150, "#D2B48C"))[0]
+    table = room.furniture[1]
+    assert room.find_nearest_free_position(table) == (table.x, table.y)
+    assert not room.overlap_matrix().any()
+    assert not room.occupancy_grid().occupied()[0, 0]
+
+
+def test_direct_attribute_writes_keep_the_spatial_index_current():
+    room = Room()
+    room.add_furniture(Furniture("armchair", "Armchair", 60, 60, 50, 50, "#8B4513"))
+    room.add_furniture(Furniture("desk", "Desk", 120, 60, 300, 50, "#8B4513"))
+    chair = room.furniture[0]
+    chair.x, chair.y = 350, 250
+    assert room.get_furniture_at_position(60, 60) is None
+    assert room.get_furniture_at_position(380, 280) is chair
+    desk = room.furniture[1]
+    desk.x, desk.y = 50, 300
+    # Overlap checks see the desk where it is now, not where it was added
+    assert not room.update_furniture_position(chair.id, 60, 310)
+    assert room.update_furniture_position(chair.id, 300, 50)
+    chair.scale = 3
+    assert room.get_furniture_at_position(450, 200) is chair
+
+
+def test_copies_and_removed_furniture_leave_the_index_alone():
+    room = Room()
+    room.add_furniture(Furniture("armchair", "Armchair", 60, 60, 50, 50, "#8B4513"))
+    chair = room.furniture[0]
+    copy = chair.copy()
+    copy.x = 300
+    assert room.get_furniture_at_position(330, 80) is None
+    assert room.get_furniture_at_position(80, 80) is chair
+
+    assert room.remove_furniture(chair.id)
+    chair.x = 300
+    assert room.get_furniture_at_position(330, 80) is None
+    assert room.furniture == ()
+
+
+def test_removal_keeps_placement_order_and_restore_puts_pieces_back():
+    room = Room(1000, 400)
+    for index in range(5):
+        room.add_furniture(Furniture("nightstand", f"Nightstand {index}", 40, 40, index * 100, 0, "#8B4513"))
+    pieces = room.furniture
+    assert room.remove_furniture(pieces[1].id)
+    assert room.remove_furniture(pieces[3].id)
+    assert [piece.name for piece in room.furniture] == ["Nightstand 0", "Nightstand 2", "Nightstand 4"]
+    room.restore_furniture(pieces[1], 1)
+    assert list(room.iter_ids()) == [pieces[0].id, pieces[1].id, pieces[2].id, pieces[4].id]
+    pieces[1].x = 900
+    assert room.get_furniture_at_position(920, 20) is pieces[1]
+
+
+def test_furniture_is_found_by_id_after_every_change():
+    room = Room(800, 400)
+    for index in range(4):
+        room.add_furniture(Furniture("nightstand", f"Nightstand {index}", 40, 40, index * 100, 0, "#8B4513"))
+    ids = list(room.iter_ids())
+    assert [room.get_furniture_by_id(furniture_id) for furniture_id in ids] == list(room.furniture)
+    assert room.get_furniture_by_id(max(ids) + 1) is None
+
+    room.remove_furniture(ids[2])
+    assert room.get_furniture_by_id(ids[2]) is None
+    assert list(room.iter_ids()) == [ids[0], ids[1], ids[3]]
+
+    for other in (room.copy(), Room.from_dict(room.to_dict()), Room.from_snapshot(room.snapshot())):
+        assert list(other.iter_ids()) == list(room.iter_ids())
+        assert other.get_furniture_by_id(ids[3]).name == "Nightstand 3"
+        assert other.get_furniture_by_id(ids[3]) is not room.get_furniture_by_id(ids[3])
+
+
+def test_names_by_id_follows_renames_and_removals():
+    room = Room()
+    room.add_furniture(Furniture("armchair", "Armchair", 60, 60, 50, 50, "#8B4513"))
+    room.add_furniture(Furniture("plant", "Plant", 40, 40, 300, 100, "#228B22"))
+    first, second = room.iter_ids()
+    names = room.names_by_id()
+    assert dict(names) == {first: "Armchair", second: "Plant"}
+    assert room.names_by_id() is names
+    with pytest.raises(TypeError):
+        names[first] = "Sofa"
+
+    room.set_furniture_attributes(first, {"name": "Reading Chair"})
+    assert dict(room.names_by_id()) == {first: "Reading Chair", second: "Plant"}
+    room.remove_furniture(second)
+    assert dict(room.names_by_id()) == {first: "Reading Chair"}
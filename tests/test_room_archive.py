@@ -0,0 +1,91 @@
+import io
+
+import pytest
+
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture
+from room import Room
+from room_archive import read_archive, read_rooms, room_line, transform_archive, write_archive
+
+
+def _room(pieces):
+    room = Room(600, 400)
+    for index in range(pieces):
+        room.add_furniture(Furniture("nightstand", f"Nightstand {index}", 40, 40, index * 50, 0, "#8B4513"))
+    return room
+
+
+@pytest.mark.parametrize("file_name", ["rooms.jsonl", "rooms.jsonl.gz"])
+def test_archives_round_trip(tmp_path, file_name):
+    path = tmp_path / file_name
+    rooms = [("Empty", _room(0)), (None, _room(1)), ("Study", _room(3))]
+    assert write_archive(path, iter(rooms)) == 3
+    read = list(read_rooms(path))
+    assert [name for name, _ in read] == ["Empty", None, "Study"]
+    assert [room.to_dict() for _, room in read] == [room.to_dict() for _, room in rooms]
+
+
+def test_bad_lines_are_reported_and_the_rest_is_read():
+    lines = [room_line(_room(1), "First"), "", "{not json", "[1, 2]",
+             '{"furniture": [{"x": 1}], "width": "wide", "height": 10}', room_line(_room(2), "Last")]
+    entries = list(read_archive(io.StringIO("\n".join(lines) + "\n")))
+    assert [entry.line_number for entry in entries] == [1, 3, 4, 5, 6]
+    assert [entry.ok for entry in entries] == [True, False, False, False, True]
+    assert entries[1].error.startswith("Invalid JSON")
+    assert entries[2].error == "Expected a JSON object, got list"
+    assert entries[3].error.startswith("Invalid room")
+
+    errors = []
+    assert [name for name, _ in read_rooms(io.StringIO("\n".join(lines)), errors.append)] == ["First", "Last"]
+    assert [entry.line_number for entry in errors] == [3, 4, 5]
+
+
+def test_reading_and_writing_are_lazy():
+    consumed = []
+
+    def lines():
+        for index in range(1000):
+            consumed.append(index)
+            yield room_line(_room(1), f"Room {index}") + "\n"
+
+    entries = read_archive(lines())
+    assert next(entries).name == "Room 0"
+    assert len(consumed) == 1
+
+    produced = []
+
+    def rooms():
+        for index in range(3):
+            produced.append(index)
+            yield _room(index)
+
+    written = []
+
+    class Destination(io.StringIO):
+        def write(self, text):
+            if text != "\n":
+                written.append(len(produced))
+            return super().write(text)
+
+    assert write_archive(Destination(), rooms()) == 3
+    # Each room is written before the next one is produced
+    assert written == [1, 2, 3]
+
+
+def test_transform_can_change_and_drop_rooms():
+    source = io.StringIO("\n".join(room_line(_room(pieces), f"Room {pieces}") for pieces in range(4)) + "\nbad\n")
+    destination = io.StringIO()
+    errors = []
+
+    def keep_furnished(room):
+        if not room.furniture:
+            return None
+        room.floor_design = "Tile"
+        return room
+
+    assert transform_archive(source, destination, keep_furnished, errors.append) == 3
+    destination.seek(0)
+    read = list(read_rooms(destination))
+    assert [name for name, _ in read] == ["Room 1", "Room 2", "Room 3"]
+    assert all(room.floor_design == "Tile" for _, room in read)
+    assert [entry.line_number for entry in errors] == [5]
@@ -0,0 +1,105 @@
+import struct
+
+import pytest
+
+import room_codec
+from furniture import Furniture
+from room import Room
+from room_templates import ROOM_TEMPLATES, load_room_template
+
+
+def _mixed_room():
+    room = Room(420, 380.5, "Pale Blue", "Tile")
+    room.left_wall_color = "Light Grey"
+    for piece in (
+        Furniture("sofa_3seater", "Sofá ☺ 三人", 200, 90, 10, 20, "#8B4513", rotation=33.5, scale=1.25),
+        Furniture("plant", "Plant", 40, 40, 300.25, 50, "#228B22", rotation=90),
+        Furniture("rug_round", "Round Rug", 150, 150, 150, 200, "#D2B48C", scale=0.8),
+        Furniture("desk", "Desk", 120.5, 60, 250, 280, "#000000", rotation=-45),
+    ):
+        piece.id = room.next_furniture_id
+        room.next_furniture_id += 1
+        room.restore_furniture(piece)
+    return room
+
+
+def _round_trip(room):
+    return Room.from_bytes(room.to_bytes())
+
+
+@pytest.mark.parametrize("name", sorted(ROOM_TEMPLATES))
+def test_templates_round_trip(name):
+    room = load_room_template(name)
+    assert _round_trip(room).to_dict() == room.to_dict()
+
+
+def test_empty_room_round_trips():
+    room = Room()
+    assert _round_trip(room).to_dict() == room.to_dict()
+
+
+def test_names_rotations_scales_and_circles_round_trip():
+    room = _mixed_room()
+    decoded = _round_trip(room)
+    assert decoded.to_dict() == room.to_dict()
+    assert [piece.item for piece in decoded.furniture] == [piece.item for piece in room.furniture]
+    assert decoded.furniture[2].item.shape == "circle"
+
+
+@pytest.mark.parametrize("length", [0, 3, 5, 12, 40, -9, -1])
+def test_truncated_data_raises(length):
+    data = _mixed_room().to_bytes()
+    with pytest.raises(ValueError):
+        Room.from_bytes(data[:length])
+
+
+def test_every_truncation_raises():
+    data = _mixed_room().to_bytes()
+    for length in range(len(data)):
+        with pytest.raises(ValueError):
+            room_codec.decode_room(data[:length])
+
+
+def _furniture_table_offset(data):
+    offset = room_codec._HEADER.size
+    (count,) = room_codec._COUNT.unpack_from(data, offset)
+    offset += room_codec._COUNT.size
+    for _ in range(count):
+        (length,) = room_codec._STRING_LENGTH.unpack_from(data, offset)
+        offset += room_codec._STRING_LENGTH.size + length
+    return offset + room_codec._ROOM.size
+
+
+def test_out_of_range_string_index_raises():
+    data = bytearray(_mixed_room().to_bytes())
+    item_id_offset = _furniture_table_offset(data) + room_codec.FURNITURE_RECORD.fields["item_id"][1]
+    struct.pack_into("<i", data, item_id_offset, 10_000)
+    with pytest.raises(ValueError, match="string index"):
+        Room.from_bytes(bytes(data))
+
+
+def test_unknown_item_without_stored_name_raises():
+    room = Room()
+    room.add_furniture(Furniture("plant", "Plant", 40, 40, 100, 100, "#228B22"))
+    data = room.to_bytes().replace(b"plant", b"plonk")
+    with pytest.raises(ValueError, match="unknown item"):
+        Room.from_bytes(data)
+
+
+def test_bad_magic_raises():
+    data = Room().to_bytes()
+    with pytest.raises(ValueError):
+        Room.from_bytes(b"XXXX" + data[4:])
+
+
+def test_longest_string_round_trips():
+    room = Room()
+    room.add_furniture(Furniture("plant", "é" * (room_codec.MAX_STRING_BYTES // 2) + "x", 40, 40, 0, 0, "#228B22"))
+    assert _round_trip(room).to_dict() == room.to_dict()
+
+
+def test_too_long_string_raises_value_error():
+    room = Room()
+    room.add_furniture(Furniture("plant", "é" * (room_codec.MAX_STRING_BYTES // 2 + 1), 40, 40, 0, 0, "#228B22"))
+    with pytest.raises(ValueError, match="UTF-8 bytes long"):
+        room.to_bytes()
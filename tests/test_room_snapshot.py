@@ -0,0 +1,49 @@
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture
+from room import Room
+
+
+def _room():
+    room = Room(800, 400)
+    for index in range(4):
+        room.add_furniture(Furniture("nightstand", f"Nightstand {index}", 40, 40, index * 100, 0, "#8B4513"))
+    return room
+
+
+def test_unchanged_furniture_shares_records_between_snapshots():
+    room = _room()
+    first = room.snapshot()
+    assert all(new is old for new, old in zip(room.snapshot().furniture, first.furniture))
+
+    room.furniture[1].x = 150
+    room.set_furniture_attributes(room.furniture[2].id, {"color": "#000000"})
+    second = room.snapshot()
+    shared = [new is old for new, old in zip(second.furniture, first.furniture)]
+    assert shared == [True, False, False, True]
+    assert second.furniture[1].x == 150 and first.furniture[1].x == 100
+    assert second.furniture[2].color == "#000000"
+
+
+def test_removed_and_added_furniture_only_changes_their_records():
+    room = _room()
+    first = room.snapshot()
+    room.remove_furniture(room.furniture[0].id)
+    room.add_furniture(Furniture("plant", "Plant", 40, 40, 500, 200, "#228B22"))
+    second = room.snapshot()
+    assert all(new is old for new, old in zip(second.furniture[:3], first.furniture[1:]))
+    assert second.furniture[3].name == "Plant"
+
+
+def test_restored_rooms_keep_sharing_records():
+    room = _room()
+    snapshot = room.snapshot()
+    restored = Room.from_snapshot(snapshot)
+    assert restored.to_dict() == room.to_dict()
+    assert restored.snapshot() == snapshot
+    assert all(new is old for new, old in zip(restored.snapshot().furniture, snapshot.furniture))
+
+    # Changing the restored room leaves the snapshot and the original room alone
+    restored.furniture[0].x = 300
+    assert snapshot.furniture[0].x == 0
+    assert room.furniture[0].x == 0
+    assert snapshot.to_dict() == room.to_dict()
@@ -0,0 +1,82 @@
+import json
+import sqlite3
+import zlib
+
+import pytest
+
+import assets.furniture_items  # Registers the catalog
+import room_store
+from furniture import Furniture
+from room import Room
+from room_store import RoomStore
+
+
+def _room(pieces):
+    room = Room(800, 600)
+    for index in range(pieces):
+        room.add_furniture(Furniture("nightstand", f"Nightstand {index}", 40, 40, index * 50, 0, "#8B4513"))
+    return room
+
+
+@pytest.fixture
+def store(monkeypatch):
+    # Saves at a fixed set of times, several rooms sharing each timestamp
+    times = iter([100.0, 100.0, 100.0, 200.0, 200.0, 300.0, 150.0, 150.0, 50.0, 300.0])
+    monkeypatch.setattr(room_store.time, "time", lambda: next(times))
+    store = RoomStore(":memory:")
+    for name in ["c", "a", "b", "e", "d", "g", "i", "h", "j", "f"]:
+        store.save(name, _room(len(name)))
+    return store
+
+
+def _walk(store, limit):
+    pages, after = [], None
+    while True:
+        page = store.list_rooms(limit=limit, after=after)
+        if not page:
+            return pages
+        pages.append(page)
+        after = page[-1]
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 10, 50])
+def test_pages_cover_every_room_once_newest_first(store, limit):
+    pages = _walk(store, limit)
+    assert all(len(page) <= limit for page in pages)
+    names = [info.name for page in pages for info in page]
+    # Rooms saved at the same time are ordered by name
+    assert names == ["f", "g", "d", "e", "h", "i", "a", "b", "c", "j"]
+    assert len(pages) == -(-store.count() // limit)
+
+
+def test_a_page_does_not_shift_when_earlier_rooms_are_deleted(store):
+    first = store.list_rooms(limit=4)
+    store.delete(first[0].name)
+    store.delete(first[1].name)
+    assert [info.name for info in store.list_rooms(limit=3, after=first[-1])] == ["h", "i", "a"]
+
+
+def test_saved_rooms_round_trip(tmp_path):
+    store = RoomStore(str(tmp_path / "rooms.db"))
+    room = _room(3)
+    store.save("Bedroom", room)
+    # A second store on the same file sees the same rooms
+    reopened = RoomStore(str(tmp_path / "rooms.db"))
+    assert "Bedroom" in reopened
+    assert reopened.load("Bedroom").to_dict() == room.to_dict()
+    assert reopened.list_rooms()[0].furniture_count == 3
+    assert reopened.load("Kitchen") is None
+    assert reopened.delete("Bedroom")
+    assert not reopened.delete("Bedroom")
+    assert store.count() == 0
+
+
+def test_legacy_json_blobs_can_be_loaded(tmp_path):
+    path = str(tmp_path / "rooms.db")
+    store = RoomStore(path)
+    room = _room(2)
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO rooms (name, updated_at, furniture_count, data) VALUES (?, ?, ?, ?)",
+                     ("Old", 1.0, 2, zlib.compress(json.dumps(room.to_dict()).encode("utf-8"))))
+    conn.close()
+    assert store.load_state("Old") == room.to_dict()
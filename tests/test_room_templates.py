@@ -0,0 +1,47 @@
+import copy
+
+import pytest
+
+from room_templates import ROOM_TEMPLATES, TemplateError, compile_template, load_room_template
+from validate_layouts import validate_room
+
+
+def test_living_room_keeps_its_rug():
+    room = load_room_template("Living Room")
+    assert "rug_rectangular" in [furniture.item_id for furniture in room.furniture]
+
+
+@pytest.mark.parametrize("name", sorted(ROOM_TEMPLATES))
+def test_templates_pass_the_batch_validator(name):
+    assert validate_room(load_room_template(name))["valid"]
+
+
+def test_furniture_on_the_living_room_rug_can_be_moved():
+    room = load_room_template("Living Room")
+    rug = next(furniture for furniture in room.furniture if furniture.item_id == "rug_rectangular")
+    for furniture in room.furniture:
+        if furniture is not rug:
+            assert room.update_furniture_position(furniture.id, furniture.x + 5, furniture.y)
+    assert room.update_furniture_position(rug.id, rug.x + 5, rug.y)
+
+
+def test_rugs_may_lie_under_furniture():
+    template = copy.deepcopy(ROOM_TEMPLATES["Living Room"])
+    rug = next(data for data in template["furniture"] if data["item_id"] == "rug_rectangular")
+    sofa = next(data for data in template["furniture"] if data["item_id"] == "sofa_3seater")
+    rug["x"], rug["y"] = sofa["x"], sofa["y"]
+    compile_template("Living Room", template)
+
+
+def test_overlapping_furniture_is_rejected():
+    template = copy.deepcopy(ROOM_TEMPLATES["Living Room"])
+    template["furniture"].append(dict(template["furniture"][0]))
+    with pytest.raises(TemplateError, match="overlaps"):
+        compile_template("Living Room", template)
+
+
+def test_furniture_outside_the_room_is_rejected():
+    template = copy.deepcopy(ROOM_TEMPLATES["Living Room"])
+    template["furniture"][0]["x"] = template["width"]
+    with pytest.raises(TemplateError, match="outside the room"):
+        compile_template("Living Room", template)
@@ -0,0 +1,42 @@
+import plotly.graph_objects as go
+
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture
+from room import Room
+from scene_plotly import FigureBuilder, figure_layout
+
+CAMERA = (1.5, 1.5, 1.2)
+
+
+def _room():
+    room = Room(500, 400)
+    room.add_furniture(Furniture("armchair", "Armchair", 60, 60, 100, 100, "#8B4513"))
+    room.add_furniture(Furniture("plant", "Plant", 40, 40, 300, 100, "#228B22"))
+    room.add_furniture(Furniture("coffee_table", "Coffee Table", 100, 60, 200, 250, "#D2B48C"))
+    return room
+
+
+def test_unchanged_layers_reuse_their_traces():
+    room = _room()
+    builder = FigureBuilder()
+    first = builder.traces(builder.scene_builder.build(room))
+    assert all(new is old for new, old in zip(builder.traces(builder.scene_builder.build(room)), first))
+
+    # Only the walls layer depends on the wall colors
+    room.left_wall_color = "Light Blue"
+    second = builder.traces(builder.scene_builder.build(room))
+    assert len(second) == len(first)
+    changed = [index for index, (new, old) in enumerate(zip(second, first)) if new is not old]
+    assert [second[index].name for index in changed] == ["Walls"]
+
+
+def test_figure_matches_a_validated_build():
+    room = _room()
+    builder = FigureBuilder()
+    builder.build(room, CAMERA)
+    room.furniture[0].x = 150
+    fig = builder.build(room, CAMERA)
+
+    scene = builder.scene_builder.build(room)
+    expected = go.Figure(data=builder.traces(scene), layout=figure_layout(CAMERA))
+    assert fig.to_json() == expected.to_json()
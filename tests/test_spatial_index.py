@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from spatial_index import SpatialGrid
+
+
+def _overlaps(a, b):
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+
+def _random_box(rng):
+    x, y = rng.uniform(-150, 950), rng.uniform(-150, 950)
+    return x, y, x + rng.uniform(0, 250), y + rng.uniform(0, 250)
+
+
+def test_query_matches_a_linear_scan_through_inserts_moves_and_removals():
+    rng = random.Random(0)
+    grid = SpatialGrid(100)
+    boxes = {}
+    for step in range(600):
+        action = rng.random()
+        if action < 0.4 or not boxes:
+            key = f"piece-{step}"
+            boxes[key] = _random_box(rng)
+            grid.insert(key, boxes[key])
+        elif action < 0.7:
+            key = rng.choice(list(boxes))
+            boxes[key] = _random_box(rng)
+            grid.update(key, boxes[key])
+        else:
+            key = rng.choice(list(boxes))
+            del boxes[key]
+            assert grid.remove(key)
+        query = _random_box(rng)
+        # Results come back in insertion order, which the dict keeps as well
+        assert grid.query(query) == [key for key, box in boxes.items() if _overlaps(box, query)]
+    assert len(grid) == len(boxes)
+
+
+def test_update_keeps_insertion_order():
+    grid = SpatialGrid(100)
+    grid.insert("first", (0, 0, 50, 50))
+    grid.insert("second", (500, 500, 550, 550))
+    grid.update("first", (510, 510, 520, 520))
+    assert grid.query((400, 400, 600, 600)) == ["first", "second"]
+    assert grid.get_box("first") == (510, 510, 520, 520)
+    assert grid.query_point(25, 25) == []
+
+
+def test_touching_edges_and_points_count():
+    grid = SpatialGrid(100)
+    grid.insert("box", (100, 100, 200, 200))
+    assert grid.query((200, 200, 300, 300)) == ["box"]
+    assert grid.query_point(100, 150) == ["box"]
+    assert grid.query((201, 100, 300, 200)) == []
+
+
+def test_remove_and_clear():
+    grid = SpatialGrid(50)
+    grid.insert("a", (0, 0, 400, 400))
+    grid.insert("b", (10, 10, 20, 20))
+    assert grid.remove("a")
+    assert not grid.remove("a")
+    assert "a" not in grid and "b" in grid
+    assert grid.query((0, 0, 400, 400)) == ["b"]
+    grid.clear()
+    assert len(grid) == 0
+    assert grid.query((0, 0, 400, 400)) == []
+
+
+def test_cell_size_must_be_positive():
+    with pytest.raises(ValueError):
+        SpatialGrid(0)
@@ -0,0 +1,37 @@
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture
+from room import Room
+from thumbnail_cache import ThumbnailCache
+
+
+def test_room_thumbnails_are_keyed_by_content(tmp_path):
+    cache = ThumbnailCache(str(tmp_path))
+    room = Room()
+    first = cache.get_thumbnail(room, 64)
+    assert cache.get_thumbnail(room.copy(), 64) == first
+    assert ThumbnailCache(str(tmp_path)).get_thumbnail(room, 64) == first
+    room.add_furniture(Furniture("plant", "Plant", 40, 40, 100, 100, "#228B22"))
+    assert cache.get_thumbnail(room, 64) != first
+    assert cache.stats()["misses"] == 2
+
+
+def test_source_thumbnails_only_load_the_room_on_a_miss(tmp_path):
+    cache = ThumbnailCache(str(tmp_path))
+    loads = []
+
+    def load_room():
+        loads.append(1)
+        return Room()
+
+    first = cache.get_source_thumbnail("saved:Kitchen:1.5", load_room, 64)
+    assert cache.get_source_thumbnail("saved:Kitchen:1.5", load_room, 64) == first
+    assert ThumbnailCache(str(tmp_path)).get_source_thumbnail("saved:Kitchen:1.5", load_room, 64) == first
+    assert len(loads) == 1
+    cache.get_source_thumbnail("saved:Kitchen:2.5", load_room, 64)
+    assert len(loads) == 2
+
+
+def test_source_thumbnail_of_missing_room_is_none():
+    cache = ThumbnailCache(None)
+    assert cache.get_source_thumbnail("saved:Gone:1.0", lambda: None, 64) is None
+    assert len(cache) == 0
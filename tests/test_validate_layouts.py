@@ -0,0 +1,101 @@
+import json
+
+import assets.furniture_items  # Registers the catalog
+from furniture import Furniture
+from room import Room
+from room_archive import open_archive, room_line
+from validate_layouts import iter_tasks, main, validate_room, validate_tasks
+
+
+def _room_with(width, height, *furniture):
+    room = Room(width, height)
+    for index, piece in enumerate(furniture, start=1):
+        piece.id = index
+        room.restore_furniture(piece)
+    return room
+
+
+def test_piece_inside_room_is_in_bounds():
+    room = _room_with(300, 300, Furniture("desk", "Desk", 100, 60, 0, 0, "#000000"))
+    assert room.out_of_bounds_furniture() == []
+
+
+def test_piece_larger_than_room_is_out_of_bounds():
+    room = _room_with(100, 100, Furniture("sofa_3seater", "Sofa", 200, 90, 0, 0, "#000000"))
+    assert room.out_of_bounds_furniture() == [0]
+    assert not validate_room(room)["valid"]
+
+
+def test_rotated_piece_is_judged_by_its_rotated_footprint():
+    # Unrotated it would touch the left and top walls; at 45 degrees its corners poke through them
+    room = _room_with(300, 300, Furniture("desk", "Desk", 100, 100, 0, 0, "#000000", rotation=45))
+    assert room.out_of_bounds_furniture() == [0]
+
+
+def test_scaled_piece_is_judged_by_its_scaled_footprint():
+    room = _room_with(300, 300, Furniture("desk", "Desk", 100, 100, 150, 150, "#000000", scale=2.0))
+    assert room.out_of_bounds_furniture() == [0]
+
+
+def test_quarter_turn_against_wall_is_in_bounds():
+    room = _room_with(300, 300, Furniture("desk", "Desk", 100, 100, 0, 0, "#000000", rotation=90))
+    assert room.out_of_bounds_furniture() == []
+
+
+def _archive_rooms(count):
+    """(name, room) pairs alternating between valid rooms and rooms with an overlap."""
+    rooms = []
+    for index in range(count):
+        room = Room(400, 300)
+        room.restore_furniture(Furniture("desk", "Desk", 100, 60, 10 + index, 10, "#000000", id=1))
+        if index % 3 == 0:
+            room.restore_furniture(Furniture("desk", "Desk", 100, 60, 50 + index, 20, "#000000", id=2))
+        rooms.append((f"room {index}", room))
+    return rooms
+
+
+def _write_lines(path, lines):
+    with open_archive(str(path), "w") as file:
+        for line in lines:
+            file.write(line + "\n")
+
+
+def test_parallel_reports_match_serial_reports_in_input_order(tmp_path):
+    lines = [room_line(room, name) for name, room in _archive_rooms(40)]
+    lines[7] = "{not json"
+    lines[20] = "[1, 2]"
+    path = tmp_path / "rooms.jsonl.gz"
+    _write_lines(path, lines)
+
+    serial = list(validate_tasks(iter_tasks([str(path)]), workers=1))
+    parallel = list(validate_tasks(iter_tasks([str(path)]), workers=3, chunk_size=4))
+    assert parallel == serial
+    assert [report["line"] for report in parallel] == list(range(1, 41))
+    assert [report["valid"] for report in parallel[:4]] == [False, True, True, False]
+    assert "error" in parallel[7] and "error" in parallel[20]
+
+
+def test_cli_reports_unreadable_and_corrupt_files(tmp_path, capsys):
+    good = tmp_path / "good.jsonl"
+    _write_lines(good, [room_line(room, name) for name, room in _archive_rooms(2)])
+    not_gzip = tmp_path / "not_gzip.jsonl.gz"
+    not_gzip.write_bytes(b"plain text, not gzip")
+    truncated = tmp_path / "truncated.jsonl.gz"
+    _write_lines(truncated, [room_line(room, name) for name, room in _archive_rooms(200)])
+    truncated.write_bytes(truncated.read_bytes()[:-200])
+    missing = tmp_path / "missing.jsonl"
+    report_path = tmp_path / "report.jsonl"
+
+    paths = [str(missing), str(not_gzip), str(truncated), str(good)]
+    assert main(paths + ["-o", str(report_path), "-j", "2", "--chunk-size", "16"]) == 1
+    reports = [json.loads(line) for line in report_path.read_text().splitlines()]
+
+    errors = {report["source"]: report for report in reports if "error" in report}
+    assert set(errors) == {str(missing), str(not_gzip), str(truncated)}
+    assert all(report["error"].startswith("Unreadable file") for report in errors.values())
+    # Rooms read before the truncation are still reported, and the next file is read
+    truncated_rooms = [report for report in reports if report["source"] == str(truncated) and "error" not in report]
+    assert 0 < len(truncated_rooms) < 200
+    assert errors[str(truncated)]["line"] == len(truncated_rooms) + 1
+    assert [report["valid"] for report in reports if report["source"] == str(good)] == [False, True]
+    assert "3 unreadable" in capsys.readouterr().err
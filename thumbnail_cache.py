@@ -0,0 +1,218 @@
+"""Two-tier cache of room floor plan thumbnails.
+
+Thumbnails are PNG bytes from floor_plan, keyed by the room content hash and
+the thumbnail size, so a room is only rendered again after something visible
+changed. Rooms that are expensive to load, such as saved rooms, can instead be
+keyed by a source string (name and modification time), so a cached thumbnail
+is found without loading the room. Recently used thumbnails are kept in an
+in-memory LRU; all others are kept as files in a directory whose total size
+is capped, evicting the least recently used files first. Files are written
+atomically, so several processes may share the directory.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from floor_plan import floor_plan_png
+from room import Room
+from room_store import SavedRoomInfo
+
+DEFAULT_CACHE_DIR = os.environ.get("THUMBNAIL_CACHE_DIR", ".thumbnail_cache")
+DEFAULT_THUMBNAIL_SIZE = 160  # Longest thumbnail side in pixels
+MEMORY_CACHE_SIZE = 256  # Thumbnails kept in memory
+DISK_CACHE_BYTES = 64 * 1024 * 1024  # Total size of the thumbnail files
+RENDER_VERSION = 1  # Bump when floor_plan output changes, so old files are not reused
+
+class ThumbnailCache:
+    """Memory and disk LRU cache of room thumbnails keyed by room content.
+
+    Pass cache_dir=None for a memory-only cache. The cache is safe to use from
+    several Streamlit sessions at once.
+    """
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_entries: int = MEMORY_CACHE_SIZE, max_disk_bytes: int = DISK_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0  # Files removed from the disk tier
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._files: "OrderedDict[str, int]" = OrderedDict()  # Key to file size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._scan()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def _scan(self) -> None:
+        """Index the existing files, oldest access first."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-len(".png")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._files[key] = size
+            self._disk_bytes += size
+        self._evict_files()
+
+    def key(self, room: Room, size: int) -> str:
+        """Get the cache key of a room's thumbnail."""
+        return f"{room.content_hash()}-{size}-v{RENDER_VERSION}"
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_file(self, key: str) -> Optional[bytes]:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)  # Marks the file as recently used for other processes too
+        except OSError:
+            if key in self._files:
+                # Evicted by another process sharing the directory
+                self._disk_bytes -= self._files.pop(key)
+            return None
+        # The file may also have been written by another process
+        self._disk_bytes += len(data) - self._files.pop(key, 0)
+        self._files[key] = len(data)
+        return data
+
+    def _write_file(self, key: str, data: bytes) -> None:
+        if self.cache_dir is None:
+            return
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            # The disk tier is best effort; the thumbnail is still in memory
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self._disk_bytes += len(data) - self._files.pop(key, 0)
+        self._files[key] = len(data)
+        self._evict_files()
+
+    def _evict_files(self) -> None:
+        while self._files and self._disk_bytes > self.max_disk_bytes:
+            key, size = self._files.popitem(last=False)
+            self._disk_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def source_key(self, source: str, size: int) -> str:
+        """Get the cache key of a thumbnail identified by its source rather than its content."""
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        return f"src-{digest}-{size}-v{RENDER_VERSION}"
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+            data = self._read_file(key)
+            if data is not None:
+                self._remember(key, data)
+                self.disk_hits += 1
+                return data
+            self.misses += 1
+            return None
+
+    def _render(self, key: str, room: Room, size: int) -> bytes:
+        # Render outside the lock so other sessions are not blocked
+        data = floor_plan_png(room, size)
+        with self._lock:
+            self._remember(key, data)
+            self._write_file(key, data)
+        return data
+
+    def get_thumbnail(self, room: Room, size: int = DEFAULT_THUMBNAIL_SIZE) -> bytes:
+        """Get the PNG thumbnail of a room, rendering it only if it is in neither tier."""
+        key = self.key(room, size)
+        data = self._lookup(key)
+        return data if data is not None else self._render(key, room, size)
+
+    def get_source_thumbnail(self, source: str, load_room: Callable[[], Optional[Room]],
+                             size: int = DEFAULT_THUMBNAIL_SIZE) -> Optional[bytes]:
+        """Get the PNG thumbnail of a room identified by a source string, such as a saved
+        room's name and modification time, calling load_room only if it is not cached.
+        The source must change whenever the room does. Returns None if load_room does."""
+        key = self.source_key(source, size)
+        data = self._lookup(key)
+        if data is not None:
+            return data
+        room = load_room()
+        return None if room is None else self._render(key, room, size)
+
+    def clear(self) -> None:
+        """Drop all cached thumbnails, including the files."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._files):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._files.clear()
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters and the current size of both tiers."""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._files),
+                "disk_bytes": self._disk_bytes
+            }
+
+_thumbnail_cache: Optional[ThumbnailCache] = None
+_thumbnail_cache_lock = threading.Lock()
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Get the thumbnail cache shared by every session of the app."""
+    global _thumbnail_cache
+    with _thumbnail_cache_lock:
+        if _thumbnail_cache is None:
+            _thumbnail_cache = ThumbnailCache()
+        return _thumbnail_cache
+
+def get_room_thumbnail(room: Room, size: int = DEFAULT_THUMBNAIL_SIZE) -> bytes:
+    """Get a room's PNG thumbnail from the shared thumbnail cache."""
+    return get_thumbnail_cache().get_thumbnail(room, size)
+
+def get_saved_room_thumbnail(info: SavedRoomInfo, load_room: Callable[[], Optional[Room]],
+                             size: int = DEFAULT_THUMBNAIL_SIZE) -> Optional[bytes]:
+    """Get a saved room's PNG thumbnail from the shared thumbnail cache, keyed by its name
+    and save time so the room is only loaded when its thumbnail is not cached."""
+    source = f"saved:{info.name}:{info.updated_at!r}"
+    return get_thumbnail_cache().get_source_thumbnail(source, load_room, size)
@@ -1,6 +1,3 @@
-from PIL import Image, ImageDraw
-import math
-import numpy as np
 from typing import Tuple, Dict
 
 from assets.wall_colors import WALL_COLORS
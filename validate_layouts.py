@@ -0,0 +1,158 @@
+"""Command-line batch validator for room layouts.
+
+Reads rooms from JSON Lines archives (see room_archive, optionally .gz) or
+single-room .json files and checks every room for furniture outside the room
+bounds and for overlapping furniture. Rooms are validated in parallel on a
+process pool; workers receive chunks of raw lines, so only text crosses
+process boundaries. One JSON report per room is written, in input order.
+A file that cannot be read gets an "Unreadable file" report and the run goes
+on with the next file.
+
+Usage:
+    python validate_layouts.py layouts.jsonl.gz more_rooms/*.json -o report.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from room import Room
+from room_archive import open_archive, parse_line
+
+DEFAULT_CHUNK_SIZE = 64  # Rooms sent to a worker at a time
+CHUNKS_IN_FLIGHT_PER_WORKER = 4  # Bounds memory use while keeping workers busy
+
+class Task(NamedTuple):
+    """One room to validate, or the point where its file could no longer be read."""
+    source: str
+    line_number: int
+    line: Optional[str]  # None if the file could not be read
+    error: Optional[str] = None
+
+def validate_room(room: Room) -> Dict[str, Any]:
+    """Check a room for out-of-bounds and overlapping furniture."""
+    furniture = room.furniture
+    overlapping = np.argwhere(np.triu(room.overlap_matrix()))
+    out_of_bounds = [
+        {"id": furniture[index].id, "name": furniture[index].name}
+        for index in room.out_of_bounds_furniture()
+    ]
+    overlaps = [
+        {"ids": [furniture[i].id, furniture[j].id], "names": [furniture[i].name, furniture[j].name]}
+        for i, j in overlapping.tolist()
+    ]
+    return {
+        "valid": not out_of_bounds and not overlaps,
+        "furniture_count": len(furniture),
+        "out_of_bounds": out_of_bounds,
+        "overlaps": overlaps
+    }
+
+def validate_task(task: Task) -> Dict[str, Any]:
+    """Parse and validate one room. Runs in a worker process."""
+    source, line_number, line, error = task
+    if error is not None:
+        return {"source": source, "line": line_number, "name": None, "valid": False, "error": error}
+    entry = parse_line(line_number, line)
+    report: Dict[str, Any] = {"source": source, "line": line_number, "name": entry.name}
+    if not entry.ok:
+        report.update(valid=False, error=entry.error)
+        return report
+    try:
+        report.update(validate_room(entry.room))
+    except (TypeError, ValueError, AttributeError) as e:
+        report.update(valid=False, error=f"Invalid room: {e}")
+    return report
+
+def _file_tasks(path: str) -> Iterator[Task]:
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as file:
+            yield Task(path, 1, file.read())
+        return
+    with open_archive(path) as file:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                yield Task(path, line_number, line)
+
+def iter_tasks(paths: Iterable[str]) -> Iterator[Task]:
+    """Stream one task per room in the given files. A .json file holds a single room.
+    A file that cannot be opened or stops being readable (e.g. a truncated .gz) yields
+    an error task after the rooms read from it, and the other files are still read."""
+    for path in paths:
+        line_number = 0
+        try:
+            for task in _file_tasks(path):
+                line_number = task.line_number
+                yield task
+        except (OSError, EOFError, UnicodeDecodeError, zlib.error) as e:
+            yield Task(path, line_number + 1, None, f"Unreadable file: {e}")
+
+def validate_chunk(chunk: List[Task]) -> List[Dict[str, Any]]:
+    """Validate a chunk of rooms. Runs in a worker process."""
+    return [validate_task(task) for task in chunk]
+
+def validate_tasks(tasks: Iterable[Task], workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Validate rooms on a process pool, yielding reports in input order.
+    workers=1 validates in this process; None uses one worker per CPU."""
+    if workers == 1:
+        yield from map(validate_task, tasks)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    tasks = iter(tasks)
+    chunks = iter(lambda: list(itertools.islice(tasks, chunk_size)), [])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window of chunks in flight, so huge archives are not read into memory
+        # at once and workers never wait for a whole batch to finish
+        in_flight: Deque[Future] = deque(
+            executor.submit(validate_chunk, chunk)
+            for chunk in itertools.islice(chunks, workers * CHUNKS_IN_FLIGHT_PER_WORKER)
+        )
+        while in_flight:
+            reports = in_flight.popleft().result()
+            for chunk in itertools.islice(chunks, 1):
+                in_flight.append(executor.submit(validate_chunk, chunk))
+            yield from reports
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate room layouts for out-of-bounds and overlapping furniture.")
+    parser.add_argument("paths", nargs="+", help="JSON Lines archives (.jsonl, .jsonl.gz) or single-room .json files")
+    parser.add_argument("-o", "--output", help="Report file (JSON Lines, .gz to compress). Defaults to stdout")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rooms sent to a worker at a time")
+    parser.add_argument("--invalid-only", action="store_true", help="Only report rooms that failed validation")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    total = invalid = unreadable = 0
+    output = open_archive(args.output, "w") if args.output else sys.stdout
+    try:
+        for report in validate_tasks(iter_tasks(args.paths), args.workers, args.chunk_size):
+            total += 1
+            if not report["valid"]:
+                invalid += 1
+                unreadable += "error" in report
+            elif args.invalid_only:
+                continue
+            output.write(json.dumps(report, separators=(",", ":")))
+            output.write("\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Validated {total} rooms in {elapsed:.1f}s: {total - invalid} valid, "
+          f"{invalid - unreadable} with problems, {unreadable} unreadable", file=sys.stderr)
+    return 1 if invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())